@@ -34,6 +34,11 @@ case "$MODE" in
     export -p | grep -Ev '(BASHOPTS|BASH_VERSINFO|EUID|PPID|SHELLOPTS|UID|_=)' > /app/env.sh
     echo "SHELL=/bin/bash" > /etc/cron.d/paleonews
     echo "$SCHEDULE root /bin/bash -c 'cd /app && source /app/env.sh && python -m paleonews run >> /proc/1/fd/1 2>&1'" >> /etc/cron.d/paleonews
+    # 매시간/매일 전송 창 사용자를 위해 전송 단계만 자주 실행 (SEND_CRON="" 이면 끔)
+    SEND_SCHEDULE="${SEND_CRON-*/15 * * * *}"
+    if [ -n "$SEND_SCHEDULE" ]; then
+      echo "$SEND_SCHEDULE root /bin/bash -c 'cd /app && source /app/env.sh && python -m paleonews send >> /proc/1/fd/1 2>&1'" >> /etc/cron.d/paleonews
+    fi
     echo "" >> /etc/cron.d/paleonews
     chmod 0644 /etc/cron.d/paleonews
     crontab /etc/cron.d/paleonews
@@ -46,7 +51,13 @@ case "$MODE" in
       echo "Telegram bot 시작"
     fi
 
-    # 3) Web UI 포그라운드 실행
+    # 3) outbox 전송 워커 백그라운드 실행 (재시도·예약 전송을 다음 파이프라인 실행까지 미루지 않음)
+    if [ "${DELIVERY_WORKER:-1}" = "1" ]; then
+      python -m paleonews deliver &
+      echo "전송 워커 시작"
+    fi
+
+    # 4) Web UI 포그라운드 실행
     echo "Web UI 시작"
     exec python -m paleonews web --host 0.0.0.0 --port "${WEB_PORT_INTERNAL:-8000}"
     ;;
@@ -55,13 +66,22 @@ case "$MODE" in
     export -p | grep -Ev '(BASHOPTS|BASH_VERSINFO|EUID|PPID|SHELLOPTS|UID|_=)' > /app/env.sh
     echo "SHELL=/bin/bash" > /etc/cron.d/paleonews
     echo "$SCHEDULE root /bin/bash -c 'cd /app && source /app/env.sh && python -m paleonews run >> /proc/1/fd/1 2>&1'" >> /etc/cron.d/paleonews
+    # 매시간/매일 전송 창 사용자를 위해 전송 단계만 자주 실행 (SEND_CRON="" 이면 끔)
+    SEND_SCHEDULE="${SEND_CRON-*/15 * * * *}"
+    if [ -n "$SEND_SCHEDULE" ]; then
+      echo "$SEND_SCHEDULE root /bin/bash -c 'cd /app && source /app/env.sh && python -m paleonews send >> /proc/1/fd/1 2>&1'" >> /etc/cron.d/paleonews
+    fi
     echo "" >> /etc/cron.d/paleonews
     chmod 0644 /etc/cron.d/paleonews
     crontab /etc/cron.d/paleonews
     echo "Pipeline cron started: $SCHEDULE"
+    if [ "${DELIVERY_WORKER:-1}" = "1" ]; then
+      python -m paleonews deliver &
+      echo "Delivery worker started"
+    fi
     exec cron -f
     ;;
-  run|fetch|filter|crawl|summarize|send|status|bot|web|users)
+  run|fetch|filter|crawl|summarize|send|deliver|search|status|bot|web|users)
     exec python -m paleonews "$MODE" "$@"
     ;;
   *)
@@ -8,16 +8,27 @@ import sys
 from datetime import date
 from pathlib import Path
 
-from .config import load_config, apply_settings_overlay
-from .llm import create_llm_client
+from .config import as_bool, load_config, apply_settings_overlay
+from .llm import create_llm_client, find_wrapper
+from .llm_ledger import flush_call_ledgers
+from .llm_retry import RetryingLLMClient
 from .db import Database
 from .fetcher import fetch_all
 from .crawler import crawl_articles
-from .filter import filter_articles, filter_articles_for_user
-from .summarizer import generate_briefing, summarize_article
-from .dispatcher.email import EmailDispatcher
+from .filter import filter_articles
+from .send_plan import Recipient, build_send_plan
+from .render import RenderCache
+from .schedule import DELIVERY_MODES, DeliverySchedule, validate_preferences
+from .outbox import WEBHOOK_ENV, LiveFlusher, OutboxDeliverer, enqueue_plan
+from .summarizer import (
+    ModelRouter,
+    SummaryGrouping,
+    SummaryResult,
+    collect_summary_batch,
+    submit_summary_batch,
+    summarize_concurrently,
+)
 from .dispatcher.telegram import TelegramDispatcher
-from .dispatcher.webhook import WebhookDispatcher
 
 logger = logging.getLogger("paleonews")
 
@@ -64,11 +75,24 @@ def cmd_fetch(db: Database, config: dict) -> tuple[int, int]:
 
 
 def cmd_filter(db: Database, config: dict) -> int:
-    llm_enabled = config.get("filter", {}).get("llm_filter", {}).get("enabled", False)
-    client = create_llm_client(config) if llm_enabled else None
-    relevant = filter_articles(db, config, llm_client=client)
-    print(f"고생물학 관련: {relevant}건")
-    return relevant
+    llm_enabled = as_bool(config.get("filter", {}).get("llm_filter", {}).get("enabled", False))
+    client = create_llm_client(config, purpose="filter") if llm_enabled else None
+    try:
+        relevant = filter_articles(db, config, llm_client=client)
+        print(f"고생물학 관련: {relevant}건")
+        _report_retries("filter", client)
+        return relevant
+    finally:
+        if client:
+            client.close()
+
+
+def _report_retries(stage: str, client):
+    """Print retry/backoff totals for a stage's LLM client, if it retried at all."""
+    retrying = find_wrapper(client, RetryingLLMClient) if client else None
+    if retrying and (retrying.stats.retries or retrying.stats.failures):
+        print(f"LLM 재시도 [{stage}]: {retrying.stats.summary()}")
+        logger.info("LLM retries [%s]: %s", stage, retrying.stats)
 
 
 def cmd_crawl(db: Database, config: dict) -> int:
@@ -78,6 +102,24 @@ def cmd_crawl(db: Database, config: dict) -> int:
     return crawled
 
 
+def _live_flusher(db: Database, config: dict) -> LiveFlusher | None:
+    """A LiveFlusher sending as summaries commit, if `delivery.live.enabled`."""
+    live_config = config.get("delivery", {}).get("live", {}) or {}
+    if not as_bool(live_config.get("enabled", False)):
+        return None
+
+    def send():
+        cmd_send(db, config)
+        if _deliver_inline(config):
+            cmd_deliver(db, config)
+
+    return LiveFlusher(
+        send,
+        flush_seconds=float(live_config.get("flush_seconds", 60)),
+        flush_articles=int(live_config.get("flush_articles", 5)),
+    )
+
+
 def cmd_summarize(db: Database, config: dict) -> int:
     unsummarized = db.get_unsummarized()
     if not unsummarized:
@@ -86,28 +128,138 @@ def cmd_summarize(db: Database, config: dict) -> int:
 
     model = config.get("summarizer", {}).get("model", "claude-sonnet-4-20250514")
     max_articles = config.get("summarizer", {}).get("max_articles_per_run", 20)
-    client = create_llm_client(config)
+    concurrency = int(config.get("summarizer", {}).get("concurrency", 4))
+    client = create_llm_client(config, purpose="summarize")
+    try:
+        router = ModelRouter.from_config(config)
+        max_attempts = int(config.get("summarizer", {}).get("max_attempts", 5))
+        retry_minutes = float(config.get("summarizer", {}).get("retry_base_minutes", 30))
+
+        targets = unsummarized[:max_articles]
+        succeeded = 0
+        dead_lettered = 0
+        # Results are saved in completion order but reported in input order.
+        finished: dict[int, SummaryResult] = {}
+        next_index = 0
+        live = _live_flusher(db, config)
+        with db.batch(on_commit=live.on_commit if live else None) as writer:
+            for index, result in summarize_concurrently(client, targets, model, concurrency, router,
+                                                        SummaryGrouping.from_config(config)):
+                article = result.article
+                if result.error is None:
+                    writer.save_summary(article["id"], result.title_ko, result.summary_ko)
+                    succeeded += 1
+                else:
+                    logger.error("Failed to summarize article %d", article["id"], exc_info=result.error)
+                    if db.record_summary_failure(article["id"], f"{type(result.error).__name__}: {result.error}",
+                                                 max_attempts, retry_minutes):
+                        dead_lettered += 1
+                finished[index] = result
+                while next_index in finished:
+                    done = finished.pop(next_index)
+                    next_index += 1
+                    mark = "완료" if done.error is None else "실패"
+                    print(f"요약 {mark} ({next_index}/{len(targets)}) {done.article['title'][:60]}")
+                if live:
+                    live.poll()
+
+        if live:
+            live.flush()
+            print(f"실시간 전송: {live.flushes}회")
+        print(f"요약 완료: {succeeded}/{len(targets)}건")
+        if dead_lettered:
+            print(f"요약 포기(dead-letter): {dead_lettered}건 — 웹 UI 기사 목록의 '요약 실패'에서 재시도")
+        if router.cheap_model:
+            print(f"{'경로':<14} {'모델':<28} {'호출':>4} {'승격':>4} {'입력':>8} {'출력':>7} {'평균초':>6}")
+            for r in router.report():
+                print(
+                    f"{r['route']:<14} {r['model'][:28]:<28} {r['calls']:>4} {r['escalations']:>4} "
+                    f"{r['input_tokens']:>8} {r['output_tokens']:>7} {r['avg_seconds']:>6.2f}"
+                )
+        _report_retries("summarize", client)
+        return succeeded
+    finally:
+        client.close()
 
-    targets = unsummarized[:max_articles]
-    for i, article in enumerate(targets, 1):
-        print(f"요약 중... ({i}/{len(targets)}) {article['title'][:60]}")
-        try:
-            title_ko, summary_ko = summarize_article(client, article, model)
-            db.save_summary(article["id"], title_ko, summary_ko)
-        except Exception:
-            logger.exception("Failed to summarize article %d", article["id"])
 
-    print(f"요약 완료: {len(targets)}건")
-    return len(targets)
+def cmd_summarize_batch(db: Database, config: dict) -> int:
+    """Submit every pending summary as one provider batch job (no per-run cap).
+
+    Providers without a batch endpoint fall back to the synchronous path.
+    """
+    unsummarized = db.get_unsummarized()
+    if not unsummarized:
+        print("요약할 기사가 없습니다.")
+        return 0
 
+    client = create_llm_client(config, purpose="summarize")
+    if not client.supports_batch:
+        client.close()
+        print("현재 LLM provider는 배치 API를 지원하지 않아 일반 요약으로 진행합니다.")
+        return cmd_summarize(db, config)
+    try:
+        provider = config.get("llm", {}).get("provider", "anthropic").lower()
+        model = config.get("summarizer", {}).get("model", "claude-sonnet-4-20250514")
+        job_id = submit_summary_batch(client, unsummarized, model)
+        db.create_llm_batch(provider, job_id, "summarize", model, [a["id"] for a in unsummarized])
+        print(f"배치 제출: {len(unsummarized)}건 (job={job_id})")
+        print("결과 수집: paleonews summarize --collect")
+        return len(unsummarized)
+    finally:
+        client.close()
 
-def cmd_send(db: Database, config: dict):
+
+def cmd_summarize_collect(db: Database, config: dict) -> int:
+    """Write results of finished summary batch jobs. Unfinished jobs are left open."""
+    batches = db.get_open_llm_batches("summarize")
+    if not batches:
+        print("수집할 배치가 없습니다.")
+        return 0
+
+    client = create_llm_client(config, purpose="summarize")
+    try:
+        provider = config.get("llm", {}).get("provider", "anthropic").lower()
+        saved = 0
+        for batch in batches:
+            if batch["provider"] != provider:
+                print(f"배치 {batch['job_id']}: provider 불일치 ({batch['provider']}), 건너뜀")
+                continue
+            article_ids = db.get_llm_batch_article_ids(batch["id"])
+            results = collect_summary_batch(client, batch["job_id"], article_ids)
+            if results is None:
+                print(f"배치 {batch['job_id']}: 아직 처리 중")
+                continue
+            failed = 0
+            with db.batch() as writer:
+                for article_id, result in results.items():
+                    if isinstance(result, Exception):
+                        logger.warning("Batch summary failed for article %d: %s", article_id, result)
+                        db.record_summary_failure(
+                            article_id, f"batch: {result}",
+                            int(config.get("summarizer", {}).get("max_attempts", 5)),
+                            float(config.get("summarizer", {}).get("retry_base_minutes", 30)),
+                        )
+                        failed += 1
+                        continue
+                    writer.save_summary(article_id, *result)
+                    saved += 1
+            db.finish_llm_batch(batch["id"])
+            print(f"배치 {batch['job_id']}: {len(results) - failed}건 저장, {failed}건 실패")
+
+        print(f"배치 요약 저장: {saved}건")
+        return saved
+    finally:
+        client.close()
+
+
+def cmd_send(db: Database, config: dict) -> int:
+    """Plan and render deliveries into the outbox (sent by `cmd_deliver`)."""
     channels_config = config.get("channels", {})
-    sent_any = False
+    recipients: list[Recipient] = []
 
     # Telegram — multi-user dispatch
     tg_config = channels_config.get("telegram", {})
-    if tg_config.get("enabled", True):
+    if as_bool(tg_config.get("enabled", True)):
         bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
         if bot_token:
             # Seed admin user if TELEGRAM_CHAT_ID is set
@@ -121,132 +273,84 @@ def cmd_send(db: Database, config: dict):
                 users = [{"id": None, "telegram_chat_id": admin_chat_id, "keywords": None}]
 
             for user in users:
-                user_id = user["id"]
                 chat_id = user["telegram_chat_id"]
                 if not chat_id or not user.get("notify_telegram", True):
                     continue  # Skip users without Telegram or with notifications disabled
-
-                if user_id is not None:
-                    unsent = db.get_unsent_for_user("telegram", user_id)
-                else:
-                    unsent = db.get_unsent("telegram")
-
-                if not unsent:
-                    continue
-
-                # Apply per-user keyword filter
-                user_keywords = db.get_user_keywords(user_id) if user_id else None
-                filtered = filter_articles_for_user(unsent, user_keywords)
-
-                if not filtered:
-                    # Mark as sent even if filtered out, to avoid re-processing
-                    for a in unsent:
-                        db.record_dispatch(a["id"], "telegram", "filtered", user_id=user_id)
-                    continue
-
-                briefing = generate_briefing(filtered, date.today().isoformat())
-                dispatcher = TelegramDispatcher(bot_token, chat_id)
-                success = asyncio.run(dispatcher.send_briefing(briefing))
-                status = "success" if success else "failed"
-                for a in filtered:
-                    db.record_dispatch(a["id"], "telegram", status, user_id=user_id)
-                # Mark non-filtered articles as filtered
-                filtered_ids = {a["id"] for a in filtered}
-                for a in unsent:
-                    if a["id"] not in filtered_ids:
-                        db.record_dispatch(a["id"], "telegram", "filtered", user_id=user_id)
-                print(f"Telegram [{chat_id}] 전송 {'완료' if success else '실패'}: {len(filtered)}건")
-                sent_any = True
+                recipients.append(Recipient.from_user("telegram", user, chat_id))
 
     # Email — per-user dispatch
     email_config = channels_config.get("email", {})
-    if email_config.get("enabled", False):
+    if as_bool(email_config.get("enabled", False)):
         password = os.environ.get("EMAIL_PASSWORD", "")
         sender = email_config.get("sender", "")
-        smtp_host = email_config.get("smtp_host", "smtp.gmail.com")
-        smtp_port = email_config.get("smtp_port", 587)
-
         if sender and password:
-            # Per-user email dispatch
-            email_users = db.get_email_users()
-
-            # Also include static recipients from config (backwards compatible)
+            for user in db.get_email_users():
+                recipients.append(Recipient.from_user("email", user, user["email"]))
+            # Also include static recipients from config (backwards compatible, no user_id)
             static_recipients = email_config.get("recipients", [])
-
-            for user in email_users:
-                user_id = user["id"]
-                user_email = user["email"]
-
-                unsent = db.get_unsent_for_user("email", user_id)
-                if not unsent:
-                    continue
-
-                user_keywords = db.get_user_keywords(user_id)
-                filtered = filter_articles_for_user(unsent, user_keywords)
-
-                if not filtered:
-                    for a in unsent:
-                        db.record_dispatch(a["id"], "email", "filtered", user_id=user_id)
-                    continue
-
-                dispatcher = EmailDispatcher(smtp_host, smtp_port, sender, password, [user_email])
-                success = asyncio.run(dispatcher.send_articles(filtered, date.today().isoformat()))
-                status = "success" if success else "failed"
-                for a in filtered:
-                    db.record_dispatch(a["id"], "email", status, user_id=user_id)
-                filtered_ids = {a["id"] for a in filtered}
-                for a in unsent:
-                    if a["id"] not in filtered_ids:
-                        db.record_dispatch(a["id"], "email", "filtered", user_id=user_id)
-                print(f"Email [{user_email}] 전송 {'완료' if success else '실패'}: {len(filtered)}건")
-                sent_any = True
-
-            # Static recipients (no user_id, legacy mode)
             if static_recipients:
-                unsent = db.get_unsent("email")
-                if unsent:
-                    dispatcher = EmailDispatcher(smtp_host, smtp_port, sender, password, static_recipients)
-                    success = asyncio.run(dispatcher.send_articles(unsent, date.today().isoformat()))
-                    status = "success" if success else "failed"
-                    for a in unsent:
-                        db.record_dispatch(a["id"], "email", status)
-                    print(f"Email {static_recipients} 전송 {'완료' if success else '실패'}: {len(unsent)}건")
-                    sent_any = True
-
-    # Slack
-    slack_config = channels_config.get("slack", {})
-    if slack_config.get("enabled", False):
-        webhook_url = os.environ.get("SLACK_WEBHOOK_URL", "")
-        if webhook_url:
-            unsent = db.get_unsent("slack")
-            if unsent:
-                briefing = generate_briefing(unsent, date.today().isoformat())
-                dispatcher = WebhookDispatcher(webhook_url, "slack")
-                success = asyncio.run(dispatcher.send_briefing(briefing))
-                status = "success" if success else "failed"
-                for a in unsent:
-                    db.record_dispatch(a["id"], "slack", status)
-                print(f"Slack 전송 {'완료' if success else '실패'}: {len(unsent)}건")
-                sent_any = True
-
-    # Discord
-    discord_config = channels_config.get("discord", {})
-    if discord_config.get("enabled", False):
-        webhook_url = os.environ.get("DISCORD_WEBHOOK_URL", "")
-        if webhook_url:
-            unsent = db.get_unsent("discord")
-            if unsent:
-                briefing = generate_briefing(unsent, date.today().isoformat())
-                dispatcher = WebhookDispatcher(webhook_url, "discord")
-                success = asyncio.run(dispatcher.send_briefing(briefing))
-                status = "success" if success else "failed"
-                for a in unsent:
-                    db.record_dispatch(a["id"], "discord", status)
-                print(f"Discord 전송 {'완료' if success else '실패'}: {len(unsent)}건")
-                sent_any = True
-
-    if not sent_any:
+                recipients.append(Recipient("email", None, static_recipients))
+
+    # Slack / Discord — one channel-wide webhook each
+    for channel, env_var in WEBHOOK_ENV.items():
+        if as_bool(channels_config.get(channel, {}).get("enabled", False)) and os.environ.get(env_var, ""):
+            recipients.append(Recipient(channel, None, ""))
+
+    # Hourly/daily users only get a pass once per window, staggered over it
+    due = DeliverySchedule.from_config(config).select_due(recipients, db.get_windows_served())
+    if len(due) < len(recipients):
+        logger.info("Delivery windows: %d of %d recipients not due yet",
+                    len(recipients) - len(due), len(recipients))
+    plan = build_send_plan(db, due)
+    logger.info("Send plan: %d recipients, %d ready articles, %d deliveries",
+                len(due), plan.ready, plan.pending)
+    queued = enqueue_plan(db, plan, RenderCache(), date.today().isoformat())
+    # Windows are used up even when nothing matched, so later articles wait for the next one
+    db.mark_windows_served([(r.channel, r.user_id) for r in due if r.not_before is not None])
+    if queued:
+        print(f"전송 대기열에 {queued}건 추가")
+    else:
         print("전송할 기사가 없거나 활성화된 채널이 없습니다.")
+    return queued
+
+
+def cmd_deliver(db: Database, config: dict, once: bool = True) -> int:
+    """Drain the outbox: due messages once, or keep polling as a worker."""
+    deliverer = OutboxDeliverer(db, config)
+    try:
+        if once:
+            attempted = deliverer.deliver_due()
+        else:
+            poll_interval = float(config.get("delivery", {}).get("poll_interval", 5))
+            print(f"전송 워커 시작 (대기열 확인 간격 {poll_interval:g}초, Ctrl+C로 종료)")
+            try:
+                deliverer.run_forever(poll_interval)
+            except KeyboardInterrupt:
+                pass
+            attempted = sum(deliverer.counts.values())
+    finally:
+        deliverer.close()
+    counts = deliverer.counts
+    if attempted:
+        print(f"전송 결과: 완료 {counts['sent']}건, 재시도 대기 {counts['pending']}건, 포기 {counts['dead']}건")
+    return counts["sent"]
+
+
+def _deliver_inline(config: dict) -> bool:
+    """Whether send/run also drain the outbox, or leave it to `paleonews deliver`."""
+    return as_bool(config.get("delivery", {}).get("inline", True))
+
+
+def _send_and_deliver(db: Database, config: dict):
+    """The send stage of `send`/`run`: queue, then drain what is due inline if
+    configured. Staggered slots still in the future are left to the deliver
+    worker (or the next send pass), so a send never sleeps through them."""
+    cmd_send(db, config)
+    if _deliver_inline(config):
+        cmd_deliver(db, config)
+        waiting = db.get_outbox_stats().get("pending", 0)
+        if waiting:
+            print(f"예약·재시도 대기 {waiting}건은 전송 워커(또는 다음 send 실행)가 시각에 맞춰 보냅니다.")
 
 
 def cmd_users(db: Database, args):
@@ -271,7 +375,7 @@ def cmd_users(db: Database, args):
             else:
                 kw_str = " 키워드: 전체 수신"
             name = u.get("display_name") or u.get("username") or ""
-            print(f"  {u['id']}. {name}{tg_str}{email_str} ({status}{admin}){kw_str}")
+            print(f"  {u['id']}. {name}{tg_str}{email_str} ({status}{admin}){kw_str} 전송: {_describe_window(u)}")
 
     elif sub == "add":
         name = getattr(args, "name", None)
@@ -329,6 +433,26 @@ def cmd_users(db: Database, args):
             db.update_user_email(user["id"], email_addr)
             print(f"id={args.user_id}: email={email_addr}")
 
+    elif sub == "delivery":
+        user = db.get_user(args.user_id)
+        if not user:
+            print(f"사용자를 찾을 수 없습니다: id={args.user_id}")
+            return
+        if args.mode is None:
+            print(f"id={args.user_id}: {_describe_window(user)}")
+            return
+        hour = args.hour if args.hour is not None else user.get("delivery_hour", 8)
+        try:
+            validate_preferences(args.mode, hour, args.tz)
+        except ValueError as e:
+            print(f"잘못된 전송 설정: {e}")
+            return
+        fields = {"delivery_mode": args.mode, "delivery_hour": hour}
+        if args.tz is not None:
+            fields["timezone"] = args.tz or None
+        db.update_user(user["id"], **fields)
+        print(f"id={args.user_id}: {_describe_window(db.get_user(user['id']))}")
+
     elif sub == "activate":
         user = db.get_user(args.user_id)
         if not user:
@@ -346,6 +470,16 @@ def cmd_users(db: Database, args):
         print(f"사용자 비활성화: id={args.user_id}")
 
 
+def _describe_window(user: dict) -> str:
+    mode = user.get("delivery_mode") or "immediate"
+    if mode == "hourly":
+        return "매시간"
+    if mode == "daily":
+        tz = user.get("timezone") or "기본 시간대"
+        return f"매일 {user.get('delivery_hour', 8):02d}:00 ({tz})"
+    return "즉시"
+
+
 def cmd_sources(db: Database, args):
     import sqlite3 as _sqlite3
 
@@ -389,12 +523,32 @@ def cmd_sources(db: Database, args):
         print(f"소스 {'활성화' if active else '비활성화'}: id={feed['id']} {feed['url']}")
 
 
-def cmd_status(db: Database, verbose: bool = False):
+def cmd_search(db: Database, args):
+    """Full-text search over articles, best matches first."""
+    articles, total = db.search_articles(args.query, status=args.status, per_page=args.limit)
+    if not total:
+        print(f"검색 결과가 없습니다: {args.query}")
+        return
+    print(f"검색 결과: {total}건" + (f" (상위 {len(articles)}건)" if total > len(articles) else ""))
+    for a in articles:
+        published = (a.get("published") or a["fetched_at"])[:10]
+        title = a.get("title_ko") or a["title"]
+        print(f"  {a['id']:>6}  {published}  [{a.get('source') or '-'}] {title[:70]}")
+        print(f"          {a['url']}")
+
+
+def cmd_status(db: Database, verbose: bool = False, config: dict | None = None):
     stats = db.get_stats()
     print(f"전체 기사:   {stats['total']}건")
     print(f"관련 기사:   {stats['relevant']}건")
     print(f"요약 완료:   {stats['summarized']}건")
     print(f"전송 완료:   {stats['sent']}건")
+    if stats["dead_letter"]:
+        print(f"요약 포기:   {stats['dead_letter']}건 (dead-letter)")
+    outbox = db.get_outbox_stats()
+    if outbox.get("pending") or outbox.get("sending") or outbox.get("dead"):
+        print(f"전송 대기열: 대기 {outbox.get('pending', 0)}건, 전송 중 {outbox.get('sending', 0)}건, "
+              f"포기 {outbox.get('dead', 0)}건")
 
     if not verbose:
         return
@@ -426,6 +580,15 @@ def cmd_status(db: Database, verbose: bool = False):
                 for err in r["errors"].split("\n"):
                     print(f"    ⚠ {err}")
 
+    # 전송 지연 (최근 7일): 기사 게시 → 수신함
+    latency = db.get_delivery_latency(since_hours=24 * 7)
+    if latency["count"]:
+        print(f"\n--- 전송 지연 (최근 7일, {latency['count']}건) ---")
+        print(f"{'기준':<10} {'중앙값(분)':>10} {'p90(분)':>9} {'최대(분)':>9}")
+        for label, key in (("게시 시각", "published"), ("수집 시각", "fetched")):
+            d = latency[key]
+            print(f"{label:<10} {d['p50']:>10.1f} {d['p90']:>9.1f} {d['max']:>9.1f}")
+
     # 사용자 통계
     users = db.get_all_users()
     if users:
@@ -433,6 +596,37 @@ def cmd_status(db: Database, verbose: bool = False):
         print(f"\n--- 사용자 ---")
         print(f"  전체: {len(users)}명, 활성: {active}명")
 
+    # LLM 호출 사용량 (최근 7일)
+    flush_call_ledgers()
+    usage = db.get_llm_usage(since_hours=24 * 7)
+    if usage:
+        print(f"\n--- LLM 사용량 (최근 7일) ---")
+        print(f"{'용도':<10} {'모델':<28} {'호출':>5} {'실패':>4} {'입력':>9} {'출력':>8} "
+              f"{'비용($)':>8} {'평균ms':>7} {'최대ms':>7}")
+        for u in usage:
+            print(
+                f"{u['purpose']:<10} {u['model'][:28]:<28} {u['calls']:>5} {u['errors']:>4} "
+                f"{u['input_tokens']:>9} {u['output_tokens']:>8} {u['cost_usd']:>8.3f} "
+                f"{u['avg_ms']:>7.0f} {u['max_ms']:>7.0f}"
+            )
+        print(f"  합계: {sum(u['calls'] for u in usage)}회, ${sum(u['cost_usd'] for u in usage):.3f}")
+
+    # LLM 응답 캐시
+    cache_config = (config or {}).get("llm", {}).get("cache") or {}
+    if cache_config.get("enabled_for"):
+        from .llm_cache import get_response_store
+        cache_stats = get_response_store(cache_config).stats()
+        if cache_stats:
+            print(f"\n--- LLM 응답 캐시 ---")
+            print(f"{'용도':<12} {'적중':>6} {'미스':>6} {'적중률':>7} {'절약 KB':>8} {'항목':>6} {'저장 KB':>8}")
+            for c in cache_stats:
+                total = c["hits"] + c["misses"]
+                rate = f"{c['hits'] / total:.0%}" if total else "-"
+                print(
+                    f"{c['purpose']:<12} {c['hits']:>6} {c['misses']:>6} {rate:>7} "
+                    f"{c['hit_bytes'] / 1024:>8.1f} {c['entries']:>6} {c['stored_bytes'] / 1024:>8.1f}"
+                )
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -445,8 +639,21 @@ def main():
     subparsers.add_parser("fetch", help="Fetch RSS feeds only")
     subparsers.add_parser("filter", help="Filter articles only")
     subparsers.add_parser("crawl", help="Crawl article body text")
-    subparsers.add_parser("summarize", help="Summarize articles only")
-    subparsers.add_parser("send", help="Send briefing only")
+    summarize_parser = subparsers.add_parser("summarize", help="Summarize articles only")
+    summarize_mode = summarize_parser.add_mutually_exclusive_group()
+    summarize_mode.add_argument("--batch", action="store_true",
+                                help="Submit all pending summaries as one provider batch job")
+    summarize_mode.add_argument("--collect", action="store_true",
+                                help="Save results of finished batch jobs")
+    subparsers.add_parser("send", help="Queue briefings in the outbox (and deliver unless delivery.inline is off)")
+    deliver_parser = subparsers.add_parser("deliver", help="Run the outbox delivery worker")
+    deliver_parser.add_argument("--once", action="store_true", help="Send what is due, then exit")
+    search_parser = subparsers.add_parser("search", help="Search articles (title, summary, body; English and Korean)")
+    search_parser.add_argument("query", help="Search terms (all must match)")
+    search_parser.add_argument("--status", default="all",
+                               choices=["all", "relevant", "summarized", "sent", "failed"],
+                               help="Only articles in this state")
+    search_parser.add_argument("--limit", type=int, default=20, help="Max results to show (default: 20)")
     status_parser = subparsers.add_parser("status", help="Show database statistics")
     status_parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed stats")
 
@@ -480,6 +687,11 @@ def main():
     user_email = users_sub.add_parser("email", help="Set user email address")
     user_email.add_argument("user_id", type=int, help="User ID")
     user_email.add_argument("email_addr", nargs="?", help="Email address (omit to show, 'none' to clear)")
+    user_delivery = users_sub.add_parser("delivery", help="Set when a user receives briefings")
+    user_delivery.add_argument("user_id", type=int, help="User ID")
+    user_delivery.add_argument("mode", nargs="?", choices=DELIVERY_MODES, help="Delivery window (omit to show)")
+    user_delivery.add_argument("--hour", type=int, help="Local hour for daily delivery (0-23)")
+    user_delivery.add_argument("--tz", help="IANA time zone, e.g. Asia/Seoul ('' for the default)")
     user_activate = users_sub.add_parser("activate", help="Activate a user")
     user_activate.add_argument("user_id", type=int, help="User ID")
     user_deactivate = users_sub.add_parser("deactivate", help="Deactivate a user")
@@ -529,9 +741,15 @@ def main():
             "fetch": lambda: cmd_fetch(db, config),
             "filter": lambda: cmd_filter(db, config),
             "crawl": lambda: cmd_crawl(db, config),
-            "summarize": lambda: cmd_summarize(db, config),
-            "send": lambda: cmd_send(db, config),
-            "status": lambda: cmd_status(db, verbose=getattr(args, "verbose", False)),
+            "summarize": lambda: (
+                cmd_summarize_batch(db, config) if args.batch
+                else cmd_summarize_collect(db, config) if args.collect
+                else cmd_summarize(db, config)
+            ),
+            "send": lambda: _send_and_deliver(db, config),
+            "deliver": lambda: cmd_deliver(db, config, once=args.once),
+            "search": lambda: cmd_search(db, args),
+            "status": lambda: cmd_status(db, verbose=getattr(args, "verbose", False), config=config),
             "sources": lambda: cmd_sources(db, args),
             "users": lambda: cmd_users(db, args),
             "run": lambda: _run_pipeline(db, config),
@@ -594,7 +812,7 @@ def _run_pipeline(db: Database, config: dict):
 
     print("\n=== 5/5 전송 ===")
     try:
-        cmd_send(db, config)
+        _send_and_deliver(db, config)
     except Exception as e:
         logger.exception("Send failed")
         errors.append(f"전송 실패: {e}")
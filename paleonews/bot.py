@@ -1,25 +1,33 @@
 """Telegram bot daemon for user self-service and chat."""
 
+import asyncio
 import json
 import logging
 import os
+import time
 
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 
+from .config import as_bool
 from .db import Database
 from .llm import create_llm_client, LLMClient
 
 logger = logging.getLogger(__name__)
 
+TELEGRAM_MAX_CHARS = 4096
+_COMMAND_TAGS = ("[MEMORY:", "[FORGET:")
+
+# Static persona/instructions — sent as the cacheable prefix. Per-user
+# memories are appended after it as the dynamic part of the system prompt.
+# At under 100 tokens it is below the minimum cacheable size (see LLMClient),
+# so it is only cached once the persona grows past it.
 CHAT_SYSTEM_PROMPT = """\
 당신은 고생물학(paleontology) 전문 AI 어시스턴트입니다.
 사용자와 친근하게 대화하며, 고생물학 관련 질문에 전문적으로 답변합니다.
 한국어로 답변하되, 학술 용어는 영어를 병기할 수 있습니다.
 답변은 간결하게 하되, 필요한 정보는 빠뜨리지 마세요.
 
-{memory_section}
-
 사용자가 무언가를 "기억해줘", "기억해", "remember" 등으로 요청하면,
 반드시 응답의 맨 마지막 줄에 다음 형식으로 기억할 내용을 추가하세요:
 [MEMORY: 기억할 내용]
@@ -201,19 +209,38 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         memory_section = ""
 
-    system = CHAT_SYSTEM_PROMPT.format(memory_section=memory_section)
-
     # Send typing indicator
     await update.effective_chat.send_action("typing")
 
-    try:
-        response = llm.chat(chat_model, user_text, system=system, max_tokens=1024)
-    except Exception as e:
-        logger.error("Chat LLM error for user %s: %s", chat_id, e)
-        await update.message.reply_text("죄송합니다, 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
-        return
-
-    # Process memory commands in response
+    if context.bot_data.get("stream", True):
+        streamed = await _stream_reply(update, context, llm, chat_model, user_text, memory_section)
+        if streamed is None:
+            return
+        message, shown, response = streamed
+    else:
+        message, shown = None, ""
+        try:
+            response = llm.chat(chat_model, user_text, system=memory_section,
+                                cache_prefix=CHAT_SYSTEM_PROMPT, max_tokens=1024)
+        except Exception as e:
+            logger.error("Chat LLM error for user %s: %s", chat_id, e)
+            await update.message.reply_text("죄송합니다, 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+            return
+
+    reply = _apply_memory_commands(db, user, memories, response, chat_id)
+
+    if message is None:
+        if reply:
+            await update.message.reply_text(reply)
+    elif not reply:
+        await message.delete()
+    elif reply[:TELEGRAM_MAX_CHARS] != shown:
+        await message.edit_text(reply[:TELEGRAM_MAX_CHARS])
+
+
+def _apply_memory_commands(db: Database, user: dict, memories: list[dict],
+                           response: str, chat_id: str) -> str:
+    """Save/delete memories requested by the model and strip those lines."""
     reply = response
     for line in response.split("\n"):
         line = line.strip()
@@ -231,9 +258,99 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                         db.delete_memory(m["id"])
                         logger.info("Deleted memory %d for user %s", m["id"], chat_id)
             reply = reply.replace(line, "").strip()
-
-    if reply:
-        await update.message.reply_text(reply)
+    return reply
+
+
+def visible_text(partial: str) -> str:
+    """Text of a partial reply that is safe to show while streaming.
+
+    Drops [MEMORY:]/[FORGET:] command lines, including a trailing line that
+    may still be growing into one, so they never flash up in the chat.
+    """
+    lines = partial.split("\n")
+    shown = []
+    for i, line in enumerate(lines):
+        head = line.strip()
+        if head.startswith(_COMMAND_TAGS):
+            continue
+        if i == len(lines) - 1 and head and any(
+            tag.startswith(head) or head.startswith(tag) for tag in _COMMAND_TAGS
+        ):
+            continue
+        shown.append(line)
+    return "\n".join(shown).strip()
+
+
+async def _stream_reply(update: Update, context: ContextTypes.DEFAULT_TYPE, llm: LLMClient,
+                        chat_model: str, user_text: str, memory_section: str):
+    """Post the reply as soon as text arrives and edit it in place as it grows.
+
+    The provider stream is consumed in a worker thread; edits are throttled
+    to one per `stream_interval` seconds (Telegram rate-limits edits).
+    Returns (message or None, text currently shown, full reply text), or
+    None after an error reply has been sent.
+    """
+    chat_id = str(update.effective_chat.id)
+    interval: float = context.bot_data.get("stream_interval", 1.0)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def produce():
+        try:
+            for chunk in llm.stream(chat_model, user_text, system=memory_section,
+                                    cache_prefix=CHAT_SYSTEM_PROMPT, max_tokens=1024):
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    started = time.monotonic()
+    producer = loop.run_in_executor(None, produce)
+    message = None
+    shown = ""
+    parts: list[str] = []
+    last_edit = 0.0
+    error = None
+    while True:
+        item = await queue.get()
+        if item is done:
+            break
+        if isinstance(item, Exception):
+            error = item
+            continue
+        parts.append(item)
+        text = visible_text("".join(parts))[:TELEGRAM_MAX_CHARS]
+        if not text or text == shown:
+            continue
+        now = time.monotonic()
+        try:
+            if message is None:
+                message = await update.message.reply_text(text)
+                logger.info("Chat %s: first text after %.2fs", chat_id, now - started)
+            elif now - last_edit >= interval:
+                await message.edit_text(text)
+            else:
+                continue
+        except Exception as e:
+            # A failed intermediate edit (e.g. RetryAfter) is not fatal; the
+            # final edit brings the message up to date.
+            logger.warning("Chat %s: streaming update failed: %s", chat_id, e)
+            continue
+        shown = text
+        last_edit = now
+    await producer
+
+    if error is not None:
+        logger.error("Chat LLM error for user %s: %s", chat_id, error)
+        apology = "죄송합니다, 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
+        if message is None:
+            await update.message.reply_text(apology)
+        else:
+            await message.edit_text(f"{shown}\n\n({apology})"[:TELEGRAM_MAX_CHARS])
+        return None
+    logger.info("Chat %s: reply complete after %.2fs", chat_id, time.monotonic() - started)
+    return message, shown, "".join(parts).strip()
 
 
 def run_bot(db: Database, config: dict):
@@ -249,13 +366,15 @@ def run_bot(db: Database, config: dict):
         db.seed_admin(admin_chat_id)
 
     # Initialize LLM client for chat
-    llm = create_llm_client(config)
+    llm = create_llm_client(config, purpose="chat")
     chat_model = config.get("chat", {}).get("model", "claude-haiku-4-5-20251001")
 
     app = Application.builder().token(bot_token).build()
     app.bot_data["db"] = db
     app.bot_data["llm"] = llm
     app.bot_data["chat_model"] = chat_model
+    app.bot_data["stream"] = as_bool(config.get("chat", {}).get("stream", True))
+    app.bot_data["stream_interval"] = float(config.get("chat", {}).get("stream_interval", 1.0))
 
     app.add_handler(CommandHandler("start", cmd_start))
     app.add_handler(CommandHandler("stop", cmd_stop))
@@ -267,4 +386,7 @@ def run_bot(db: Database, config: dict):
 
     print("Telegram 봇 시작... (Ctrl+C로 종료)")
     logger.info("Bot daemon started with chat model: %s", chat_model)
-    app.run_polling()
+    try:
+        app.run_polling()
+    finally:
+        llm.close()
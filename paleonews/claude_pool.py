@@ -0,0 +1,227 @@
+"""Pool of long-lived `claude` CLI sessions speaking stream-json.
+
+Spawning `claude -p` costs a Node.js boot plus CLI initialization on every
+call, which dwarfs the model time for short prompts like the relevance
+check. A pooled worker is started once with `--input-format stream-json
+--output-format stream-json` and then fed one user message per call on
+stdin; the turn ends when the CLI emits its `result` event.
+
+Turns sent to the same worker share that session's conversation: earlier
+prompts would leak into later answers and input tokens would grow every
+turn. So a worker answers `max_calls` prompts (default 1) and is then
+retired. The pool keeps `size` spare workers booting ahead of demand per
+command line and starts a replacement the moment a worker begins its last
+call, so a caller only waits for a CLI boot when calls outpace it. Raise
+`max_calls` only for prompts that may safely share a context.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerError(RuntimeError):
+    """A pooled CLI worker died, timed out or reported an error turn."""
+
+    def __init__(self, message: str, transient: bool = True):
+        super().__init__(message)
+        self.transient = transient
+
+
+class ClaudeWorker:
+    """One `claude` stream-json subprocess. Not thread-safe; the pool hands
+    each worker to one caller at a time."""
+
+    def __init__(self, cmd: list[str], env: dict | None = None):
+        self.cmd = cmd
+        self.calls = 0
+        self.replaced = False  # the pool already started its successor
+        self.started_at = time.monotonic()
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=env,
+        )
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._stderr: deque[str] = deque(maxlen=20)
+        threading.Thread(target=self._pump_stdout, daemon=True).start()
+        threading.Thread(target=self._pump_stderr, daemon=True).start()
+
+    def _pump_stdout(self):
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)  # EOF
+
+    def _pump_stderr(self):
+        for line in self.proc.stderr:
+            self._stderr.append(line.rstrip())
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr) or "(no stderr)"
+
+    def ask(self, prompt: str, timeout: float) -> dict:
+        """Send one user turn and return the CLI's `result` event."""
+        message = {
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "text", "text": prompt}]},
+        }
+        try:
+            self.proc.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"claude worker exited: {self.stderr_tail()}") from e
+        self.calls += 1
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WorkerError(f"claude worker timed out after {timeout}s")
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                raise WorkerError(f"claude worker timed out after {timeout}s") from None
+            if line is None:
+                raise WorkerError(
+                    f"claude worker exited (code {self.proc.poll()}): {self.stderr_tail()}"
+                )
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug("Ignoring non-JSON worker output: %r", line[:200])
+                continue
+            if event.get("type") == "result":
+                if event.get("is_error"):
+                    raise WorkerError(
+                        f"claude CLI error: {event.get('result') or event.get('subtype')}",
+                        transient=False,
+                    )
+                return event
+
+    def close(self, force: bool = False):
+        if force and self.alive:
+            self.proc.kill()
+        if self.alive:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+
+
+class WorkerPool:
+    """Warm-worker pool keyed by the command line (model + system prompt).
+
+    The first call for a key starts `size` workers; at most `size` calls per
+    key are in flight at once. A worker is replaced as soon as it takes its
+    last call (so its successor boots while it works), and a worker that
+    crashes or times out is closed and replaced on release. Once closed, the
+    pool starts no more workers for reuse.
+    """
+
+    def __init__(self, size: int = 2, max_calls: int = 1, env: dict | None = None):
+        self.size = max(1, size)
+        self.max_calls = max(1, max_calls)
+        self.env = env
+        # Per key: idle workers, most recently used last; spares go in front
+        # so they get the longest time to boot.
+        self._idle: dict[tuple, list[ClaudeWorker]] = {}
+        self._busy: dict[tuple, int] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self.spawned = 0
+        self.restarts = 0
+        atexit.register(self.close)
+
+    def _spawn(self, cmd: list[str]) -> ClaudeWorker:
+        self.spawned += 1
+        return ClaudeWorker(cmd, env=self.env)
+
+    def _acquire(self, cmd: list[str], timeout: float) -> ClaudeWorker:
+        key = tuple(cmd)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if not self._closed and key not in self._idle:
+                self._idle[key] = [self._spawn(cmd) for _ in range(self.size)]
+            while not self._closed and (self._busy.get(key, 0) >= self.size
+                                        or not self._idle[key]):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WorkerError(f"no idle claude worker within {timeout}s")
+                self._cond.wait(remaining)
+            if self._closed:
+                # Late caller: a one-off worker, closed again on release
+                worker = self._spawn(cmd)
+                worker.replaced = True
+                return worker
+            idle = self._idle[key]
+            worker = idle.pop()
+            if not worker.alive:  # died while idle
+                worker.close(force=True)
+                self.restarts += 1
+                worker = self._spawn(cmd)
+            if worker.calls + 1 >= self.max_calls:
+                worker.replaced = True
+                idle.insert(0, self._spawn(cmd))
+            self._busy[key] = self._busy.get(key, 0) + 1
+            return worker
+
+    def _release(self, worker: ClaudeWorker, healthy: bool):
+        key = tuple(worker.cmd)
+        with self._cond:
+            if key in self._busy:
+                self._busy[key] -= 1
+            self._cond.notify()
+            if (not self._closed and healthy and worker.alive
+                    and worker.calls < self.max_calls):
+                self._idle[key].append(worker)
+                return
+            if not healthy:
+                self.restarts += 1
+            if not worker.replaced and not self._closed:
+                self._idle[key].insert(0, self._spawn(worker.cmd))
+        worker.close(force=not healthy)
+
+    def ask(self, cmd: list[str], prompt: str, timeout: float) -> dict:
+        worker = self._acquire(cmd, timeout)
+        try:
+            event = worker.ask(prompt, timeout)
+        except WorkerError as e:
+            # An error turn leaves the session usable; a crash or timeout doesn't.
+            self._release(worker, healthy=not e.transient)
+            raise
+        except BaseException:
+            self._release(worker, healthy=False)
+            raise
+        self._release(worker, healthy=True)
+        return event
+
+    def idle_workers(self) -> list[ClaudeWorker]:
+        with self._cond:
+            return [w for idle in self._idle.values() for w in idle]
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            workers = [w for idle in self._idle.values() for w in idle]
+            self._idle.clear()
+            self._busy.clear()
+            self._cond.notify_all()
+        for worker in workers:
+            worker.close()
@@ -17,13 +17,20 @@ def load_config(config_path: str = "config.yaml") -> dict:
         return yaml.safe_load(f)
 
 
+def as_bool(value) -> bool:
+    """Read a config flag that may be a YAML bool or an overlay/env string."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
 def apply_settings_overlay(config: dict, overrides: dict[str, str]) -> dict:
     """Return a new config with dot-path overrides applied on top.
 
     Example: {"summarizer.model": "claude-sonnet-4-6"} ->
         config["summarizer"]["model"] = "claude-sonnet-4-6"
 
-    Values are stored as strings; callers needing booleans should coerce.
+    Values are stored as strings; read booleans with as_bool().
     """
     if not overrides:
         return config
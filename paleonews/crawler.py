@@ -55,15 +55,16 @@ def crawl_articles(db, max_crawl: int = 20) -> int:
     targets = uncrawled[:max_crawl]
     crawled = 0
 
-    for i, article in enumerate(targets):
-        logger.info("Crawling (%d/%d) %s", i + 1, len(targets), article["url"][:80])
-        body = crawl_article(article["url"])
-        if body:
-            db.save_body(article["id"], body)
-            crawled += 1
+    with db.batch() as writer:
+        for i, article in enumerate(targets):
+            logger.info("Crawling (%d/%d) %s", i + 1, len(targets), article["url"][:80])
+            body = crawl_article(article["url"])
+            if body:
+                writer.save_body(article["id"], body)
+                crawled += 1
 
-        if i < len(targets) - 1:
-            time.sleep(REQUEST_DELAY)
+            if i < len(targets) - 1:
+                time.sleep(REQUEST_DELAY)
 
     logger.info("Crawled %d/%d articles", crawled, len(targets))
     return crawled
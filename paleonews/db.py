@@ -1,6 +1,8 @@
+import hashlib
 import json
 import sqlite3
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 
 
 class Database:
@@ -11,6 +13,7 @@ class Database:
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA foreign_keys=ON")
         self.conn.execute("PRAGMA busy_timeout=5000")
+        self.fts = False  # set by init_tables once the search index exists
 
     def init_tables(self):
         self.conn.executescript("""
@@ -26,7 +29,13 @@ class Database:
                 is_relevant BOOLEAN,
                 summary_ko  TEXT,
                 title_ko    TEXT,
-                body        TEXT
+                body        TEXT,
+                stage       TEXT NOT NULL DEFAULT 'new',
+                summary_attempts INTEGER NOT NULL DEFAULT 0,
+                summary_error    TEXT,
+                summary_next_at  TEXT,
+                summary_dead     BOOLEAN NOT NULL DEFAULT 0,
+                ready_seq   INTEGER
             );
 
             CREATE TABLE IF NOT EXISTS dispatches (
@@ -38,6 +47,55 @@ class Database:
                 user_id     INTEGER REFERENCES users(id)
             );
 
+            -- Per (channel, recipient) high-water mark on articles.ready_seq;
+            -- user_id 0 is the channel-wide recipient (webhooks, static email)
+            CREATE TABLE IF NOT EXISTS delivery_state (
+                channel     TEXT NOT NULL,
+                user_id     INTEGER NOT NULL DEFAULT 0,
+                watermark   INTEGER NOT NULL DEFAULT 0,
+                updated_at  TEXT NOT NULL,
+                window_served_at TEXT,   -- last hourly/daily window given a send pass
+                version     INTEGER NOT NULL DEFAULT 0,  -- bumped on every advance
+                PRIMARY KEY (channel, user_id)
+            );
+
+            -- Articles at or below a watermark whose delivery failed
+            CREATE TABLE IF NOT EXISTS delivery_exceptions (
+                channel     TEXT NOT NULL,
+                user_id     INTEGER NOT NULL DEFAULT 0,
+                article_id  INTEGER NOT NULL REFERENCES articles(id),
+                attempts    INTEGER NOT NULL DEFAULT 1,
+                last_error  TEXT,
+                updated_at  TEXT NOT NULL,
+                PRIMARY KEY (channel, user_id, article_id)
+            );
+
+            -- Rendered message bodies, shared by every outbox row with the same text
+            CREATE TABLE IF NOT EXISTS outbox_messages (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                digest      TEXT UNIQUE NOT NULL,
+                body        TEXT NOT NULL
+            );
+
+            -- Queued deliveries; drained by `paleonews deliver`. While a row
+            -- is 'sending', next_attempt_at is its claim lease.
+            CREATE TABLE IF NOT EXISTS outbox (
+                id              INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel         TEXT NOT NULL,
+                user_id         INTEGER REFERENCES users(id),
+                target          TEXT NOT NULL,
+                message_id      INTEGER NOT NULL REFERENCES outbox_messages(id),
+                article_ids     TEXT NOT NULL,
+                status          TEXT NOT NULL DEFAULT 'pending',
+                attempts        INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT NOT NULL,
+                last_error      TEXT,
+                created_at      TEXT NOT NULL,
+                sent_at         TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_outbox_due
+                ON outbox(next_attempt_at) WHERE status IN ('pending', 'sending');
+
             CREATE TABLE IF NOT EXISTS pipeline_runs (
                 id          INTEGER PRIMARY KEY AUTOINCREMENT,
                 started_at  TEXT NOT NULL,
@@ -63,6 +121,9 @@ class Database:
                 keywords     TEXT,
                 notify_telegram BOOLEAN NOT NULL DEFAULT 1,
                 notify_email    BOOLEAN NOT NULL DEFAULT 1,
+                delivery_mode   TEXT NOT NULL DEFAULT 'immediate',
+                delivery_hour   INTEGER NOT NULL DEFAULT 8,
+                timezone        TEXT,
                 created_at   TEXT NOT NULL,
                 updated_at   TEXT NOT NULL
             );
@@ -88,6 +149,41 @@ class Database:
                 value      TEXT NOT NULL,
                 updated_at TEXT NOT NULL
             );
+
+            CREATE TABLE IF NOT EXISTS llm_batches (
+                id           INTEGER PRIMARY KEY AUTOINCREMENT,
+                provider     TEXT NOT NULL,
+                job_id       TEXT NOT NULL,
+                purpose      TEXT NOT NULL,
+                model        TEXT,
+                status       TEXT NOT NULL DEFAULT 'submitted',
+                submitted_at TEXT NOT NULL,
+                collected_at TEXT
+            );
+
+            CREATE TABLE IF NOT EXISTS llm_batch_items (
+                batch_id   INTEGER NOT NULL REFERENCES llm_batches(id),
+                article_id INTEGER NOT NULL REFERENCES articles(id),
+                PRIMARY KEY (batch_id, article_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at         TEXT NOT NULL,
+                provider           TEXT NOT NULL,
+                model              TEXT NOT NULL,
+                purpose            TEXT NOT NULL,
+                input_tokens       INTEGER NOT NULL DEFAULT 0,
+                output_tokens      INTEGER NOT NULL DEFAULT 0,
+                cache_read_tokens  INTEGER NOT NULL DEFAULT 0,
+                cache_write_tokens INTEGER NOT NULL DEFAULT 0,
+                prompt_chars       INTEGER NOT NULL DEFAULT 0,
+                latency_ms         REAL NOT NULL,
+                outcome            TEXT NOT NULL,
+                error              TEXT,
+                cost_usd           REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_calls_created ON llm_calls(created_at);
         """)
         self.conn.commit()
         self._migrate()
@@ -100,6 +196,43 @@ class Database:
             self.conn.execute("ALTER TABLE articles ADD COLUMN body TEXT")
             self.conn.commit()
 
+        # Migrate: explicit pipeline stage (new → relevant/irrelevant → summarized),
+        # backfilled from the NULL-check columns it replaces for queue lookups
+        if "stage" not in article_cols:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN stage TEXT NOT NULL DEFAULT 'new'")
+            self.conn.execute(
+                """UPDATE articles SET stage = CASE
+                       WHEN is_relevant IS NULL THEN 'new'
+                       WHEN is_relevant = 0 THEN 'irrelevant'
+                       WHEN summary_ko IS NOT NULL THEN 'summarized'
+                       ELSE 'relevant' END"""
+            )
+            self.conn.commit()
+
+        # Migrate: summary attempt tracking / dead-letter columns
+        for col, ddl in (
+            ("summary_attempts", "INTEGER NOT NULL DEFAULT 0"),
+            ("summary_error", "TEXT"),
+            ("summary_next_at", "TEXT"),
+            ("summary_dead", "BOOLEAN NOT NULL DEFAULT 0"),
+        ):
+            if col not in article_cols:
+                self.conn.execute(f"ALTER TABLE articles ADD COLUMN {col} {ddl}")
+        self.conn.commit()
+
+        # Partial indexes: one per work queue, each holding only that queue's
+        # rows, so stage lookups cost O(backlog) rather than O(archive).
+        self.conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_articles_q_unfiltered
+                ON articles(id) WHERE stage = 'new';
+            CREATE INDEX IF NOT EXISTS idx_articles_q_uncrawled
+                ON articles(id) WHERE stage = 'relevant' AND body IS NULL;
+            CREATE INDEX IF NOT EXISTS idx_articles_q_unsummarized
+                ON articles(summary_attempts, id) WHERE stage = 'relevant';
+            CREATE INDEX IF NOT EXISTS idx_articles_q_ready
+                ON articles(id) WHERE stage = 'summarized';
+        """)
+
         # Migrate: add user_id column to dispatches if missing
         dispatch_cols = [row[1] for row in self.conn.execute("PRAGMA table_info(dispatches)")]
         if "user_id" not in dispatch_cols:
@@ -142,6 +275,133 @@ class Database:
             self.conn.execute("ALTER TABLE users ADD COLUMN notify_email BOOLEAN NOT NULL DEFAULT 1")
             self.conn.commit()
 
+        # Migrate: per-user delivery window (immediate / hourly / daily at a local hour)
+        if "delivery_mode" not in user_cols:
+            self.conn.execute("ALTER TABLE users ADD COLUMN delivery_mode TEXT NOT NULL DEFAULT 'immediate'")
+            self.conn.execute("ALTER TABLE users ADD COLUMN delivery_hour INTEGER NOT NULL DEFAULT 8")
+            self.conn.execute("ALTER TABLE users ADD COLUMN timezone TEXT")
+            self.conn.commit()
+
+        # Migrate: delivery watermarks replace per-article dispatch bookkeeping
+        if "ready_seq" not in article_cols:
+            self._migrate_delivery_state()
+        state_cols = [row[1] for row in self.conn.execute("PRAGMA table_info(delivery_state)")]
+        if "window_served_at" not in state_cols:
+            self.conn.execute("ALTER TABLE delivery_state ADD COLUMN window_served_at TEXT")
+            self.conn.commit()
+        if "version" not in state_cols:
+            self.conn.execute("ALTER TABLE delivery_state ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self.conn.commit()
+        self.conn.executescript("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_ready_seq
+                ON articles(ready_seq) WHERE ready_seq IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS idx_dispatches_article
+                ON dispatches(article_id, channel, user_id);
+        """)
+
+        self.fts = self._init_search_index()
+
+    # Columns indexed for search, and their bm25 weights (titles count most)
+    _FTS_COLUMNS = ("title", "summary", "title_ko", "summary_ko", "body", "source")
+    _FTS_WEIGHTS = (10.0, 3.0, 10.0, 3.0, 1.0, 2.0)
+
+    _FTS_OBJECTS = ("articles_fts", "articles_fts_ai", "articles_fts_ad", "articles_fts_au")
+
+    def _init_search_index(self) -> bool:
+        """Create the trigram FTS5 index over articles, kept in sync by triggers.
+
+        The index is external-content (it stores no copy of the text) and
+        is rebuilt once when first created. The table, its triggers and the
+        rebuild go in one explicit transaction; an index missing any trigger
+        is dropped and recreated. Returns False if this SQLite build lacks
+        FTS5 or the trigram tokenizer (< 3.34); search then falls back to LIKE.
+        """
+        placeholders = ", ".join("?" * len(self._FTS_OBJECTS))
+        found = {row[0] for row in self.conn.execute(
+            f"SELECT name FROM sqlite_master WHERE name IN ({placeholders})", self._FTS_OBJECTS
+        )}
+        if len(found) == len(self._FTS_OBJECTS):
+            return True
+        cols = ", ".join(self._FTS_COLUMNS)
+        new = ", ".join(f"new.{c}" for c in self._FTS_COLUMNS)
+        old = ", ".join(f"old.{c}" for c in self._FTS_COLUMNS)
+        statements = [
+            "DROP TRIGGER IF EXISTS articles_fts_ai",
+            "DROP TRIGGER IF EXISTS articles_fts_ad",
+            "DROP TRIGGER IF EXISTS articles_fts_au",
+            "DROP TABLE IF EXISTS articles_fts",
+            f"""CREATE VIRTUAL TABLE articles_fts USING fts5(
+                    {cols}, content='articles', content_rowid='id', tokenize='trigram')""",
+            f"""CREATE TRIGGER articles_fts_ai AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, {cols}) VALUES (new.id, {new});
+                END""",
+            f"""CREATE TRIGGER articles_fts_ad AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, {cols}) VALUES ('delete', old.id, {old});
+                END""",
+            f"""CREATE TRIGGER articles_fts_au AFTER UPDATE OF {cols} ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, {cols}) VALUES ('delete', old.id, {old});
+                    INSERT INTO articles_fts (rowid, {cols}) VALUES (new.id, {new});
+                END""",
+            "INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')",
+        ]
+        # sqlite3 doesn't open a transaction before DDL on its own, and
+        # executescript() would commit first, so BEGIN explicitly
+        self.conn.commit()
+        self.conn.execute("BEGIN")
+        try:
+            for sql in statements:
+                self.conn.execute(sql)
+        except sqlite3.OperationalError:
+            self.conn.rollback()
+            return False
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return True
+
+    def _migrate_delivery_state(self):
+        """Backfill ready_seq and derive watermarks from the dispatch history.
+
+        Legacy articles become ready in id order. A recipient's watermark is
+        the longest ready_seq prefix in which every article has a dispatch
+        row of any status; 'failed' rows without a later success become
+        delivery exceptions, and the 'filtered' rows are dropped.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN ready_seq INTEGER")
+            self.conn.execute(
+                "UPDATE articles SET ready_seq = id WHERE is_relevant = 1 AND summary_ko IS NOT NULL"
+            )
+            self.conn.execute(
+                """INSERT OR IGNORE INTO delivery_state (channel, user_id, watermark, updated_at)
+                   SELECT p.channel, p.uid,
+                          COALESCE(
+                              (SELECT MIN(a.ready_seq) - 1 FROM articles a
+                               WHERE a.ready_seq IS NOT NULL AND NOT EXISTS (
+                                   SELECT 1 FROM dispatches d
+                                   WHERE d.article_id = a.id AND d.channel = p.channel
+                                     AND COALESCE(d.user_id, 0) = p.uid)),
+                              (SELECT COALESCE(MAX(ready_seq), 0) FROM articles)),
+                          ?
+                   FROM (SELECT DISTINCT channel, COALESCE(user_id, 0) AS uid FROM dispatches) p""",
+                (now,),
+            )
+            self.conn.execute(
+                """INSERT OR IGNORE INTO delivery_exceptions
+                       (channel, user_id, article_id, attempts, last_error, updated_at)
+                   SELECT d.channel, COALESCE(d.user_id, 0), d.article_id, COUNT(*),
+                          'failed (migrated)', MAX(d.sent_at)
+                   FROM dispatches d
+                   WHERE d.status = 'failed' AND NOT EXISTS (
+                       SELECT 1 FROM dispatches s
+                       WHERE s.article_id = d.article_id AND s.channel = d.channel
+                         AND s.user_id IS d.user_id AND s.status = 'success')
+                   GROUP BY d.channel, COALESCE(d.user_id, 0), d.article_id"""
+            )
+            self.conn.execute("DELETE FROM dispatches WHERE status = 'filtered'")
+
     def seed_admin(self, telegram_chat_id: str, username: str | None = None):
         """Seed admin user from TELEGRAM_CHAT_ID. Backfills existing telegram dispatches."""
         existing = self.get_user_by_telegram_id(telegram_chat_id)
@@ -160,6 +420,20 @@ class Database:
         self.conn.commit()
         admin_id = cursor.lastrowid
 
+        # The admin inherits the legacy channel-wide telegram watermark
+        self.conn.execute(
+            """INSERT OR IGNORE INTO delivery_state (channel, user_id, watermark, updated_at)
+               SELECT channel, ?, watermark, updated_at FROM delivery_state
+               WHERE channel = 'telegram' AND user_id = 0""",
+            (admin_id,),
+        )
+        self.conn.execute(
+            """INSERT OR IGNORE INTO delivery_exceptions
+                   (channel, user_id, article_id, attempts, last_error, updated_at)
+               SELECT channel, ?, article_id, attempts, last_error, updated_at
+               FROM delivery_exceptions WHERE channel = 'telegram' AND user_id = 0""",
+            (admin_id,),
+        )
         # Backfill existing telegram dispatches with admin user_id
         self.conn.execute(
             "UPDATE dispatches SET user_id = ? WHERE channel = 'telegram' AND user_id IS NULL",
@@ -240,8 +514,10 @@ class Database:
         return json.loads(row["keywords"])
 
     def update_user(self, user_id: int, **fields):
-        """Update arbitrary user fields (telegram_chat_id, username, display_name, email, is_active, is_admin)."""
-        allowed = {"telegram_chat_id", "username", "display_name", "email", "is_active", "is_admin", "notify_telegram", "notify_email"}
+        """Update arbitrary user fields (telegram_chat_id, username, display_name, email, is_active, is_admin,
+        notify_*, delivery_mode, delivery_hour, timezone)."""
+        allowed = {"telegram_chat_id", "username", "display_name", "email", "is_active", "is_admin",
+                   "notify_telegram", "notify_email", "delivery_mode", "delivery_hour", "timezone"}
         updates = {k: v for k, v in fields.items() if k in allowed}
         if not updates:
             return
@@ -397,58 +673,424 @@ class Database:
 
     def get_unfiltered(self) -> list[dict]:
         rows = self.conn.execute(
-            "SELECT * FROM articles WHERE is_relevant IS NULL"
+            "SELECT * FROM articles WHERE stage = 'new' ORDER BY id"
         ).fetchall()
         return [dict(r) for r in rows]
 
+    # Stage transitions live in the SQL so the direct and batched write paths
+    # (see BatchWriter._SQL) cannot drift apart.
+    # ready_seq numbers articles in the order they became sendable; delivery
+    # watermarks compare against it rather than against id, because articles
+    # are not summarized in id order (retries, backoff). Whichever of the
+    # verdict and the summary lands last assigns it.
+    _MARK_RELEVANT_SQL = """UPDATE articles SET is_relevant = ?1,
+                                stage = CASE WHEN NOT ?1 THEN 'irrelevant'
+                                             WHEN summary_ko IS NOT NULL THEN 'summarized'
+                                             ELSE 'relevant' END,
+                                ready_seq = CASE WHEN ?1 AND summary_ko IS NOT NULL THEN COALESCE(
+                                    ready_seq,
+                                    (SELECT COALESCE(MAX(ready_seq), 0) + 1 FROM articles))
+                                    ELSE ready_seq END
+                            WHERE id = ?2"""
+    _SAVE_SUMMARY_SQL = """UPDATE articles SET title_ko = ?, summary_ko = ?,
+                               stage = CASE WHEN is_relevant = 1 THEN 'summarized' ELSE stage END,
+                               ready_seq = CASE WHEN is_relevant = 1 THEN COALESCE(
+                                   ready_seq,
+                                   (SELECT COALESCE(MAX(ready_seq), 0) + 1 FROM articles))
+                                   ELSE ready_seq END
+                           WHERE id = ?"""
+
     def mark_relevant(self, article_id: int, is_relevant: bool):
-        self.conn.execute(
-            "UPDATE articles SET is_relevant = ? WHERE id = ?",
-            (is_relevant, article_id),
-        )
+        self.conn.execute(self._MARK_RELEVANT_SQL, (is_relevant, article_id))
         self.conn.commit()
 
     def get_unsummarized(self) -> list[dict]:
+        """Relevant articles due for a summary attempt.
+
+        Excludes articles waiting in an open batch job, dead-lettered ones and
+        ones still backing off after a failure. Never-tried articles come
+        first, so retries cannot crowd fresh news out of the per-run budget.
+        """
+        now = datetime.now(timezone.utc).isoformat()
         rows = self.conn.execute(
-            "SELECT * FROM articles WHERE is_relevant = 1 AND summary_ko IS NULL"
+            """SELECT * FROM articles
+               WHERE stage = 'relevant'
+                 AND summary_dead = 0
+                 AND (summary_next_at IS NULL OR summary_next_at <= ?)
+                 AND id NOT IN (
+                     SELECT i.article_id FROM llm_batch_items i
+                     JOIN llm_batches b ON b.id = i.batch_id
+                     WHERE b.status = 'submitted'
+                 )
+               ORDER BY summary_attempts, id""",
+            (now,),
         ).fetchall()
         return [dict(r) for r in rows]
 
-    def save_summary(self, article_id: int, title_ko: str, summary_ko: str):
+    def record_summary_failure(self, article_id: int, error: str, max_attempts: int = 5,
+                               base_delay_minutes: float = 30) -> bool:
+        """Count a failed summary attempt and schedule the next one with
+        exponential backoff (capped at a day). Returns True if the article was
+        moved to the dead-letter state."""
+        row = self.conn.execute(
+            "SELECT summary_attempts FROM articles WHERE id = ?", (article_id,),
+        ).fetchone()
+        if row is None:
+            return False
+        attempts = row["summary_attempts"] + 1
+        dead = attempts >= max_attempts
+        delay = min(base_delay_minutes * 60 * 2 ** (attempts - 1), 86400)
+        next_at = None if dead else datetime.fromtimestamp(
+            time.time() + delay, timezone.utc).isoformat()
         self.conn.execute(
-            "UPDATE articles SET title_ko = ?, summary_ko = ? WHERE id = ?",
-            (title_ko, summary_ko, article_id),
+            """UPDATE articles SET summary_attempts = ?, summary_error = ?,
+                      summary_next_at = ?, summary_dead = ?
+               WHERE id = ?""",
+            (attempts, error[:500], next_at, int(dead), article_id),
         )
         self.conn.commit()
+        return dead
 
-    def get_unsent(self, channel: str) -> list[dict]:
+    def get_dead_letter_articles(self) -> list[dict]:
+        """Articles whose summary attempts ran out, newest failure first."""
         rows = self.conn.execute(
-            """SELECT a.* FROM articles a
-               WHERE a.is_relevant = 1
-                 AND a.summary_ko IS NOT NULL
-                 AND a.id NOT IN (
-                     SELECT article_id FROM dispatches
-                     WHERE channel = ? AND status = 'success'
-                       AND user_id IS NULL
-                 )""",
-            (channel,),
+            """SELECT * FROM articles
+               WHERE summary_dead = 1 AND summary_ko IS NULL
+               ORDER BY id DESC"""
         ).fetchall()
         return [dict(r) for r in rows]
 
-    def get_unsent_for_user(self, channel: str, user_id: int) -> list[dict]:
-        """Get articles not yet sent to a specific user on a channel."""
+    def retry_summary(self, article_id: int | None = None) -> int:
+        """Reset attempt tracking so the next summarize run picks the article
+        (or every dead-lettered article when `article_id` is None) up again."""
+        sql = """UPDATE articles SET summary_attempts = 0, summary_error = NULL,
+                        summary_next_at = NULL, summary_dead = 0
+                 WHERE summary_ko IS NULL"""
+        params: tuple = ()
+        if article_id is None:
+            sql += " AND summary_dead = 1"
+        else:
+            sql += " AND id = ?"
+            params = (article_id,)
+        cur = self.conn.execute(sql, params)
+        self.conn.commit()
+        return cur.rowcount
+
+    def save_summary(self, article_id: int, title_ko: str, summary_ko: str):
+        self.conn.execute(self._SAVE_SUMMARY_SQL, (title_ko, summary_ko, article_id))
+        self.conn.commit()
+
+    def get_unsent(self, channel: str, max_attempts: int = 5) -> list[dict]:
+        """Articles not yet delivered on a channel-wide (user-less) channel."""
+        return self.get_unsent_for_user(channel, None, max_attempts)
+
+    def get_unsent_for_user(self, channel: str, user_id: int | None,
+                            max_attempts: int = 5) -> list[dict]:
+        """Get articles not yet sent to a specific user on a channel.
+
+        Only articles above the recipient's watermark are scanned, plus its
+        delivery exceptions that have failed fewer than `max_attempts` times.
+        """
+        uid = user_id or 0
         rows = self.conn.execute(
             """SELECT a.* FROM articles a
-               WHERE a.is_relevant = 1
-                 AND a.summary_ko IS NOT NULL
-                 AND a.id NOT IN (
-                     SELECT article_id FROM dispatches
-                     WHERE channel = ? AND user_id = ? AND status = 'success'
-                 )""",
-            (channel, user_id),
+               WHERE a.ready_seq > COALESCE(
+                         (SELECT watermark FROM delivery_state
+                          WHERE channel = ?1 AND user_id = ?2), 0)
+                 AND NOT EXISTS (
+                     SELECT 1 FROM dispatches d
+                     WHERE d.article_id = a.id AND d.channel = ?1
+                       AND d.user_id IS ?3 AND d.status = 'success'
+                 )
+               UNION
+               SELECT a.* FROM delivery_exceptions e
+               JOIN articles a ON a.id = e.article_id
+               WHERE e.channel = ?1 AND e.user_id = ?2 AND e.attempts < ?4
+               ORDER BY ready_seq""",
+            (channel, uid, user_id, max_attempts),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    # --- Set-based reads for the send planner ---
+
+    def get_delivery_watermarks(self) -> dict[tuple[str, int], int]:
+        """All watermarks, keyed by (channel, user_id); user_id 0 = channel-wide."""
+        rows = self.conn.execute("SELECT channel, user_id, watermark FROM delivery_state")
+        return {(r["channel"], r["user_id"]): r["watermark"] for r in rows}
+
+    def get_delivery_versions(self) -> dict[tuple[str, int], int]:
+        """Each recipient's delivery_state version, keyed like the watermarks.
+
+        Read before the rest of a send plan: `enqueue_deliveries` only applies
+        an item whose recipient is still at the version it was planned from.
+        """
+        rows = self.conn.execute("SELECT channel, user_id, version FROM delivery_state")
+        return {(r["channel"], r["user_id"]): r["version"] for r in rows}
+
+    def get_windows_served(self) -> dict[tuple[str, int], str]:
+        """When each windowed recipient last got a send pass (ISO UTC), keyed
+        by (channel, user_id). Recipients never served are absent."""
+        rows = self.conn.execute(
+            "SELECT channel, user_id, window_served_at FROM delivery_state WHERE window_served_at IS NOT NULL"
+        )
+        return {(r["channel"], r["user_id"]): r["window_served_at"] for r in rows}
+
+    def mark_windows_served(self, keys: list[tuple[str, int | None]], now: datetime | None = None):
+        """Record that these (channel, user_id) recipients had their window's
+        send pass, whether or not it found anything to send."""
+        now = (now or datetime.now(timezone.utc)).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO delivery_state (channel, user_id, watermark, updated_at, window_served_at)
+                   VALUES (?, ?, 0, ?, ?)
+                   ON CONFLICT(channel, user_id) DO UPDATE SET
+                       window_served_at = excluded.window_served_at""",
+                [(channel, user_id or 0, now, now) for channel, user_id in keys],
+            )
+
+    def get_delivery_exceptions(self, max_attempts: int = 5) -> dict[tuple[str, int], set[int]]:
+        """Retryable failed deliveries, keyed by (channel, user_id)."""
+        exceptions: dict[tuple[str, int], set[int]] = {}
+        rows = self.conn.execute(
+            "SELECT channel, user_id, article_id FROM delivery_exceptions WHERE attempts < ?",
+            (max_attempts,),
+        )
+        for r in rows:
+            exceptions.setdefault((r["channel"], r["user_id"]), set()).add(r["article_id"])
+        return exceptions
+
+    def get_ready_articles(self, after_seq: int, max_attempts: int = 5) -> list[dict]:
+        """Sendable articles above `after_seq`, plus any retryable exception
+        articles below it, ordered by ready_seq."""
+        rows = self.conn.execute(
+            """SELECT * FROM articles
+               WHERE ready_seq > ?
+                  OR id IN (SELECT article_id FROM delivery_exceptions WHERE attempts < ?)
+               ORDER BY ready_seq""",
+            (after_seq, max_attempts),
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def get_delivered_ids(self, after_seq: int) -> dict[tuple[str, int], set[int]]:
+        """Successful dispatches of articles above `after_seq`, keyed by
+        (channel, user_id). Normally empty: the watermark covers them."""
+        delivered: dict[tuple[str, int], set[int]] = {}
+        rows = self.conn.execute(
+            """SELECT d.channel, COALESCE(d.user_id, 0) AS user_id, d.article_id
+               FROM dispatches d JOIN articles a ON a.id = d.article_id
+               WHERE a.ready_seq > ? AND d.status = 'success'""",
+            (after_seq,),
+        )
+        for r in rows:
+            delivered.setdefault((r["channel"], r["user_id"]), set()).add(r["article_id"])
+        return delivered
+
+    def advance_delivery(self, channel: str, user_id: int | None, articles: list[dict],
+                         failed_ids=(), error: str | None = None):
+        """Close one delivery pass over `articles` (from get_unsent*).
+
+        The watermark moves past every article in the pass, whether it was
+        sent or filtered out; `failed_ids` are kept as delivery exceptions
+        for a later retry, and exceptions for the rest are cleared.
+        """
+        with self.conn:
+            self._advance_delivery(channel, user_id, articles, failed_ids, error)
+
+    def _advance_delivery(self, channel: str, user_id: int | None, articles: list[dict],
+                          failed_ids=(), error: str | None = None):
+        if not articles:
+            return
+        uid = user_id or 0
+        now = datetime.now(timezone.utc).isoformat()
+        failed = set(failed_ids)
+        top = max(a["ready_seq"] for a in articles)
+        self.conn.execute(
+            """INSERT INTO delivery_state (channel, user_id, watermark, version, updated_at)
+               VALUES (?, ?, ?, 1, ?)
+               ON CONFLICT(channel, user_id) DO UPDATE SET
+                   watermark = MAX(watermark, excluded.watermark),
+                   version = version + 1,
+                   updated_at = excluded.updated_at""",
+            (channel, uid, top, now),
+        )
+        self.conn.executemany(
+            "DELETE FROM delivery_exceptions WHERE channel = ? AND user_id = ? AND article_id = ?",
+            [(channel, uid, a["id"]) for a in articles if a["id"] not in failed],
+        )
+        self.conn.executemany(
+            """INSERT INTO delivery_exceptions
+                   (channel, user_id, article_id, attempts, last_error, updated_at)
+               VALUES (?, ?, ?, 1, ?, ?)
+               ON CONFLICT(channel, user_id, article_id) DO UPDATE SET
+                   attempts = attempts + 1,
+                   last_error = excluded.last_error,
+                   updated_at = excluded.updated_at""",
+            [(channel, uid, article_id, error, now) for article_id in failed],
+        )
+
+    # --- Outbox ---
+
+    def enqueue_deliveries(self, items: list[dict]) -> int:
+        """Queue rendered messages and advance their recipients' watermarks,
+        all in one transaction.
+
+        Each item has channel, user_id, target, unsent (the articles the
+        watermark moves past), article_ids (the ones in the message) and
+        body; items with body None only advance the watermark. An optional
+        not_before (ISO UTC) holds the row back until then. An item with a
+        `version` (from `get_delivery_versions`) is skipped if its recipient
+        has advanced since, i.e. a concurrent send pass already queued it;
+        BEGIN IMMEDIATE makes that check and the writes one unit across
+        processes. Returns the number of outbox rows added.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        queued = 0
+        self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for item in items:
+                if item.get("version") is not None:
+                    row = self.conn.execute(
+                        "SELECT version FROM delivery_state WHERE channel = ? AND user_id = ?",
+                        (item["channel"], item["user_id"] or 0),
+                    ).fetchone()
+                    if (row["version"] if row else 0) != item["version"]:
+                        continue
+                if item["body"] is not None:
+                    digest = hashlib.sha256(item["body"].encode("utf-8")).hexdigest()
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO outbox_messages (digest, body) VALUES (?, ?)",
+                        (digest, item["body"]),
+                    )
+                    self.conn.execute(
+                        """INSERT INTO outbox (channel, user_id, target, message_id, article_ids,
+                                               next_attempt_at, created_at)
+                           VALUES (?, ?, ?, (SELECT id FROM outbox_messages WHERE digest = ?), ?, ?, ?)""",
+                        (item["channel"], item["user_id"], item["target"], digest,
+                         json.dumps(item["article_ids"]), item.get("not_before") or now, now),
+                    )
+                    queued += 1
+                self._advance_delivery(item["channel"], item["user_id"], item["unsent"])
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return queued
+
+    def claim_outbox(self, limit: int = 500, lease_seconds: float = 600) -> list[dict]:
+        """Claim due outbox rows for sending.
+
+        Rows whose previous claim lease ran out (a worker died mid-send)
+        are claimed again; the lease must exceed the time a worker needs
+        to send one claimed batch.
+        """
+        now = datetime.now(timezone.utc)
+        lease = (now + timedelta(seconds=lease_seconds)).isoformat()
+        with self.conn:
+            rows = self.conn.execute(
+                """SELECT o.*, m.body FROM outbox o
+                   JOIN outbox_messages m ON m.id = o.message_id
+                   WHERE o.status IN ('pending', 'sending') AND o.next_attempt_at <= ?
+                   ORDER BY o.next_attempt_at, o.id
+                   LIMIT ?""",
+                (now.isoformat(), limit),
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE outbox SET status = 'sending', next_attempt_at = ? WHERE id = ?",
+                [(lease, r["id"]) for r in rows],
+            )
+        return [dict(r) for r in rows]
+
+    def complete_outbox(self, outbox_id: int, success: bool, error: str | None = None,
+                        max_attempts: int = 6, base_delay_seconds: float = 60) -> str:
+        """Record a send attempt; returns the row's new status.
+
+        Success logs a 'success' dispatch per article. A failure is retried
+        with exponential backoff (capped at an hour) until `max_attempts`,
+        then the row is 'dead': its articles are logged as 'failed' and,
+        since the watermark already moved past them at enqueue time, become
+        delivery exceptions so a later send pass queues them again. The
+        exception's attempts count the recipient's dead rows for that
+        article, which `get_unsent*`'s `max_attempts` caps.
+        """
+        row = self.conn.execute("SELECT * FROM outbox WHERE id = ?", (outbox_id,)).fetchone()
+        now = datetime.now(timezone.utc)
+        attempts = row["attempts"] + 1
+        if success:
+            status, next_at = "sent", row["next_attempt_at"]
+        elif attempts >= max_attempts:
+            status, next_at = "dead", row["next_attempt_at"]
+        else:
+            delay = min(base_delay_seconds * 2 ** (attempts - 1), 3600)
+            status, next_at = "pending", (now + timedelta(seconds=delay)).isoformat()
+        with self.conn:
+            self.conn.execute(
+                """UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?,
+                                     last_error = ?, sent_at = ?
+                   WHERE id = ?""",
+                (status, attempts, next_at, None if success else error,
+                 now.isoformat() if success else None, outbox_id),
+            )
+            if status in ("sent", "dead"):
+                self.conn.executemany(
+                    """INSERT INTO dispatches (article_id, channel, sent_at, status, user_id)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    [(article_id, row["channel"], now.isoformat(),
+                      "success" if success else "failed", row["user_id"])
+                     for article_id in json.loads(row["article_ids"])],
+                )
+            if status == "dead":
+                uid = row["user_id"] or 0
+                self.conn.executemany(
+                    """INSERT INTO delivery_exceptions
+                           (channel, user_id, article_id, attempts, last_error, updated_at)
+                       VALUES (?1, ?2, ?3,
+                               (SELECT COUNT(*) FROM dispatches
+                                WHERE article_id = ?3 AND channel = ?1
+                                  AND COALESCE(user_id, 0) = ?2 AND status = 'failed'),
+                               ?4, ?5)
+                       ON CONFLICT(channel, user_id, article_id) DO UPDATE SET
+                           attempts = excluded.attempts,
+                           last_error = excluded.last_error,
+                           updated_at = excluded.updated_at""",
+                    [(row["channel"], uid, article_id, error, now.isoformat())
+                     for article_id in json.loads(row["article_ids"])],
+                )
+        return status
+
+    def get_outbox_stats(self) -> dict[str, int]:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status")
+        return {r[0]: r[1] for r in rows}
+
+    def get_delivery_latency(self, since_hours: float = 24 * 7) -> dict:
+        """Minutes from publication (or fetch, if undated) and from fetch to
+        each successful delivery sent in the last `since_hours`.
+
+        Returns {"count", "published": {p50, p90, max}, "fetched": {...}}.
+        """
+        since = (datetime.now(timezone.utc) - timedelta(hours=since_hours)).isoformat()
+        rows = self.conn.execute(
+            """SELECT (julianday(d.sent_at) - julianday(COALESCE(a.published, a.fetched_at))) * 1440,
+                      (julianday(d.sent_at) - julianday(a.fetched_at)) * 1440
+               FROM dispatches d JOIN articles a ON a.id = d.article_id
+               WHERE d.status = 'success' AND d.sent_at >= ?""",
+            (since,),
+        ).fetchall()
+
+        def spread(values: list[float]) -> dict[str, float]:
+            values = sorted(v for v in values if v is not None)
+            if not values:
+                return {"p50": 0.0, "p90": 0.0, "max": 0.0}
+            return {"p50": values[len(values) // 2],
+                    "p90": values[min(len(values) - 1, int(len(values) * 0.9))],
+                    "max": values[-1]}
+
+        return {
+            "count": len(rows),
+            "published": spread([r[0] for r in rows]),
+            "fetched": spread([r[1] for r in rows]),
+        }
+
     def record_dispatch(self, article_id: int, channel: str, status: str,
                         user_id: int | None = None):
         now = datetime.now(timezone.utc).isoformat()
@@ -461,7 +1103,7 @@ class Database:
 
     def get_uncrawled(self) -> list[dict]:
         rows = self.conn.execute(
-            "SELECT * FROM articles WHERE is_relevant = 1 AND body IS NULL"
+            "SELECT * FROM articles WHERE stage = 'relevant' AND body IS NULL ORDER BY id"
         ).fetchall()
         return [dict(r) for r in rows]
 
@@ -472,6 +1114,53 @@ class Database:
         )
         self.conn.commit()
 
+    def batch(self, max_rows: int = 100, max_interval: float = 2.0,
+              on_commit=None) -> "BatchWriter":
+        """Return a BatchWriter that groups stage writes into few transactions."""
+        return BatchWriter(self, max_rows=max_rows, max_interval=max_interval,
+                           on_commit=on_commit)
+
+    # --- Provider batch jobs ---
+
+    def create_llm_batch(self, provider: str, job_id: str, purpose: str,
+                         model: str, article_ids: list[int]) -> int:
+        """Record a submitted provider batch job and the articles it covers."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            cursor = self.conn.execute(
+                """INSERT INTO llm_batches (provider, job_id, purpose, model, status, submitted_at)
+                   VALUES (?, ?, ?, ?, 'submitted', ?)""",
+                (provider, job_id, purpose, model, now),
+            )
+            batch_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO llm_batch_items (batch_id, article_id) VALUES (?, ?)",
+                [(batch_id, a) for a in article_ids],
+            )
+        return batch_id
+
+    def get_open_llm_batches(self, purpose: str) -> list[dict]:
+        rows = self.conn.execute(
+            "SELECT * FROM llm_batches WHERE purpose = ? AND status = 'submitted' ORDER BY id",
+            (purpose,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_llm_batch_article_ids(self, batch_id: int) -> list[int]:
+        rows = self.conn.execute(
+            "SELECT article_id FROM llm_batch_items WHERE batch_id = ? ORDER BY article_id",
+            (batch_id,),
+        ).fetchall()
+        return [r["article_id"] for r in rows]
+
+    def finish_llm_batch(self, batch_id: int, status: str = "collected"):
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.execute(
+            "UPDATE llm_batches SET status = ?, collected_at = ? WHERE id = ?",
+            (status, now, batch_id),
+        )
+        self.conn.commit()
+
     # --- Pipeline run methods ---
 
     def start_run(self) -> int:
@@ -519,6 +1208,28 @@ class Database:
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def get_llm_usage(self, since_hours: float = 24 * 7) -> list[dict]:
+        """Per purpose/model aggregates of the llm_calls ledger."""
+        since = datetime.fromtimestamp(time.time() - since_hours * 3600, timezone.utc).isoformat()
+        rows = self.conn.execute(
+            """SELECT purpose, model,
+                      COUNT(*) AS calls,
+                      SUM(CASE WHEN outcome != 'ok' THEN 1 ELSE 0 END) AS errors,
+                      SUM(input_tokens) AS input_tokens,
+                      SUM(output_tokens) AS output_tokens,
+                      SUM(cache_read_tokens) AS cache_read_tokens,
+                      COALESCE(SUM(cost_usd), 0) AS cost_usd,
+                      AVG(latency_ms) AS avg_ms,
+                      MAX(latency_ms) AS max_ms,
+                      AVG(prompt_chars) AS avg_prompt_chars
+               FROM llm_calls
+               WHERE created_at >= ?
+               GROUP BY purpose, model
+               ORDER BY cost_usd DESC, calls DESC""",
+            (since,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
     def get_stats(self) -> dict:
         total = self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
         relevant = self.conn.execute(
@@ -530,23 +1241,47 @@ class Database:
         sent = self.conn.execute(
             "SELECT COUNT(DISTINCT article_id) FROM dispatches WHERE status = 'success'"
         ).fetchone()[0]
+        dead_letter = self.conn.execute(
+            "SELECT COUNT(*) FROM articles WHERE summary_dead = 1 AND summary_ko IS NULL"
+        ).fetchone()[0]
         return {
             "total": total,
             "relevant": relevant,
             "summarized": summarized,
             "sent": sent,
+            "dead_letter": dead_letter,
         }
 
     def search_articles(self, query: str = "", status: str = "all",
                         page: int = 1, per_page: int = 30) -> tuple[list[dict], int]:
-        """Search articles with pagination. Returns (articles, total_count)."""
+        """Search articles with pagination. Returns (articles, total_count).
+
+        Query terms of 3+ characters go through the trigram FTS index (any
+        substring of title, summary, Korean title/summary, body or source)
+        and results are ranked by bm25; shorter terms, which trigrams can't
+        match, are LIKE-filtered on the titles, Korean summary and source.
+        Without a query, or without FTS5, results are newest first.
+        """
         conditions = []
         params: list = []
-
-        if query:
-            conditions.append("(a.title LIKE ? OR a.title_ko LIKE ? OR a.source LIKE ?)")
-            q = f"%{query}%"
-            params.extend([q, q, q])
+        join = ""
+        order = "a.id DESC"
+
+        terms = query.split()
+        long_terms = [t for t in terms if len(t) >= 3] if self.fts else []
+        if long_terms:
+            join = "JOIN articles_fts ON articles_fts.rowid = a.id"
+            conditions.append("articles_fts MATCH ?")
+            params.append(" ".join('"' + t.replace('"', '""') + '"' for t in long_terms))
+            weights = ", ".join(str(w) for w in self._FTS_WEIGHTS)
+            order = f"bm25(articles_fts, {weights}), a.id DESC"
+        for term in terms:
+            if term in long_terms:
+                continue
+            conditions.append(
+                "(a.title LIKE ? OR a.title_ko LIKE ? OR a.summary_ko LIKE ? OR a.source LIKE ?)"
+            )
+            params.extend([f"%{term}%"] * 4)
 
         if status == "relevant":
             conditions.append("a.is_relevant = 1")
@@ -556,19 +1291,21 @@ class Database:
             conditions.append(
                 "a.id IN (SELECT article_id FROM dispatches WHERE status = 'success')"
             )
+        elif status == "failed":
+            conditions.append("a.summary_ko IS NULL AND a.summary_attempts > 0")
 
         where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         count = self.conn.execute(
-            f"SELECT COUNT(*) FROM articles a {where}", params,
+            f"SELECT COUNT(*) FROM articles a {join} {where}", params,
         ).fetchone()[0]
 
         offset = (page - 1) * per_page
         rows = self.conn.execute(
             f"""SELECT a.*,
                        EXISTS(SELECT 1 FROM dispatches d WHERE d.article_id = a.id AND d.status = 'success') as is_sent
-                FROM articles a {where}
-                ORDER BY a.id DESC
+                FROM articles a {join} {where}
+                ORDER BY {order}
                 LIMIT ? OFFSET ?""",
             params + [per_page, offset],
         ).fetchall()
@@ -577,3 +1314,82 @@ class Database:
 
     def close(self):
         self.conn.close()
+
+
+class BatchWriter:
+    """Buffer per-article stage writes and flush them with executemany.
+
+    Each flush is a single transaction, so a filter pass over 2,000 articles
+    costs a handful of commits instead of 2,000. A flush happens when
+    `max_rows` writes are buffered or `max_interval` seconds have passed since
+    the last one (checked on each write — no background thread, so the
+    connection stays on the caller's thread), and on leaving the `with` block,
+    including when the block raises. A crash between flushes loses only the
+    unflushed tail; those articles are still NULL in the DB and the next run
+    redoes them.
+
+    `on_commit`, if given, is called after each flush's transaction commits
+    with the number of rows written per kind (e.g. {"summary": 3}), so a
+    caller can react to articles as soon as they are durably ready.
+    """
+
+    # Flush order follows the pipeline: relevance → body → summary.
+    _SQL = {
+        "relevant": Database._MARK_RELEVANT_SQL,
+        "body": "UPDATE articles SET body = ? WHERE id = ?",
+        "summary": Database._SAVE_SUMMARY_SQL,
+    }
+
+    def __init__(self, db: Database, max_rows: int = 100, max_interval: float = 2.0,
+                 on_commit=None):
+        self.db = db
+        self.max_rows = max_rows
+        self.max_interval = max_interval
+        self.on_commit = on_commit
+        self._pending: dict[str, list[tuple]] = {kind: [] for kind in self._SQL}
+        self._count = 0
+        self._last_flush = time.monotonic()
+        self.flushes = 0
+        self.rows_written = 0
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    def mark_relevant(self, article_id: int, is_relevant: bool):
+        self._add("relevant", (is_relevant, article_id))
+
+    def save_body(self, article_id: int, body: str):
+        self._add("body", (body, article_id))
+
+    def save_summary(self, article_id: int, title_ko: str, summary_ko: str):
+        self._add("summary", (title_ko, summary_ko, article_id))
+
+    def _add(self, kind: str, params: tuple):
+        self._pending[kind].append(params)
+        self._count += 1
+        if (self._count >= self.max_rows
+                or time.monotonic() - self._last_flush >= self.max_interval):
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows in one transaction."""
+        self._last_flush = time.monotonic()
+        if not self._count:
+            return
+        with self.db.conn:
+            for kind, sql in self._SQL.items():
+                rows = self._pending[kind]
+                if rows:
+                    self.db.conn.executemany(sql, rows)
+        committed = {kind: len(rows) for kind, rows in self._pending.items() if rows}
+        self.rows_written += self._count
+        self.flushes += 1
+        self._pending = {kind: [] for kind in self._SQL}
+        self._count = 0
+        if self.on_commit:
+            self.on_commit(committed)
+
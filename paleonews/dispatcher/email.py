@@ -1,5 +1,10 @@
+import asyncio
 import logging
+import queue
 import smtplib
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
@@ -47,6 +52,169 @@ ARTICLE_HTML = """\
 </div>"""
 
 
+def article_html(article: dict) -> str:
+    """One article's section of the HTML email."""
+    return ARTICLE_HTML.format(
+        title_ko=_escape(article.get("title_ko", article.get("title", ""))),
+        summary_ko=_escape(article.get("summary_ko", "")),
+        source=_escape(article.get("source", "")),
+        url=article.get("url", ""),
+    )
+
+
+def article_text(article: dict) -> str:
+    """One article's section of the plain-text email."""
+    return "\n".join([
+        f"■ {article.get('title_ko', article.get('title', ''))}",
+        article.get("summary_ko", ""),
+        f"  원문: {article.get('url', '')}",
+        "",
+    ])
+
+
+def compose_email(html_blocks: list[str], text_blocks: list[str], date_str: str) -> tuple[str, str, str]:
+    """Wrap pre-rendered article sections into (subject, plain text, HTML)."""
+    count = len(html_blocks)
+    html = HTML_TEMPLATE.format(
+        date=date_str,
+        articles_html="\n".join(html_blocks),
+        count=count,
+    )
+    subject = f"🦴 고생물학 뉴스 브리핑 ({date_str}) - {count}건"
+    # Plain text fallback
+    text = "\n".join([f"고생물학 뉴스 브리핑 ({date_str})", "", *text_blocks, f"총 {count}건"])
+    return subject, text, html
+
+
+def render_articles(articles: list[dict], date_str: str) -> tuple[str, str, str]:
+    """Render a briefing as (subject, plain text, HTML)."""
+    return compose_email([article_html(a) for a in articles],
+                         [article_text(a) for a in articles], date_str)
+
+
+def build_message(sender: str, recipients: list[str], subject: str,
+                  text_body: str, html_body: str | None) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = ", ".join(recipients)
+
+    msg.attach(MIMEText(text_body, "plain", "utf-8"))
+    if html_body:
+        msg.attach(MIMEText(html_body, "html", "utf-8"))
+    return msg
+
+
+class _Session:
+    __slots__ = ("server", "sent")
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0  # messages sent on this connection
+
+
+# Replies about the message or mailbox, after which the session can be reused
+MESSAGE_REJECT_CODES = range(550, 560)
+
+
+class SMTPPool:
+    """Reusable authenticated SMTP sessions, shared by sending threads.
+
+    Up to `size` sessions are open at once; each is connected (STARTTLS,
+    login) on first use and then reused for `max_messages` messages before
+    being replaced, since many servers cap messages per connection. A
+    session the server dropped is reconnected and the message resent once.
+    """
+
+    def __init__(self, host: str, port: int, username: str = "", password: str = "",
+                 size: int = 4, starttls: bool = True, max_messages: int = 100,
+                 timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = max(1, size)
+        self.starttls = starttls
+        self.max_messages = max(1, max_messages)
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[_Session] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reconnects = 0
+        self.sent = 0
+
+    def _connect(self) -> _Session:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.password:
+                server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        with self._lock:
+            self.connects += 1
+        return _Session(server)
+
+    @staticmethod
+    def _discard(session: _Session):
+        try:
+            session.server.quit()
+        except Exception:
+            session.server.close()
+
+    def send(self, msg, from_addr: str, to_addrs: list[str]):
+        """Send one message, blocking. Raises on failure."""
+        with self._slots:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = self._connect()
+            for attempt in range(2):
+                try:
+                    session.server.sendmail(from_addr, to_addrs, msg.as_string())
+                    break
+                except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                    # Stale or dropped session: reconnect and resend once
+                    session.server.close()
+                    if attempt:
+                        raise
+                    with self._lock:
+                        self.reconnects += 1
+                    session = self._connect()
+                except smtplib.SMTPRecipientsRefused:
+                    # The server refused these recipients; the session is still good
+                    self._idle.put(session)
+                    raise
+                except smtplib.SMTPResponseException as e:
+                    # 55x rejects this message only; anything else (421 closing,
+                    # 530 auth, ...) leaves the session unusable
+                    if e.smtp_code in MESSAGE_REJECT_CODES:
+                        self._idle.put(session)
+                    else:
+                        self._discard(session)
+                    raise
+                except BaseException:
+                    session.server.close()
+                    raise
+            session.sent += 1
+            with self._lock:
+                self.sent += 1
+            if session.sent >= self.max_messages:
+                self._discard(session)
+            else:
+                self._idle.put(session)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
 class EmailDispatcher(BaseDispatcher):
     def __init__(
         self,
@@ -55,19 +223,21 @@ class EmailDispatcher(BaseDispatcher):
         sender: str,
         password: str,
         recipients: list[str],
+        starttls: bool = True,
+        pool: SMTPPool | None = None,
     ):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.sender = sender
         self.password = password
         self.recipients = recipients
+        self.starttls = starttls
+        self.pool = pool
 
     async def send_briefing(self, briefing: str) -> bool:
         """Send briefing as plain text email (legacy)."""
-        return self._send(
-            subject=briefing.split("\n")[0],
-            text_body=briefing,
-            html_body=None,
+        return await asyncio.to_thread(
+            self._send, briefing.split("\n")[0], briefing, None,
         )
 
     async def send_articles(self, articles: list[dict], date_str: str) -> bool:
@@ -75,60 +245,68 @@ class EmailDispatcher(BaseDispatcher):
         if not self.recipients:
             logger.warning("No email recipients configured")
             return False
-
-        articles_html = "\n".join(
-            ARTICLE_HTML.format(
-                title_ko=_escape(a.get("title_ko", a.get("title", ""))),
-                summary_ko=_escape(a.get("summary_ko", "")),
-                source=_escape(a.get("source", "")),
-                url=a.get("url", ""),
-            )
-            for a in articles
-        )
-
-        html = HTML_TEMPLATE.format(
-            date=date_str,
-            articles_html=articles_html,
-            count=len(articles),
-        )
-
-        subject = f"🦴 고생물학 뉴스 브리핑 ({date_str}) - {len(articles)}건"
-
-        # Plain text fallback
-        text_lines = [f"고생물학 뉴스 브리핑 ({date_str})", ""]
-        for a in articles:
-            text_lines.append(f"■ {a.get('title_ko', a.get('title', ''))}")
-            text_lines.append(a.get("summary_ko", ""))
-            text_lines.append(f"  원문: {a.get('url', '')}")
-            text_lines.append("")
-        text_lines.append(f"총 {len(articles)}건")
-
-        return self._send(subject, "\n".join(text_lines), html)
+        # smtplib blocks; keep it off the event loop
+        return await asyncio.to_thread(self._send, *render_articles(articles, date_str))
 
     def _send(self, subject: str, text_body: str, html_body: str | None) -> bool:
         if not self.recipients:
             logger.warning("No email recipients configured")
             return False
 
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = self.sender
-        msg["To"] = ", ".join(self.recipients)
-
-        msg.attach(MIMEText(text_body, "plain", "utf-8"))
-        if html_body:
-            msg.attach(MIMEText(html_body, "html", "utf-8"))
-
+        msg = build_message(self.sender, self.recipients, subject, text_body, html_body)
+        pool = self.pool or SMTPPool(self.smtp_host, self.smtp_port, self.sender, self.password,
+                                     size=1, starttls=self.starttls)
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender, self.password)
-                server.sendmail(self.sender, self.recipients, msg.as_string())
+            pool.send(msg, self.sender, self.recipients)
             logger.info("Email sent to %s", ", ".join(self.recipients))
             return True
         except Exception:
             logger.exception("Failed to send email")
             return False
+        finally:
+            if pool is not self.pool:
+                pool.close()
+
+
+class EmailFanout:
+    """Sends many emails from a small thread pool over pooled SMTP sessions.
+
+    The blocking smtplib calls run in `pool.size` worker threads, so the
+    event loop stays free (Telegram can fan out alongside), and `on_done`
+    runs in the loop as each message finishes.
+    """
+
+    def __init__(self, pool: SMTPPool, sender: str):
+        self.pool = pool
+        self.sender = sender
+        self.failed = 0
+
+    def _send_one(self, recipients: list[str], content: tuple[str, str, str | None]) -> bool:
+        msg = build_message(self.sender, recipients, *content)
+        try:
+            self.pool.send(msg, self.sender, recipients)
+        except Exception:
+            logger.exception("Failed to send email to %s", ", ".join(recipients))
+            return False
+        return True
+
+    async def send_all(self, jobs: list[tuple[object, list[str], tuple[str, str, str | None]]],
+                       on_done: Callable[[object, bool], None]):
+        """Send every (key, recipients, (subject, text, html)) job."""
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="smtp")
+
+        async def run(key, recipients, content):
+            return key, await loop.run_in_executor(executor, self._send_one, recipients, content)
+
+        try:
+            for finished in asyncio.as_completed([run(*job) for job in jobs]):
+                key, success = await finished
+                if not success:
+                    self.failed += 1
+                on_done(key, success)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 def _escape(text: str) -> str:
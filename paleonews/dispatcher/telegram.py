@@ -1,11 +1,42 @@
+import asyncio
 import logging
+import warnings
+from collections.abc import Callable
 
 from telegram import Bot
+from telegram.error import RetryAfter
 
+from ..ratelimit import TokenBucket
 from .base import BaseDispatcher
 
 logger = logging.getLogger(__name__)
 
+SEPARATOR = "\n" + "─" * 22 + "\n"
+
+
+def split_message(text: str, max_length: int = 4096) -> list[str]:
+    """Split long message into chunks at article boundaries."""
+    if len(text) <= max_length:
+        return [text]
+
+    chunks = []
+    # Split on article separator
+    sections = text.split(SEPARATOR)
+
+    current = ""
+    for section in sections:
+        candidate = current + SEPARATOR + section if current else section
+        if len(candidate) > max_length and current:
+            chunks.append(current.strip())
+            current = section
+        else:
+            current = candidate
+
+    if current.strip():
+        chunks.append(current.strip())
+
+    return chunks if chunks else [text[:max_length]]
+
 
 class TelegramDispatcher(BaseDispatcher):
     def __init__(self, bot_token: str, telegram_chat_id: str, max_length: int = 4096):
@@ -15,27 +46,7 @@ class TelegramDispatcher(BaseDispatcher):
 
     def split_message(self, text: str) -> list[str]:
         """Split long message into chunks at article boundaries."""
-        if len(text) <= self.max_length:
-            return [text]
-
-        chunks = []
-        # Split on article separator
-        separator = "\n" + "─" * 22 + "\n"
-        sections = text.split(separator)
-
-        current = ""
-        for section in sections:
-            candidate = current + separator + section if current else section
-            if len(candidate) > self.max_length and current:
-                chunks.append(current.strip())
-                current = section
-            else:
-                current = candidate
-
-        if current.strip():
-            chunks.append(current.strip())
-
-        return chunks if chunks else [text[:self.max_length]]
+        return split_message(text, self.max_length)
 
     async def send_briefing(self, briefing: str) -> bool:
         """Send briefing to Telegram chat. Returns True on success."""
@@ -51,3 +62,95 @@ class TelegramDispatcher(BaseDispatcher):
         except Exception:
             logger.exception("Failed to send Telegram message")
             return False
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    # PTB reports retry_after as int seconds or a timedelta, depending on
+    # version, and warns about the switch on every access of the int form
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        delay = error.retry_after
+    return delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
+
+
+class TelegramFanout:
+    """Sends many briefings concurrently through one shared Bot.
+
+    Everything runs in one event loop with one HTTP session. At most
+    `concurrency` deliveries are in flight, a global token bucket keeps the
+    bot under `rate_per_second` messages overall, and a bucket per chat
+    spaces the chunks of one briefing `1 / per_chat_rate` seconds apart
+    (Telegram allows ~30 msg/s per bot and ~1 msg/s per chat). A 429 is
+    retried after the server's retry_after, up to `max_retries` times.
+    """
+
+    def __init__(self, bot_token: str | None = None, *, bot=None, concurrency: int = 16,
+                 rate_per_second: float = 30, per_chat_rate: float = 1,
+                 max_retries: int = 3, max_length: int = 4096):
+        self.bot = bot if bot is not None else Bot(token=bot_token)
+        self.concurrency = max(1, concurrency)
+        self.global_bucket = TokenBucket(rate_per_second * 60, capacity=max(1.0, rate_per_second))
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self.max_length = max_length
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        self.retries = 0
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        if chat_id not in self._chat_buckets:
+            self._chat_buckets[chat_id] = TokenBucket(self.per_chat_rate * 60, capacity=1)
+        return self._chat_buckets[chat_id]
+
+    async def _send_chunk(self, chat_id: str, text: str):
+        for attempt in range(self.max_retries + 1):
+            await self._chat_bucket(chat_id).wait()
+            await self.global_bucket.wait()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                return
+            except RetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                delay = _retry_after_seconds(e)
+                logger.warning("Telegram 429 for chat %s, retrying in %.1fs", chat_id, delay)
+                await asyncio.sleep(delay)
+
+    async def send(self, chat_id: str, briefing: str) -> bool:
+        """Send one briefing to one chat. Returns True on success.
+
+        Once the first chunk is delivered the briefing counts as sent even if
+        a later chunk fails (the failure is logged): retrying would repeat the
+        chunks the chat already has.
+        """
+        chunks = split_message(briefing, self.max_length)
+        sent = 0
+        try:
+            for chunk in chunks:
+                await self._send_chunk(chat_id, chunk)
+                sent += 1
+        except Exception:
+            if not sent:
+                logger.exception("Failed to send Telegram message to chat %s", chat_id)
+                return False
+            logger.exception("Telegram chat %s got %d of %d message(s); not resending",
+                             chat_id, sent, len(chunks))
+            return True
+        logger.info("Sent %d message(s) to Telegram chat %s", len(chunks), chat_id)
+        return True
+
+    async def send_all(self, jobs: list[tuple[object, str, str]],
+                       on_done: Callable[[object, bool], None]):
+        """Send every (key, chat_id, briefing) job; `on_done(key, success)`
+        runs in the loop as each one finishes, so progress is recorded
+        incrementally rather than after the whole fan-out."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(key, chat_id, briefing):
+            async with semaphore:
+                return key, await self.send(chat_id, briefing)
+
+        async with self.bot:
+            for finished in asyncio.as_completed([run(*job) for job in jobs]):
+                key, success = await finished
+                on_done(key, success)
@@ -1,7 +1,10 @@
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from .config import as_bool
 from .llm import LLMClient
+from .summarizer import classify_and_summarize
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +30,9 @@ def keyword_match(title: str, summary: str, keywords: list[str]) -> bool:
     return any(re.search(rf"\b{re.escape(kw.lower())}", text) for kw in keywords)
 
 
-def llm_filter(client: LLMClient, article: dict, model: str) -> bool:
-    """Use LLM to judge paleontology relevance. Returns True if relevant."""
+def llm_filter(client: LLMClient, article: dict, model: str) -> bool | None:
+    """Use LLM to judge paleontology relevance. Returns True if relevant,
+    or None if the call failed (after the client's own retries)."""
     prompt = LLM_FILTER_PROMPT.format(
         title=article.get("title", ""),
         summary=article.get("summary", ""),
@@ -38,45 +42,96 @@ def llm_filter(client: LLMClient, article: dict, model: str) -> bool:
         return answer.lower().startswith("yes")
     except Exception:
         logger.exception("LLM filter failed for article %s", article.get("id"))
-        # On failure, keep the article (conservative approach)
-        return True
+        # Leave it undecided so the next run retries, rather than guessing
+        # "relevant" and paying for a summary of a possibly off-topic article.
+        return None
 
 
 def filter_articles(db, config: dict, llm_client: LLMClient | None = None) -> int:
-    """Filter unfiltered articles and update DB. Returns count of relevant articles."""
+    """Filter unfiltered articles and update DB. Returns count of relevant articles.
+
+    Keyword-only decisions are written immediately; LLM checks run on a
+    bounded thread pool (`filter.llm_filter.concurrency`) and each verdict is
+    written as soon as its call completes. The DB is only touched from the
+    calling thread.
+
+    With `filter.llm_filter.single_pass`, the LLM check also produces the
+    Korean title/summary in the same call, so relevant articles from mixed
+    feeds skip the summarize stage.
+    """
     dedicated = config.get("dedicated_feeds", [])
     keywords = config.get("filter", {}).get("keywords", [])
     llm_config = config.get("filter", {}).get("llm_filter", {})
-    llm_enabled = llm_config.get("enabled", False) and llm_client is not None
+    llm_enabled = as_bool(llm_config.get("enabled", False)) and llm_client is not None
     llm_model = llm_config.get("model", "claude-haiku-4-5-20251001")
+    concurrency = max(1, int(llm_config.get("concurrency", 4)))
+    single_pass = as_bool(llm_config.get("single_pass", False))
+    if single_pass:
+        llm_model = llm_config.get("single_pass_model") or config.get(
+            "summarizer", {}).get("model", "claude-sonnet-4-20250514")
 
     unfiltered = db.get_unfiltered()
     relevant_count = 0
-    llm_checked = 0
-
-    for article in unfiltered:
-        feed_url = article.get("feed_url", "") or ""
-
-        if is_dedicated_feed(feed_url, dedicated):
-            is_relevant = True
-        else:
-            title = article.get("title", "") or ""
-            summary = article.get("summary", "") or ""
-            is_relevant = keyword_match(title, summary, keywords)
-
-            # LLM 2차 필터: 키워드 매칭된 비전용 피드 기사만 검증
-            if is_relevant and llm_enabled:
-                is_relevant = llm_filter(llm_client, article, llm_model)
-                llm_checked += 1
-
-        db.mark_relevant(article["id"], is_relevant)
-        if is_relevant:
-            relevant_count += 1
+    summarized = 0
+    undecided = 0
+    llm_candidates = []
+
+    with db.batch() as writer:
+        for article in unfiltered:
+            feed_url = article.get("feed_url", "") or ""
+
+            if is_dedicated_feed(feed_url, dedicated):
+                is_relevant = True
+            else:
+                title = article.get("title", "") or ""
+                summary = article.get("summary", "") or ""
+                is_relevant = keyword_match(title, summary, keywords)
+
+                # LLM 2차 필터: 키워드 매칭된 비전용 피드 기사만 검증
+                if is_relevant and llm_enabled:
+                    llm_candidates.append(article)
+                    continue
+
+            writer.mark_relevant(article["id"], is_relevant)
+            if is_relevant:
+                relevant_count += 1
+
+        if llm_candidates:
+            writer.flush()
+            check = classify_and_summarize if single_pass else llm_filter
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                futures = {
+                    pool.submit(check, llm_client, article, llm_model): article
+                    for article in llm_candidates
+                }
+                for future in as_completed(futures):
+                    article_id = futures[future]["id"]
+                    title_ko = summary_ko = None
+                    if single_pass:
+                        is_relevant, title_ko, summary_ko = future.result()
+                    else:
+                        is_relevant = future.result()
+                    if is_relevant is None:
+                        undecided += 1
+                        continue
+                    # Verdict first: a flush between the two writes must not
+                    # leave a summarized row without its ready_seq
+                    writer.mark_relevant(article_id, is_relevant)
+                    if is_relevant:
+                        relevant_count += 1
+                        if summary_ko:
+                            writer.save_summary(article_id, title_ko, summary_ko)
+                            summarized += 1
 
     logger.info(
-        "Filtered %d articles: %d relevant, %d irrelevant (LLM checked: %d)",
-        len(unfiltered), relevant_count, len(unfiltered) - relevant_count, llm_checked,
+        "Filtered %d articles: %d relevant, %d irrelevant, %d undecided (LLM checked: %d, concurrency %d)",
+        len(unfiltered), relevant_count, len(unfiltered) - relevant_count - undecided, undecided,
+        len(llm_candidates), concurrency,
     )
+    if undecided:
+        logger.warning("%d articles left unfiltered after LLM failures; retried next run", undecided)
+    if single_pass:
+        logger.info("Single-pass mode summarized %d articles during filtering", summarized)
     return relevant_count
 
 
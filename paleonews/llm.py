@@ -1,53 +1,359 @@
-"""LLM provider abstraction — supports Anthropic SDK, OpenAI SDK, and Claude Code CLI."""
+"""LLM provider abstraction — supports Anthropic SDK, OpenAI SDK, Claude Code CLI,
+and an offline fake provider for load tests."""
 
+import io
+import json
 import logging
 import os
+import re
 import shutil
 import subprocess
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Generator
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from .ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
 
+class RetryableError(RuntimeError):
+    """Transient provider failure (overload, rate limit, timeout) worth retrying.
+
+    `retry_after` carries the provider's requested wait in seconds, if any.
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class BatchRequest:
+    """One prompt inside an asynchronous provider batch job."""
+    custom_id: str
+    prompt: str
+    system: str = ""
+    max_tokens: int = 512
+    cache_prefix: str = ""
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+# Yields text deltas as they arrive; the generator's return value is the
+# complete LLMResponse (collect it with `response = yield from ...`).
+TextStream = Generator[str, None, LLMResponse]
+
+
+# Monotonic time by which the current call, retries included, must finish.
+# Set by RetryingLLMClient; providers cap each attempt's timeout with it.
+call_deadline: ContextVar[float | None] = ContextVar("llm_call_deadline", default=None)
+
+
+def attempt_timeout(timeout: float | None) -> float | None:
+    """`timeout` capped by what is left of the enclosing call's deadline."""
+    deadline = call_deadline.get()
+    if deadline is None:
+        return timeout
+    remaining = max(0.1, deadline - time.monotonic())
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def join_system(cache_prefix: str, system: str) -> str:
+    """Flatten a cacheable prefix and the per-call system text into one string,
+    for providers without explicit cache markers."""
+    return "\n\n".join(part for part in (cache_prefix, system) if part)
+
+
 class LLMClient(ABC):
+    """Provider interface.
+
+    `cache_prefix` is stable system text that goes before `system`. Providers
+    with prompt caching mark it cacheable; others simply prepend it, which
+    still lets automatic prefix caching (OpenAI) hit. Callers should keep
+    everything per-call (article text, user memories) out of it. Prefixes
+    shorter than the provider's minimum (1024 tokens for Sonnet/Opus, 2048
+    for Haiku; 1024 for OpenAI) are not cached at all, and the current
+    system prompts (under 100 tokens each) fall below it: marking them costs
+    nothing and starts paying off if a prompt grows past the minimum.
+    """
+
+    # Providers with an asynchronous batch endpoint override these.
+    supports_batch = False
+
     @abstractmethod
-    def chat(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512) -> str:
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
         ...
 
+    def chat(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+             cache_prefix: str = "") -> str:
+        return self.complete(model, prompt, system=system, max_tokens=max_tokens,
+                             cache_prefix=cache_prefix).text
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        """Stream the reply as text deltas. Providers without a streaming API
+        fall back to one chunk holding the whole reply."""
+        response = self.complete(model, prompt, system=system, max_tokens=max_tokens,
+                                 cache_prefix=cache_prefix)
+        if response.text:
+            yield response.text
+        return response
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        """Submit prompts as one batch job. Returns the provider job id."""
+        raise NotImplementedError(f"{type(self).__name__} has no batch endpoint")
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        """Return {custom_id: text or error} once the job has ended, else None."""
+        raise NotImplementedError(f"{type(self).__name__} has no batch endpoint")
+
+    def close(self):
+        """Release provider resources (pooled CLI workers). Wrapping clients
+        close the client they wrap; callers close the outermost one."""
+        inner = getattr(self, "inner", None)
+        if inner is not None:
+            inner.close()
+
 
 class AnthropicClient(LLMClient):
-    def __init__(self):
+    supports_batch = True
+
+    def __init__(self, max_retries: int | None = None, timeout: float | None = None):
         from anthropic import Anthropic
-        self._client = Anthropic()
+        kwargs = {}
+        if max_retries is not None:
+            kwargs["max_retries"] = max_retries
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        self._client = Anthropic(**kwargs)
+
+    @staticmethod
+    def _system_blocks(system: str, cache_prefix: str) -> str | list[dict]:
+        if not cache_prefix:
+            return system
+        blocks = [{"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}}]
+        if system:
+            blocks.append({"type": "text", "text": system})
+        return blocks
 
-    def chat(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512) -> str:
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
         kwargs = dict(
             model=model,
             max_tokens=max_tokens,
             messages=[{"role": "user", "content": prompt}],
         )
-        if system:
-            kwargs["system"] = system
+        system_param = self._system_blocks(system, cache_prefix)
+        if system_param:
+            kwargs["system"] = system_param
+        if (timeout := attempt_timeout(None)) is not None:
+            kwargs["timeout"] = timeout
         response = self._client.messages.create(**kwargs)
-        return response.content[0].text.strip()
+        usage = response.usage
+        result = LLMResponse(
+            text=response.content[0].text.strip(),
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+        )
+        if cache_prefix:
+            logger.info(
+                "Prompt cache %s: read=%d write=%d uncached_input=%d",
+                model, result.cache_read_tokens, result.cache_write_tokens, result.input_tokens,
+            )
+        return result
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        kwargs = dict(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        system_param = self._system_blocks(system, cache_prefix)
+        if system_param:
+            kwargs["system"] = system_param
+        if (timeout := attempt_timeout(None)) is not None:
+            kwargs["timeout"] = timeout
+        parts = []
+        with self._client.messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                parts.append(text)
+                yield text
+            usage = stream.get_final_message().usage
+        return LLMResponse(
+            text="".join(parts).strip(),
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+        )
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        entries = []
+        for r in requests:
+            params = {
+                "model": model,
+                "max_tokens": r.max_tokens,
+                "messages": [{"role": "user", "content": r.prompt}],
+            }
+            system_param = self._system_blocks(r.system, r.cache_prefix)
+            if system_param:
+                params["system"] = system_param
+            entries.append({"custom_id": r.custom_id, "params": params})
+        batch = self._client.messages.batches.create(requests=entries)
+        return batch.id
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        batch = self._client.messages.batches.retrieve(job_id)
+        if batch.processing_status != "ended":
+            return None
+        results: dict[str, str | Exception] = {}
+        for entry in self._client.messages.batches.results(job_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message.content[0].text.strip()
+            else:
+                results[entry.custom_id] = RuntimeError(f"batch item {entry.result.type}")
+        return results
 
 
 class OpenAIClient(LLMClient):
-    def __init__(self):
+    supports_batch = True
+
+    def __init__(self, max_retries: int | None = None, timeout: float | None = None):
         from openai import OpenAI
-        self._client = OpenAI()
+        kwargs = {}
+        if max_retries is not None:
+            kwargs["max_retries"] = max_retries
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        self._client = OpenAI(**kwargs)
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        response = self._client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=self._messages(prompt, system, cache_prefix),
+            **self._timeout_kwargs(),
+        )
+        usage = response.usage
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        cached = (getattr(details, "cached_tokens", None) or 0) if details else 0
+        result = LLMResponse(
+            text=response.choices[0].message.content.strip(),
+            input_tokens=(usage.prompt_tokens - cached) if usage else 0,
+            output_tokens=usage.completion_tokens if usage else 0,
+            cache_read_tokens=cached,
+        )
+        if cache_prefix:
+            logger.info("Prompt cache %s: read=%d uncached_input=%d",
+                        model, result.cache_read_tokens, result.input_tokens)
+        return result
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        chunks = self._client.chat.completions.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=self._messages(prompt, system, cache_prefix),
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._timeout_kwargs(),
+        )
+        parts = []
+        usage = None
+        for chunk in chunks:
+            if chunk.usage:
+                usage = chunk.usage  # sent on the final, choice-less chunk
+            if chunk.choices and chunk.choices[0].delta.content:
+                text = chunk.choices[0].delta.content
+                parts.append(text)
+                yield text
+        return LLMResponse(
+            text="".join(parts).strip(),
+            input_tokens=usage.prompt_tokens if usage else 0,
+            output_tokens=usage.completion_tokens if usage else 0,
+        )
+
+    @staticmethod
+    def _timeout_kwargs() -> dict:
+        timeout = attempt_timeout(None)
+        return {} if timeout is None else {"timeout": timeout}
 
-    def chat(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512) -> str:
+    @staticmethod
+    def _messages(prompt: str, system: str, cache_prefix: str) -> list[dict]:
+        # OpenAI caches long prompt prefixes automatically; keeping the static
+        # prefix first is all that is needed.
         messages = []
+        system = join_system(cache_prefix, system)
         if system:
             messages.append({"role": "system", "content": system})
         messages.append({"role": "user", "content": prompt})
-        response = self._client.chat.completions.create(
-            model=model,
-            max_tokens=max_tokens,
-            messages=messages,
+        return messages
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        lines = []
+        for r in requests:
+            messages = []
+            system = join_system(r.cache_prefix, r.system)
+            if system:
+                messages.append({"role": "system", "content": system})
+            messages.append({"role": "user", "content": r.prompt})
+            lines.append(json.dumps({
+                "custom_id": r.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": model, "max_tokens": r.max_tokens, "messages": messages},
+            }, ensure_ascii=False))
+        payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+        input_file = self._client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
         )
-        return response.choices[0].message.content.strip()
+        return batch.id
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        batch = self._client.batches.retrieve(job_id)
+        if batch.status not in ("completed", "failed", "expired", "cancelled"):
+            return None
+        results: dict[str, str | Exception] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self._client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") == 200:
+                    body = response["body"]
+                    results[entry["custom_id"]] = body["choices"][0]["message"]["content"].strip()
+                else:
+                    error = entry.get("error") or response.get("body") or batch.status
+                    results[entry["custom_id"]] = RuntimeError(f"batch item failed: {error}")
+        return results
+
+
+# stderr fragments of claude CLI failures that are worth retrying
+_TRANSIENT_CLI_ERROR = re.compile(
+    r"overloaded|rate.?limit|529|503|502|timed? ?out|ECONNRESET|ETIMEDOUT|network", re.IGNORECASE,
+)
 
 
 class ClaudeCodeClient(LLMClient):
@@ -63,6 +369,12 @@ class ClaudeCodeClient(LLMClient):
     Claude subscription instead of falling back to API credit billing
     (which raises "Credit balance is too low" when the key's balance
     is empty).
+
+    With pool_size > 0, calls go to a pool of pre-started stream-json CLI
+    sessions (see claude_pool) instead of spawning a process per call.
+    A session keeps its conversation across turns, so by default each one
+    answers a single prompt (`pool_max_calls=1`) and articles never see
+    each other; the pool boots each successor while the previous call runs.
     """
 
     def __init__(
@@ -71,61 +383,225 @@ class ClaudeCodeClient(LLMClient):
         bare: bool = False,
         timeout: int = 180,
         extra_args: list[str] | None = None,
+        pool_size: int = 0,
+        pool_max_calls: int = 1,
     ):
         self.claude_path = claude_path or shutil.which("claude") or "claude"
         self.bare = bare
         self.timeout = timeout
         self.extra_args = list(extra_args or [])
+        self.pool = None
+        if pool_size > 0:
+            from .claude_pool import WorkerPool
+            self.pool = WorkerPool(pool_size, pool_max_calls, env=self._env())
 
-    def chat(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512) -> str:
+    def _env(self) -> dict:
+        env = os.environ.copy()
+        if not self.bare:
+            # Force OAuth/subscription billing — an ANTHROPIC_API_KEY in the
+            # environment would otherwise make the CLI bill API credits.
+            env.pop("ANTHROPIC_API_KEY", None)
+        return env
+
+    def _base_cmd(self, model: str, system: str) -> list[str]:
         cmd: list[str] = [self.claude_path, "-p", "--model", model]
         if self.bare:
             cmd.append("--bare")
         if system:
             cmd += ["--append-system-prompt", system]
-        cmd += self.extra_args
+        return cmd
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        system = join_system(cache_prefix, system)
+        if self.pool is not None:
+            return self._complete_pooled(model, prompt, system)
+        cmd = self._base_cmd(model, system) + self.extra_args
         cmd.append(prompt)
-        env = os.environ.copy()
-        if not self.bare:
-            # Force OAuth/subscription billing — an ANTHROPIC_API_KEY in the
-            # environment would otherwise make the CLI bill API credits.
-            env.pop("ANTHROPIC_API_KEY", None)
+        env = self._env()
+        timeout = attempt_timeout(self.timeout)
         try:
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=self.timeout,
+                timeout=timeout,
                 check=True,
                 env=env,
             )
         except subprocess.TimeoutExpired as e:
-            raise RuntimeError(
-                f"claude CLI timed out after {self.timeout}s"
+            raise RetryableError(
+                f"claude CLI timed out after {timeout:.0f}s"
             ) from e
         except subprocess.CalledProcessError as e:
             stderr = (e.stderr or "").strip() or "(no stderr)"
-            raise RuntimeError(
-                f"claude CLI failed (exit {e.returncode}): {stderr}"
-            ) from e
-        return result.stdout.strip()
+            message = f"claude CLI failed (exit {e.returncode}): {stderr}"
+            if _TRANSIENT_CLI_ERROR.search(stderr):
+                raise RetryableError(message) from e
+            raise RuntimeError(message) from e
+        return LLMResponse(text=result.stdout.strip())
+
+    def _complete_pooled(self, model: str, prompt: str, system: str) -> LLMResponse:
+        from .claude_pool import WorkerError
+        cmd = self._base_cmd(model, system) + [
+            "--input-format", "stream-json", "--output-format", "stream-json", "--verbose",
+        ] + self.extra_args
+        try:
+            event = self.pool.ask(cmd, prompt, attempt_timeout(self.timeout))
+        except WorkerError as e:
+            if e.transient or _TRANSIENT_CLI_ERROR.search(str(e)):
+                raise RetryableError(str(e)) from e
+            raise RuntimeError(str(e)) from e
+        usage = event.get("usage") or {}
+        return LLMResponse(
+            text=(event.get("result") or "").strip(),
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+            cache_read_tokens=usage.get("cache_read_input_tokens", 0),
+            cache_write_tokens=usage.get("cache_creation_input_tokens", 0),
+        )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
 
 
-def create_llm_client(config: dict) -> LLMClient:
+def estimate_tokens(text: str) -> int:
+    """Rough token count for rate limiting (~4 chars per token)."""
+    return len(text) // 4 + 1
+
+
+_API_KEY_ENV = {"anthropic": "ANTHROPIC_API_KEY", "openai": "OPENAI_API_KEY"}
+_rate_limiters: dict[tuple, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, requests_per_minute: float | None,
+                     tokens_per_minute: float | None) -> RateLimiter:
+    """Return the process-wide RateLimiter for a provider and API key.
+
+    Every client built for the same account draws from one limiter, so the
+    quota holds across commands and purposes, not just within one client.
+    """
+    api_key = os.environ.get(_API_KEY_ENV.get(provider, ""), "")
+    key = (provider, api_key, requests_per_minute, tokens_per_minute)
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+        return _rate_limiters[key]
+
+
+class RateLimitedClient(LLMClient):
+    """Wraps another client and gates every call through a shared RateLimiter.
+
+    The token charge is the estimated prompt size plus `max_tokens`, i.e. the
+    worst case the provider counts against a tokens-per-minute quota.
+    """
+
+    def __init__(self, inner: LLMClient, limiter: RateLimiter):
+        self.inner = inner
+        self.limiter = limiter
+        self.supports_batch = inner.supports_batch
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        waited = self.limiter.acquire(estimate_tokens(cache_prefix + system + prompt) + max_tokens)
+        if waited:
+            logger.debug("Rate limiter delayed call by %.2fs", waited)
+        return self.inner.complete(model, prompt, system=system, max_tokens=max_tokens,
+                                   cache_prefix=cache_prefix)
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        self.limiter.acquire(estimate_tokens(cache_prefix + system + prompt) + max_tokens)
+        return (yield from self.inner.stream(model, prompt, system=system, max_tokens=max_tokens,
+                                             cache_prefix=cache_prefix))
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        # Batch jobs run on the provider's own schedule, outside our quota.
+        return self.inner.submit_batch(model, requests)
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        return self.inner.get_batch_results(job_id)
+
+
+def create_llm_client(config: dict, purpose: str | None = None) -> LLMClient:
+    """Build the configured provider client, wrapped for `purpose`
+    ("filter", "summarize" or "chat") with rate limiting, retries and
+    response caching as configured.
+
+    Wrapping order, outermost first: cache → retry → rate limit → ledger →
+    provider, so cache hits cost nothing, every retry re-enters the rate
+    limiter, and the ledger records each real provider attempt.
+    """
     llm_config = config.get("llm", {})
     provider = llm_config.get("provider", "anthropic").lower()
+    retry_config = llm_config.get("retry") or {}
+    max_attempts = int(retry_config.get("max_attempts", 4))
+    deadline = float(retry_config.get("deadline", 120))
+    # When we retry ourselves, turn off the SDK's built-in retries so the
+    # two layers don't multiply, and bound a single attempt by the deadline.
+    sdk_kwargs = {"max_retries": 0, "timeout": deadline} if max_attempts > 1 else {}
     if provider == "openai":
         logger.info("Using OpenAI LLM provider")
-        return OpenAIClient()
-    if provider == "anthropic":
+        client: LLMClient = OpenAIClient(**sdk_kwargs)
+    elif provider == "anthropic":
         logger.info("Using Anthropic LLM provider")
-        return AnthropicClient()
-    if provider in ("claude_code", "claude-code", "cli"):
+        client = AnthropicClient(**sdk_kwargs)
+    elif provider in ("claude_code", "claude-code", "cli"):
         logger.info("Using Claude Code CLI provider")
-        return ClaudeCodeClient(
+        provider = "claude_code"
+        client = ClaudeCodeClient(
             claude_path=llm_config.get("claude_path"),
             bare=llm_config.get("bare", False),
             timeout=llm_config.get("timeout", 180),
             extra_args=llm_config.get("extra_args"),
+            pool_size=int(llm_config.get("pool_size", 0)),
+            pool_max_calls=int(llm_config.get("pool_max_calls", 1)),
         )
-    raise ValueError(f"Unknown LLM provider: {provider}")
+    elif provider == "fake":
+        from .llm_fake import create_fake_client
+        logger.info("Using fake LLM provider (offline, simulated latency/errors)")
+        client = create_fake_client(llm_config.get("fake") or {})
+    else:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    db_path = config.get("db_path", "paleonews.db")
+    if llm_config.get("ledger", True) and db_path != ":memory:":
+        from .llm_ledger import LedgerClient, get_call_ledger
+        client = LedgerClient(client, get_call_ledger(db_path), provider,
+                              purpose or "other", prices=llm_config.get("prices"))
+
+    rate_limit = llm_config.get("rate_limit") or {}
+    rpm = rate_limit.get("requests_per_minute")
+    tpm = rate_limit.get("tokens_per_minute")
+    if rpm or tpm:
+        client = RateLimitedClient(client, get_rate_limiter(
+            provider, float(rpm) if rpm else None, float(tpm) if tpm else None,
+        ))
+
+    if max_attempts > 1:
+        from .llm_retry import RetryingLLMClient
+        client = RetryingLLMClient(
+            client,
+            max_attempts=max_attempts,
+            base_delay=float(retry_config.get("base_delay", 1.0)),
+            max_delay=float(retry_config.get("max_delay", 30.0)),
+            deadline=deadline,
+        )
+
+    cache_config = llm_config.get("cache") or {}
+    if purpose and purpose in (cache_config.get("enabled_for") or []):
+        from .llm_cache import CachingLLMClient, get_response_store
+        client = CachingLLMClient(client, get_response_store(cache_config), purpose)
+        logger.info("LLM response cache enabled for %s", purpose)
+    return client
+
+
+def find_wrapper(client: LLMClient, cls: type) -> LLMClient | None:
+    """Walk a chain of wrapping clients (via `.inner`) and return the first `cls`."""
+    while client is not None:
+        if isinstance(client, cls):
+            return client
+        client = getattr(client, "inner", None)
+    return None
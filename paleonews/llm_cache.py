@@ -0,0 +1,224 @@
+"""Content-addressed response cache wrapping any LLMClient."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .llm import BatchRequest, LLMClient, LLMResponse, TextStream
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseStore:
+    """SQLite-backed response store with TTL and total-size (LRU) eviction.
+
+    Lives in its own file so cache churn never contends with the main DB's
+    write lock. One connection is shared across threads behind a lock.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 86400, max_bytes: int = 50 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key        TEXT PRIMARY KEY,
+                purpose    TEXT,
+                model      TEXT,
+                response   TEXT NOT NULL,
+                size       INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used  REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+
+            CREATE TABLE IF NOT EXISTS llm_cache_stats (
+                purpose   TEXT PRIMARY KEY,
+                hits      INTEGER NOT NULL DEFAULT 0,
+                misses    INTEGER NOT NULL DEFAULT 0,
+                hit_bytes INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row["created_at"] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row["response"]
+
+    def put(self, key: str, purpose: str, model: str, response: str):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO llm_cache (key, purpose, model, response, size, created_at, last_used)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (key, purpose, model, response, size, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,),
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Drop least-recently-used entries until back under the cap
+                for row in self._conn.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_used"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (row["key"],))
+                    total -= row["size"]
+
+    def count(self, purpose: str, hit: bool, nbytes: int = 0):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO llm_cache_stats (purpose, hits, misses, hit_bytes) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(purpose) DO UPDATE SET
+                       hits = hits + excluded.hits,
+                       misses = misses + excluded.misses,
+                       hit_bytes = hit_bytes + excluded.hit_bytes""",
+                (purpose, int(hit), int(not hit), nbytes),
+            )
+
+    def stats(self) -> list[dict]:
+        """Per-purpose hit/miss/byte counters plus stored entry count and size."""
+        with self._lock:
+            counters = {r["purpose"]: dict(r) for r in self._conn.execute(
+                "SELECT * FROM llm_cache_stats ORDER BY purpose")}
+            for r in self._conn.execute(
+                """SELECT purpose, COUNT(*) AS entries, COALESCE(SUM(size), 0) AS stored_bytes
+                   FROM llm_cache GROUP BY purpose"""
+            ):
+                counters.setdefault(r["purpose"], {"purpose": r["purpose"], "hits": 0,
+                                                   "misses": 0, "hit_bytes": 0})
+                counters[r["purpose"]].update(entries=r["entries"], stored_bytes=r["stored_bytes"])
+        for c in counters.values():
+            c.setdefault("entries", 0)
+            c.setdefault("stored_bytes", 0)
+        return list(counters.values())
+
+    def close(self):
+        self._conn.close()
+
+
+class CachingLLMClient(LLMClient):
+    """Serve repeated prompts from a ResponseStore.
+
+    The key covers model, cache prefix, system, prompt and max_tokens.
+    Identical requests issued concurrently are collapsed into one provider
+    call (single-flight): followers wait for the leader and then read its
+    stored response. Cache hits return zero token usage.
+    """
+
+    def __init__(self, inner: LLMClient, store: ResponseStore, purpose: str):
+        self.inner = inner
+        self.store = store
+        self.purpose = purpose
+        self.supports_batch = inner.supports_batch
+        self._inflight: dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(model: str, prompt: str, system: str, max_tokens: int, cache_prefix: str) -> str:
+        raw = json.dumps([model, cache_prefix, system, prompt, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _hit(self, key: str) -> LLMResponse | None:
+        text = self.store.get(key)
+        if text is None:
+            return None
+        self.store.count(self.purpose, hit=True, nbytes=len(text.encode("utf-8")))
+        return LLMResponse(text=text)
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        key = self.cache_key(model, prompt, system, max_tokens, cache_prefix)
+        cached = self._hit(key)
+        if cached is not None:
+            return cached
+
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+
+        if not leader:
+            event.wait()
+            cached = self._hit(key)
+            if cached is not None:
+                return cached
+            # Leader failed; make our own attempt without coalescing.
+
+        try:
+            self.store.count(self.purpose, hit=False)
+            response = self.inner.complete(model, prompt, system=system, max_tokens=max_tokens,
+                                           cache_prefix=cache_prefix)
+            self.store.put(key, self.purpose, model, response.text)
+            return response
+        finally:
+            if leader:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        # No single-flight here: followers would have nothing to show until
+        # the leader finished, which defeats the point of streaming.
+        key = self.cache_key(model, prompt, system, max_tokens, cache_prefix)
+        cached = self._hit(key)
+        if cached is not None:
+            if cached.text:
+                yield cached.text
+            return cached
+        self.store.count(self.purpose, hit=False)
+        response = yield from self.inner.stream(model, prompt, system=system,
+                                                max_tokens=max_tokens, cache_prefix=cache_prefix)
+        self.store.put(key, self.purpose, model, response.text)
+        return response
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        return self.inner.submit_batch(model, requests)
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        return self.inner.get_batch_results(job_id)
+
+
+_stores: dict[str, ResponseStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_response_store(cache_config: dict) -> ResponseStore:
+    """Return the process-wide ResponseStore for the configured path."""
+    path = cache_config.get("path", "llm_cache.db")
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ResponseStore(
+                path,
+                ttl_seconds=float(cache_config.get("ttl_hours", 168)) * 3600,
+                max_bytes=int(float(cache_config.get("max_mb", 50)) * 1024 * 1024),
+            )
+        return _stores[path]
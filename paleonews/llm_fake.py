@@ -0,0 +1,186 @@
+"""Deterministic offline LLM provider for load tests and benchmarks.
+
+`provider: fake` answers filter, summary, grouped-summary, single-pass and
+chat prompts with well-formed canned text, after a simulated latency, and
+injects overload errors and 429 bursts shaped like the real SDKs'
+exceptions (so the retry layer treats them the same way). Nothing leaves
+the process.
+
+Every random draw comes from a generator seeded by (seed, model, prompt,
+n-th time this prompt was sent), so a run is reproducible regardless of
+thread scheduling, and a retried prompt can succeed where its first
+attempt failed. 429 bursts are positioned by global call count, so which
+prompts land in a burst depends on call order; how many calls do does not.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from .llm import LLMClient, LLMResponse, TextStream, estimate_tokens, join_system
+
+_PALEO_WORDS = re.compile(
+    r"fossil|dinosaur|paleo|palaeo|extinct|cretaceous|jurassic|triassic|pterosaur|"
+    r"mammoth|trilobite|hominin|neanderthal|화석|공룡|고생물|멸종",
+    re.IGNORECASE,
+)
+
+
+class FakeAPIError(Exception):
+    """Mimics an SDK APIStatusError: `status_code` plus `response.headers`."""
+
+    def __init__(self, status_code: int, message: str, retry_after: float | None = None):
+        super().__init__(f"Error code: {status_code} - {message}")
+        self.status_code = status_code
+        headers = {"retry-after": f"{retry_after:g}"} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+
+class FakeLLMClient(LLMClient):
+    """Offline provider with a lognormal latency model and error injection.
+
+    - latency: lognormal with the given median and p95 (ms), plus
+      `ms_per_output_token` for the generated text; `time_scale` multiplies
+      every sleep (0 disables sleeping entirely)
+    - error_rate: fraction of calls failing with 529 "overloaded"
+    - burst_every / burst_length: after every `burst_every` calls, the next
+      `burst_length` calls fail with 429 and Retry-After: `retry_after`
+    - relevant_rate: share of articles without paleontology keywords in the
+      title that are still judged relevant
+    """
+
+    def __init__(self, seed: int = 0, median_ms: float = 400, p95_ms: float = 1500,
+                 ms_per_output_token: float = 0.0, error_rate: float = 0.0,
+                 burst_every: int = 0, burst_length: int = 10, retry_after: float = 1.0,
+                 relevant_rate: float = 0.5, time_scale: float = 1.0):
+        self.seed = seed
+        self.mu = math.log(max(median_ms, 1e-3))
+        self.sigma = max(0.0, math.log(max(p95_ms, median_ms) / max(median_ms, 1e-3)) / 1.645)
+        self.ms_per_output_token = ms_per_output_token
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = retry_after
+        self.relevant_rate = relevant_rate
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._seen: Counter[str] = Counter()
+        self.calls = 0
+        self.injected_errors = 0
+
+    def _rng(self, model: str, prompt: str, system: str) -> tuple[random.Random, int]:
+        """Per-call generator plus the global call number (for bursts)."""
+        digest = hashlib.sha256(json.dumps([model, system, prompt]).encode("utf-8")).hexdigest()
+        with self._lock:
+            self.calls += 1
+            call_no = self.calls
+            self._seen[digest] += 1
+            attempt = self._seen[digest]
+        return random.Random(f"{self.seed}:{digest}:{attempt}"), call_no
+
+    def _sleep(self, ms: float):
+        if self.time_scale > 0 and ms > 0:
+            time.sleep(ms * self.time_scale / 1000)
+
+    def _maybe_fail(self, rng: random.Random, call_no: int):
+        if self.burst_every and self.burst_length:
+            period = self.burst_every + self.burst_length
+            if (call_no - 1) % period >= self.burst_every:
+                with self._lock:
+                    self.injected_errors += 1
+                raise FakeAPIError(429, "rate_limit_error (simulated burst)", self.retry_after)
+        if self.error_rate and rng.random() < self.error_rate:
+            with self._lock:
+                self.injected_errors += 1
+            self._sleep(rng.uniform(0, math.exp(self.mu)))
+            raise FakeAPIError(529, "overloaded_error (simulated)")
+
+    def _is_relevant(self, prompt: str) -> bool:
+        # Depends only on the title, so the filter and single-pass prompts
+        # (and retries of either) agree about the same article.
+        title = re.search(r"제목:\s*(.+)", prompt)
+        title = title.group(1) if title else prompt
+        if _PALEO_WORDS.search(title):
+            return True
+        return random.Random(f"{self.seed}:relevant:{title}").random() < self.relevant_rate
+
+    def _answer(self, rng: random.Random, prompt: str, system: str) -> str:
+        title = re.search(r"제목:\s*(.+)", prompt)
+        title = title.group(1).strip()[:60] if title else "기사"
+        if "JSON 배열" in system:
+            items = re.findall(r"^\[(\d+)\]\n제목:\s*(.+)$", prompt, re.MULTILINE)
+            return json.dumps([
+                {"id": int(article_id), "title_ko": f"[요약] {item_title.strip()[:24]}",
+                 "summary_ko": f"{item_title.strip()}에 관한 연구 결과입니다. "
+                               f"이 발견은 고생물학적으로 중요한 의미를 가집니다."}
+                for article_id, item_title in items
+            ], ensure_ascii=False)
+        if '"relevant"' in system:
+            if not self._is_relevant(prompt):
+                return '{"relevant": false}'
+            return json.dumps({
+                "relevant": True,
+                "title_ko": f"[요약] {title[:24]}",
+                "summary_ko": f"{title}에 관한 연구 결과입니다. 이 발견은 고생물학적으로 중요한 의미를 가집니다.",
+            }, ensure_ascii=False)
+        if '"yes" 또는 "no"' in prompt:
+            return "yes" if self._is_relevant(prompt) else "no"
+        if "요약해주세요" in prompt:
+            return (f"제목: [요약] {title[:24]}\n"
+                    f"요약: {title}에 관한 새로운 연구가 발표되었습니다. "
+                    f"연구진은 화석 분석을 통해 새로운 사실을 밝혀냈습니다. "
+                    f"이 발견은 해당 분류군의 진화를 이해하는 데 중요합니다.")
+        return f"(가상 응답 #{rng.randrange(10_000)}) 질문하신 내용에 대해 답변드립니다: {prompt[:80]}"
+
+    def _response(self, prompt: str, system: str, text: str) -> LLMResponse:
+        return LLMResponse(
+            text=text,
+            input_tokens=estimate_tokens(system + prompt),
+            output_tokens=estimate_tokens(text),
+        )
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        system = join_system(cache_prefix, system)
+        rng, call_no = self._rng(model, prompt, system)
+        self._maybe_fail(rng, call_no)
+        text = self._answer(rng, prompt, system)
+        self._sleep(rng.lognormvariate(self.mu, self.sigma)
+                    + self.ms_per_output_token * estimate_tokens(text))
+        return self._response(prompt, system, text)
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        system = join_system(cache_prefix, system)
+        rng, call_no = self._rng(model, prompt, system)
+        self._maybe_fail(rng, call_no)
+        text = self._answer(rng, prompt, system)
+        self._sleep(rng.lognormvariate(self.mu, self.sigma))  # time to first token
+        for start in range(0, len(text), 8):
+            chunk = text[start:start + 8]
+            self._sleep(self.ms_per_output_token * estimate_tokens(chunk))
+            yield chunk
+        return self._response(prompt, system, text)
+
+
+def create_fake_client(fake_config: dict) -> FakeLLMClient:
+    """Build a FakeLLMClient from the `llm.fake` config block."""
+    latency = fake_config.get("latency_ms") or {}
+    return FakeLLMClient(
+        seed=int(fake_config.get("seed", 0)),
+        median_ms=float(latency.get("median", 400)),
+        p95_ms=float(latency.get("p95", 1500)),
+        ms_per_output_token=float(fake_config.get("ms_per_output_token", 0)),
+        error_rate=float(fake_config.get("error_rate", 0)),
+        burst_every=int(fake_config.get("burst_every", 0)),
+        burst_length=int(fake_config.get("burst_length", 10)),
+        retry_after=float(fake_config.get("retry_after", 1.0)),
+        relevant_rate=float(fake_config.get("relevant_rate", 0.5)),
+        time_scale=float(fake_config.get("time_scale", 1.0)),
+    )
@@ -0,0 +1,207 @@
+"""Per-call LLM usage/latency ledger, written to the `llm_calls` table."""
+
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from .llm import BatchRequest, LLMClient, LLMResponse, TextStream
+from .llm_retry import classify_error
+
+logger = logging.getLogger(__name__)
+
+# USD per million tokens (input, output), matched by longest model-name prefix.
+# Override or extend with `llm.prices: {model-prefix: [input, output]}`.
+MODEL_PRICES = {
+    "claude-haiku-4-5": (1.0, 5.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus-4": (15.0, 75.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+}
+# Anthropic bills cache reads at 0.1x and cache writes at 1.25x the input rate.
+CACHE_READ_FACTOR = 0.1
+CACHE_WRITE_FACTOR = 1.25
+
+
+def estimate_cost(model: str, response: LLMResponse, prices: dict | None = None) -> float | None:
+    """Dollar cost of one response, or None for models without a known price."""
+    table = {**MODEL_PRICES, **{k: tuple(v) for k, v in (prices or {}).items()}}
+    matches = [prefix for prefix in table if model.startswith(prefix)]
+    if not matches:
+        return None
+    input_rate, output_rate = (float(x) for x in table[max(matches, key=len)])
+    return (
+        response.input_tokens * input_rate
+        + response.cache_read_tokens * input_rate * CACHE_READ_FACTOR
+        + response.cache_write_tokens * input_rate * CACHE_WRITE_FACTOR
+        + response.output_tokens * output_rate
+    ) / 1_000_000
+
+
+class CallLedger:
+    """Buffers call records and writes them to `llm_calls` in batches.
+
+    `record()` only appends to an in-memory list, so worker threads never
+    wait on SQLite. A background thread flushes every `interval` seconds or
+    once `max_rows` records are pending, on its own connection (WAL lets it
+    write alongside the pipeline's connection); `close()` flushes the rest.
+    """
+
+    _SQL = """INSERT INTO llm_calls
+              (created_at, provider, model, purpose, input_tokens, output_tokens,
+               cache_read_tokens, cache_write_tokens, prompt_chars, latency_ms,
+               outcome, error, cost_usd)
+              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    def __init__(self, db_path: str, max_rows: int = 50, interval: float = 5.0):
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.interval = interval
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="llm-ledger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, provider: str, model: str, purpose: str, response: LLMResponse | None,
+               prompt_chars: int, latency_ms: float, outcome: str, error: str | None = None,
+               cost_usd: float | None = None):
+        response = response or LLMResponse(text="")
+        row = (
+            datetime.now(timezone.utc).isoformat(), provider, model, purpose,
+            response.input_tokens, response.output_tokens,
+            response.cache_read_tokens, response.cache_write_tokens,
+            prompt_chars, round(latency_ms, 1), outcome, error, cost_usd,
+        )
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.max_rows
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            try:
+                with conn:
+                    conn.executemany(self._SQL, rows)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            # Usage accounting must never break the pipeline
+            logger.exception("Failed to write %d LLM ledger rows", len(rows))
+            return 0
+        return len(rows)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+
+class LedgerClient(LLMClient):
+    """Times every provider call and records its usage and outcome.
+
+    Sits directly around the provider, so each retry attempt is its own row
+    (outcome "retryable") and cache hits, which never reach the provider,
+    are not recorded. Batch jobs are not itemized.
+    """
+
+    def __init__(self, inner: LLMClient, ledger: CallLedger, provider: str,
+                 purpose: str, prices: dict | None = None):
+        self.inner = inner
+        self.ledger = ledger
+        self.provider = provider
+        self.purpose = purpose
+        self.prices = prices
+        self.supports_batch = inner.supports_batch
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        prompt_chars = len(cache_prefix) + len(system) + len(prompt)
+        start = time.perf_counter()
+        try:
+            response = self.inner.complete(model, prompt, system=system, max_tokens=max_tokens,
+                                           cache_prefix=cache_prefix)
+        except Exception as e:
+            retryable, _ = classify_error(e)
+            self.ledger.record(
+                self.provider, model, self.purpose, None, prompt_chars,
+                (time.perf_counter() - start) * 1000,
+                "retryable" if retryable else "error", error=str(e)[:300],
+            )
+            raise
+        self.ledger.record(
+            self.provider, model, self.purpose, response, prompt_chars,
+            (time.perf_counter() - start) * 1000, "ok",
+            cost_usd=estimate_cost(model, response, self.prices),
+        )
+        return response
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        prompt_chars = len(cache_prefix) + len(system) + len(prompt)
+        start = time.perf_counter()
+        try:
+            response = yield from self.inner.stream(model, prompt, system=system,
+                                                    max_tokens=max_tokens, cache_prefix=cache_prefix)
+        except Exception as e:
+            retryable, _ = classify_error(e)
+            self.ledger.record(
+                self.provider, model, self.purpose, None, prompt_chars,
+                (time.perf_counter() - start) * 1000,
+                "retryable" if retryable else "error", error=str(e)[:300],
+            )
+            raise
+        self.ledger.record(
+            self.provider, model, self.purpose, response, prompt_chars,
+            (time.perf_counter() - start) * 1000, "ok",
+            cost_usd=estimate_cost(model, response, self.prices),
+        )
+        return response
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        return self.inner.submit_batch(model, requests)
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        return self.inner.get_batch_results(job_id)
+
+
+_ledgers: dict[str, CallLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_call_ledger(db_path: str) -> CallLedger:
+    """Return the process-wide CallLedger for a database file."""
+    with _ledgers_lock:
+        if db_path not in _ledgers:
+            _ledgers[db_path] = CallLedger(db_path)
+        return _ledgers[db_path]
+
+
+def flush_call_ledgers():
+    """Write out all pending ledger rows (call before reading aggregates)."""
+    with _ledgers_lock:
+        ledgers = list(_ledgers.values())
+    for ledger in ledgers:
+        ledger.flush()
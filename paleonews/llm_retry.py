@@ -0,0 +1,180 @@
+"""Retry with capped exponential backoff around any LLMClient."""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .llm import BatchRequest, LLMClient, LLMResponse, RetryableError, TextStream, call_deadline
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that mean "try again later" (529 = Anthropic overloaded)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def _parse_retry_after(headers) -> float | None:
+    """Read Retry-After (seconds or HTTP date) / retry-after-ms from response headers."""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_error(exc: Exception) -> tuple[bool, float | None]:
+    """Return (retryable, retry_after_seconds) for a provider exception.
+
+    Works for the anthropic and openai SDKs without importing them: both
+    expose `status_code` and `response.headers` on API status errors, and
+    name their network errors *ConnectionError / *TimeoutError.
+    """
+    if isinstance(exc, RetryableError):
+        return True, exc.retry_after
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        return status in RETRYABLE_STATUS, _parse_retry_after(headers)
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True, None
+    name = type(exc).__name__
+    if name.endswith(("ConnectionError", "TimeoutError")):
+        return True, None
+    return False, None
+
+
+@dataclass
+class RetryStats:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    backoff_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def summary(self) -> str:
+        return (f"호출 {self.calls}건, 재시도 {self.retries}회, "
+                f"백오프 {self.backoff_seconds:.1f}초, 최종 실패 {self.failures}건")
+
+
+class RetryingLLMClient(LLMClient):
+    """Retry transient failures with capped exponential backoff and jitter.
+
+    Fatal errors (bad request, auth) are raised immediately. A provider's
+    Retry-After is honored in place of the computed delay. `deadline` bounds
+    the whole call including waits: a retry whose wait would overrun it is
+    not attempted and the last error is raised instead, and each attempt's
+    own timeout is capped at what remains (via `call_deadline`), so a slow
+    first attempt can't overrun it either.
+    """
+
+    def __init__(self, inner: LLMClient, max_attempts: int = 4, base_delay: float = 1.0,
+                 max_delay: float = 30.0, deadline: float = 120.0):
+        self.inner = inner
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.supports_batch = inner.supports_batch
+        self.stats = RetryStats()
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        if retry_after is not None:
+            return retry_after
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(cap / 2, cap)  # equal jitter
+
+    def _retry_delay(self, error: Exception, attempt: int, start: float) -> float | None:
+        """Seconds to wait before the next attempt, or None to give up."""
+        retryable, retry_after = classify_error(error)
+        if not retryable or attempt >= self.max_attempts:
+            return None
+        delay = self._backoff(attempt, retry_after)
+        if time.monotonic() - start + delay > self.deadline:
+            logger.warning("LLM call deadline (%.0fs) reached after %d attempt(s): %s",
+                           self.deadline, attempt, error)
+            return None
+        logger.warning("LLM call failed (attempt %d/%d), retrying in %.1fs: %s",
+                       attempt, self.max_attempts, delay, error)
+        return delay
+
+    def complete(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+                 cache_prefix: str = "") -> LLMResponse:
+        self.stats.add(calls=1)
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            token = call_deadline.set(start + self.deadline)
+            try:
+                return self.inner.complete(model, prompt, system=system, max_tokens=max_tokens,
+                                           cache_prefix=cache_prefix)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, start)
+                if delay is None:
+                    self.stats.add(failures=1)
+                    raise
+                self.stats.add(retries=1, backoff_seconds=delay)
+            finally:
+                call_deadline.reset(token)
+            time.sleep(delay)
+
+    def stream(self, model: str, prompt: str, *, system: str = "", max_tokens: int = 512,
+               cache_prefix: str = "") -> TextStream:
+        """Like complete(), but only failures before the first chunk are
+        retried — once text has reached the caller, a restart would repeat it."""
+        self.stats.add(calls=1)
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            emitted = False
+            try:
+                chunks = self.inner.stream(model, prompt, system=system, max_tokens=max_tokens,
+                                           cache_prefix=cache_prefix)
+                while True:
+                    # Set only while the provider runs, not while the caller holds a chunk
+                    token = call_deadline.set(start + self.deadline)
+                    try:
+                        chunk = next(chunks)
+                    except StopIteration as done:
+                        return done.value
+                    finally:
+                        call_deadline.reset(token)
+                    emitted = True
+                    yield chunk
+            except Exception as e:
+                delay = None if emitted else self._retry_delay(e, attempt, start)
+                if delay is None:
+                    self.stats.add(failures=1)
+                    raise
+                self.stats.add(retries=1, backoff_seconds=delay)
+                time.sleep(delay)
+
+    def submit_batch(self, model: str, requests: list[BatchRequest]) -> str:
+        return self.inner.submit_batch(model, requests)
+
+    def get_batch_results(self, job_id: str) -> dict[str, str | Exception] | None:
+        return self.inner.get_batch_results(job_id)
@@ -0,0 +1,226 @@
+"""Durable delivery outbox.
+
+`cmd_send` only plans and renders: `enqueue_plan` writes one outbox row per
+recipient (bodies deduplicated in `outbox_messages`) and advances the
+recipients' watermarks in the same transaction. `OutboxDeliverer` drains
+due rows — from `paleonews deliver`, or inline at the end of a pipeline
+run — fanning Telegram and email out concurrently and retrying failures
+with backoff, so a slow SMTP server or a Telegram outage no longer holds
+up the pipeline.
+
+With `delivery.live` enabled, `LiveFlusher` runs that same send pass while
+summarization is still going, every few committed summaries or seconds,
+instead of once at the end of the run.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+
+from .config import as_bool
+from .db import Database
+from .dispatcher.email import EmailFanout, SMTPPool
+from .dispatcher.telegram import TelegramFanout
+from .dispatcher.webhook import WebhookDispatcher
+from .render import RenderCache
+from .send_plan import SendPlan
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_ENV = {"slack": "SLACK_WEBHOOK_URL", "discord": "DISCORD_WEBHOOK_URL"}
+
+
+def enqueue_plan(db: Database, plan: SendPlan, renderer: RenderCache, date: str) -> int:
+    """Render every delivery in `plan` into the outbox. Returns rows queued."""
+    items = []
+    for delivery in plan.deliveries:
+        r = delivery.recipient
+        body = None
+        if delivery.articles:
+            if r.channel == "email":
+                body = json.dumps(renderer.email(delivery.articles, date), ensure_ascii=False)
+            else:
+                body = renderer.briefing(delivery.articles, date)
+        if r.channel == "email":
+            target = json.dumps(r.target if isinstance(r.target, list) else [r.target])
+        elif r.channel in WEBHOOK_ENV:
+            target = ""  # webhook URLs are secrets; resolved from env at delivery
+        else:
+            target = str(r.target)
+        items.append({
+            "channel": r.channel,
+            "user_id": r.user_id,
+            "target": target,
+            "unsent": delivery.unsent,
+            "article_ids": [a["id"] for a in delivery.articles],
+            "body": body,
+            "not_before": r.not_before,
+            "version": delivery.version,
+        })
+    queued = db.enqueue_deliveries(items)
+    logger.info("Outbox: queued %d messages (%s)", queued, renderer.summary())
+    return queued
+
+
+class _WebhookSender:
+    """Adapts a Slack/Discord webhook to the fan-out `send_all` interface."""
+
+    def __init__(self, url: str, channel: str):
+        self.dispatcher = WebhookDispatcher(url, channel)
+
+    async def send_all(self, jobs, on_done):
+        for key, _target, briefing in jobs:
+            on_done(key, await self.dispatcher.send_briefing(briefing))
+
+
+class OutboxDeliverer:
+    """Drains due outbox rows through one sender per channel.
+
+    Senders are built from config and environment as for the old inline
+    send (Telegram bot token, SMTP credentials, webhook URLs); `senders`
+    can be passed instead, as {channel: object with async send_all}.
+    """
+
+    def __init__(self, db: Database, config: dict, senders: dict | None = None):
+        self.db = db
+        delivery_config = config.get("delivery", {})
+        self.batch_size = int(delivery_config.get("batch_size", 500))
+        self.max_attempts = int(delivery_config.get("max_attempts", 6))
+        self.retry_base_seconds = float(delivery_config.get("retry_base_seconds", 60))
+        self.lease_seconds = float(delivery_config.get("lease_seconds", 600))
+        self._smtp_pool = None
+        self.senders = senders if senders is not None else self._build_senders(config.get("channels", {}))
+        self.counts = {"sent": 0, "pending": 0, "dead": 0}
+
+    def _build_senders(self, channels_config: dict) -> dict:
+        senders = {}
+        tg_config = channels_config.get("telegram", {})
+        bot_token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+        if bot_token:
+            senders["telegram"] = TelegramFanout(
+                bot_token,
+                concurrency=int(tg_config.get("concurrency", 16)),
+                rate_per_second=float(tg_config.get("rate_per_second", 30)),
+                per_chat_rate=float(tg_config.get("per_chat_rate", 1)),
+                max_length=int(tg_config.get("max_message_length", 4096)),
+            )
+        email_config = channels_config.get("email", {})
+        password = os.environ.get("EMAIL_PASSWORD", "")
+        sender = email_config.get("sender", "")
+        if sender and password:
+            self._smtp_pool = SMTPPool(
+                email_config.get("smtp_host", "smtp.gmail.com"),
+                int(email_config.get("smtp_port", 587)),
+                sender, password,
+                size=int(email_config.get("pool_size", 4)),
+                starttls=as_bool(email_config.get("starttls", True)),
+                max_messages=int(email_config.get("max_messages_per_session", 100)),
+            )
+            senders["email"] = EmailFanout(self._smtp_pool, sender)
+        for channel, env_var in WEBHOOK_ENV.items():
+            webhook_url = os.environ.get(env_var, "")
+            if webhook_url:
+                senders[channel] = _WebhookSender(webhook_url, channel)
+        return senders
+
+    def _finish(self, row: dict, success: bool, error: str | None = None):
+        status = self.db.complete_outbox(
+            row["id"], success, error=None if success else (error or "send failed"),
+            max_attempts=self.max_attempts, base_delay_seconds=self.retry_base_seconds,
+        )
+        self.counts[status] += 1
+        if row["channel"] in WEBHOOK_ENV:
+            shown = ""  # don't print webhook URLs
+        elif row["channel"] == "email":
+            shown = f" [{', '.join(json.loads(row['target']))}]"
+        else:
+            shown = f" [{row['target']}]"
+        result = {"sent": "완료", "pending": "실패 (재시도 예정)", "dead": "실패 (포기)"}[status]
+        print(f"{row['channel'].capitalize()}{shown} 전송 {result}: {len(json.loads(row['article_ids']))}건")
+
+    async def _send_rows(self, rows: list[dict]):
+        by_channel: dict[str, list[dict]] = {}
+        for row in rows:
+            by_channel.setdefault(row["channel"], []).append(row)
+        jobs = []
+        for channel, channel_rows in by_channel.items():
+            sender = self.senders.get(channel)
+            if sender is None:
+                for row in channel_rows:
+                    self._finish(row, False, f"{channel} channel not configured")
+                continue
+            if channel == "email":
+                batch = [(row, json.loads(row["target"]), tuple(json.loads(row["body"])))
+                         for row in channel_rows]
+            else:
+                batch = [(row, row["target"], row["body"]) for row in channel_rows]
+            jobs.append(sender.send_all(batch, self._finish))
+        await asyncio.gather(*jobs)
+
+    def deliver_due(self) -> int:
+        """Send everything currently due, batch by batch. Returns rows attempted."""
+        attempted = 0
+        while rows := self.db.claim_outbox(self.batch_size, self.lease_seconds):
+            asyncio.run(self._send_rows(rows))
+            attempted += len(rows)
+        return attempted
+
+    def run_forever(self, poll_interval: float = 5.0):
+        while True:
+            if not self.deliver_due():
+                time.sleep(poll_interval)
+
+    def close(self):
+        if self._smtp_pool:
+            self._smtp_pool.close()
+
+
+class LiveFlusher:
+    """Coalesces freshly committed summaries into periodic send passes.
+
+    Hook `on_commit` to a `BatchWriter`; `send` (plan, enqueue and, when
+    inline, deliver) runs once `flush_articles` summaries have committed
+    since the last pass, or `flush_seconds` after the first of them. Like
+    `BatchWriter`, the clock is only checked when something happens — on
+    commits and on `poll()` — so there is no background thread. Watermarks
+    make each pass pick up exactly what the previous ones didn't send.
+    """
+
+    def __init__(self, send, flush_seconds: float = 60.0, flush_articles: int = 5):
+        self.send = send
+        self.flush_seconds = flush_seconds
+        self.flush_articles = flush_articles
+        self.pending = 0
+        self._first_at: float | None = None
+        self.flushes = 0
+
+    def on_commit(self, committed: dict[str, int]):
+        ready = committed.get("summary", 0)
+        if ready:
+            self.pending += ready
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+        self.poll()
+
+    def poll(self):
+        if not self.pending:
+            return
+        if (self.pending >= self.flush_articles
+                or time.monotonic() - self._first_at >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Run a send pass now if any summaries are waiting."""
+        if not self.pending:
+            return
+        try:
+            self.send()
+        except Exception:
+            # Leave the count in place; the next commit or poll retries
+            logger.exception("Live send pass failed")
+            return
+        self.pending = 0
+        self._first_at = None
+        self.flushes += 1
@@ -0,0 +1,77 @@
+"""Thread-safe token-bucket rate limiting for provider calls and sends."""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate_per_minute`.
+
+    `acquire(n)` blocks until `n` tokens are available. Requests larger than
+    the bucket capacity are allowed through once the bucket is full, so a
+    single oversized prompt cannot deadlock the limiter.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self, amount: float) -> float:
+        """Take `amount` tokens if available (returns 0), else the seconds
+        until they will be."""
+        needed = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= needed:
+                self._tokens -= needed
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens, sleeping as needed. Returns seconds waited."""
+        waited = 0.0
+        while delay := self._take(amount):
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    async def wait(self, amount: float = 1.0) -> float:
+        """asyncio counterpart of `acquire`: yields to the loop while waiting."""
+        waited = 0.0
+        while delay := self._take(amount):
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+class RateLimiter:
+    """Combined requests-per-minute and tokens-per-minute limiter.
+
+    Either limit may be None (unlimited). One instance is shared by every
+    thread calling the same provider, which is what keeps a worker pool
+    inside the provider's quota.
+    """
+
+    def __init__(self, requests_per_minute: float | None = None,
+                 tokens_per_minute: float | None = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request carrying `tokens` tokens may proceed."""
+        waited = 0.0
+        if self.requests:
+            waited += self.requests.acquire(1)
+        if self.tokens and tokens:
+            waited += self.tokens.acquire(tokens)
+        return waited
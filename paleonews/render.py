@@ -0,0 +1,63 @@
+"""Cache of rendered article fragments and assembled messages for sending.
+
+Each article's Telegram block and email HTML/text sections are rendered
+once per process, keyed by (article id, TEMPLATE_VERSION), and per-user
+messages are assembled by joining cached fragments. Recipients that get
+the same article list share one assembled message object.
+"""
+
+from .dispatcher.email import article_html, article_text, compose_email
+from .summarizer import compose_briefing, format_article_block
+
+# Bump when a fragment template changes, so stale fragments aren't reused
+TEMPLATE_VERSION = 1
+
+_RENDERERS = {
+    "telegram": format_article_block,
+    "email_html": article_html,
+    "email_text": article_text,
+}
+
+
+class RenderCache:
+    def __init__(self):
+        self._fragments: dict[tuple[int, int, str], str] = {}
+        self._messages: dict[tuple, object] = {}
+        self.fragments_rendered = 0
+        self.messages_built = 0
+        self.message_hits = 0
+
+    def fragment(self, kind: str, article: dict) -> str:
+        key = (article["id"], TEMPLATE_VERSION, kind)
+        text = self._fragments.get(key)
+        if text is None:
+            text = self._fragments[key] = _RENDERERS[kind](article)
+            self.fragments_rendered += 1
+        return text
+
+    def _message(self, kind: str, articles: list[dict], date: str, build):
+        key = (kind, date, tuple(a["id"] for a in articles))
+        if key in self._messages:
+            self.message_hits += 1
+            return self._messages[key]
+        self.messages_built += 1
+        message = self._messages[key] = build()
+        return message
+
+    def briefing(self, articles: list[dict], date: str) -> str:
+        """Telegram/webhook briefing text, as `generate_briefing` would produce."""
+        return self._message("briefing", articles, date, lambda: compose_briefing(
+            [self.fragment("telegram", a) for a in articles], date,
+        ))
+
+    def email(self, articles: list[dict], date: str) -> tuple[str, str, str]:
+        """(subject, plain text, HTML), as `render_articles` would produce."""
+        return self._message("email", articles, date, lambda: compose_email(
+            [self.fragment("email_html", a) for a in articles],
+            [self.fragment("email_text", a) for a in articles],
+            date,
+        ))
+
+    def summary(self) -> str:
+        return (f"조각 {self.fragments_rendered}개 렌더링, 메시지 {self.messages_built}개 조립 "
+                f"(동일 구성 재사용 {self.message_hits}회)")
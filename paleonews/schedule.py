@@ -0,0 +1,93 @@
+"""Per-user delivery windows.
+
+Each user picks when briefings arrive: `immediate` (every send pass),
+`hourly` (at most once per local clock hour) or `daily` (once a day from
+`delivery_hour` local time, in the user's `timezone`). A recipient is due
+when it has not had a send pass since the current window opened; an empty
+pass still uses up the window, so an article arriving later waits for the
+next window instead of going out mid-window. Recipients that come due
+together are spread evenly over `spread_seconds` via the outbox's
+`next_attempt_at`, so Telegram and SMTP see a steady trickle instead of one
+burst per window.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .send_plan import Recipient
+
+DELIVERY_MODES = ("immediate", "hourly", "daily")
+
+
+def validate_preferences(mode: str, hour: int | None = None, tz: str | None = None):
+    """Raise ValueError for an unknown mode, an hour outside 0-23 or an unknown time zone."""
+    if mode not in DELIVERY_MODES:
+        raise ValueError(f"delivery mode must be one of {', '.join(DELIVERY_MODES)}: {mode}")
+    if hour is not None and not 0 <= hour <= 23:
+        raise ValueError(f"delivery hour must be 0-23: {hour}")
+    if tz:
+        try:
+            ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"unknown time zone: {tz}") from None
+
+
+@dataclass
+class DeliverySchedule:
+    timezone: str = "Asia/Seoul"   # for users without their own
+    spread_seconds: float = 900
+
+    @classmethod
+    def from_config(cls, config: dict) -> "DeliverySchedule":
+        schedule_config = config.get("delivery", {}).get("schedule") or {}
+        return cls(
+            timezone=schedule_config.get("timezone", "Asia/Seoul"),
+            spread_seconds=float(schedule_config.get("spread_seconds", 900)),
+        )
+
+    def _zone(self, name: str | None) -> ZoneInfo:
+        try:
+            return ZoneInfo(name or self.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo(self.timezone)
+
+    def window_start(self, r: Recipient, now: datetime) -> datetime | None:
+        """UTC start of the recipient's current window; None if immediate."""
+        if r.delivery_mode not in ("hourly", "daily"):
+            return None
+        local = now.astimezone(self._zone(r.timezone))
+        if r.delivery_mode == "hourly":
+            start = local.replace(minute=0, second=0, microsecond=0)
+        else:
+            start = local.replace(hour=r.delivery_hour, minute=0, second=0, microsecond=0)
+            if start > local:
+                start -= timedelta(days=1)
+        return start.astimezone(timezone.utc)
+
+    def select_due(self, recipients: list[Recipient], served: dict[tuple[str, int], str],
+                   now: datetime | None = None) -> list[Recipient]:
+        """Recipients due now, with `not_before` set to stagger windowed ones.
+
+        `served` maps (channel, user_id) to the ISO time of its last window
+        pass (`Database.get_windows_served`); record this pass with
+        `Database.mark_windows_served` for the recipients that have a
+        `not_before`. Windowed recipients coming due in the same pass share
+        the spread, in a stable order.
+        """
+        now = now or datetime.now(timezone.utc)
+        due: list[Recipient] = []
+        windowed: list[Recipient] = []
+        for r in recipients:
+            start = self.window_start(r, now)
+            if start is None:
+                due.append(r)
+                continue
+            last = served.get((r.channel, r.user_id or 0))
+            if last is None or datetime.fromisoformat(last) < start:
+                windowed.append(r)
+        windowed.sort(key=lambda r: (r.channel, r.user_id or 0))
+        for i, r in enumerate(windowed):
+            offset = self.spread_seconds * i / len(windowed)
+            r.not_before = (now + timedelta(seconds=offset)).isoformat()
+        return due + windowed
@@ -0,0 +1,121 @@
+"""Set-based send planning.
+
+Instead of querying each recipient's unsent articles and keywords one by
+one, `build_send_plan` reads the ready-to-send articles, every watermark,
+the delivery exceptions and the stray success rows once, then works out
+each recipient's delivery list in memory. Recipients that share a keyword
+list share one keyword-matching pass.
+"""
+
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+from .db import Database
+from .filter import filter_articles_for_user
+
+
+@dataclass
+class Recipient:
+    """One delivery target. `user_id` None is a channel-wide target
+    (webhooks, static email recipients) tracked as user 0.
+
+    The delivery_* fields and `timezone` are the user's window preferences
+    (see schedule.py); `not_before` is the outbox slot the scheduler picked.
+    """
+
+    channel: str
+    user_id: int | None
+    target: str | list[str]
+    keywords: list[str] | None = None
+    delivery_mode: str = "immediate"
+    delivery_hour: int = 8
+    timezone: str | None = None
+    not_before: str | None = None
+
+    @classmethod
+    def from_user(cls, channel: str, user: dict, target: str) -> "Recipient":
+        keywords = user.get("keywords")
+        if isinstance(keywords, str):
+            keywords = json.loads(keywords)
+        return cls(
+            channel, user.get("id"), target, keywords,
+            delivery_mode=user.get("delivery_mode") or "immediate",
+            delivery_hour=int(user.get("delivery_hour") if user.get("delivery_hour") is not None else 8),
+            timezone=user.get("timezone"),
+        )
+
+
+@dataclass
+class Delivery:
+    recipient: Recipient
+    unsent: list[dict]     # everything the watermark will move past
+    articles: list[dict]   # the subset matching the recipient's keywords
+    version: int = 0       # delivery_state version the plan was read at
+
+
+@dataclass
+class SendPlan:
+    deliveries: list[Delivery] = field(default_factory=list)
+    ready: int = 0
+
+    def for_channel(self, channel: str) -> list[Delivery]:
+        return [d for d in self.deliveries if d.recipient.channel == channel]
+
+    @property
+    def pending(self) -> int:
+        """Deliveries that will actually send something."""
+        return sum(1 for d in self.deliveries if d.articles)
+
+
+def build_send_plan(db: Database, recipients: list[Recipient], max_attempts: int = 5) -> SendPlan:
+    """Compute every recipient's unsent and keyword-matched articles.
+
+    Matches `Database.get_unsent_for_user` per recipient, with a fixed
+    number of queries regardless of how many recipients there are. Each
+    delivery records the recipient's delivery_state version, so two passes
+    planned from the same state can't both enqueue it.
+    """
+    if not recipients:
+        return SendPlan()
+    # Versions first: a pass that lands after this read makes them stale, so
+    # enqueue_deliveries drops what this plan would queue twice
+    versions = db.get_delivery_versions()
+    watermarks = db.get_delivery_watermarks()
+    exceptions = db.get_delivery_exceptions(max_attempts)
+
+    def key(r: Recipient) -> tuple[str, int]:
+        return (r.channel, r.user_id or 0)
+
+    low = min(watermarks.get(key(r), 0) for r in recipients)
+    ready = db.get_ready_articles(low, max_attempts)
+    delivered = db.get_delivered_ids(low)
+    by_id = {a["id"]: a for a in ready}
+    above = [a for a in ready if a["ready_seq"] is not None and a["ready_seq"] > low]
+    seqs = [a["ready_seq"] for a in above]
+
+    matches: dict[tuple | None, set[int]] = {}
+
+    def matching_ids(keywords: list[str] | None) -> set[int] | None:
+        if keywords is None:
+            return None  # receives everything
+        kw_key = tuple(keywords)
+        if kw_key not in matches:
+            matches[kw_key] = {a["id"] for a in filter_articles_for_user(ready, keywords)}
+        return matches[kw_key]
+
+    plan = SendPlan(ready=len(above))
+    for r in recipients:
+        k = key(r)
+        done = delivered.get(k, ())
+        unsent = [a for a in above[bisect_right(seqs, watermarks.get(k, 0)):] if a["id"] not in done]
+        extra = exceptions.get(k, set()) - {a["id"] for a in unsent}
+        if extra:
+            unsent = sorted(unsent + [by_id[i] for i in extra if i in by_id],
+                            key=lambda a: a["ready_seq"] or 0)
+        if not unsent:
+            continue
+        wanted = matching_ids(r.keywords)
+        articles = unsent if wanted is None else [a for a in unsent if a["id"] in wanted]
+        plan.deliveries.append(Delivery(r, unsent, articles, versions.get(k, 0)))
+    return plan
@@ -1,55 +1,457 @@
+import json
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterator
 
-from .llm import LLMClient
+from .config import as_bool
+from .llm import BatchRequest, LLMClient, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 SYSTEM_PROMPT = "당신은 고생물학 전문 과학 저널리스트입니다. 영문 과학 기사를 한국어로 정확하고 자연스럽게 요약합니다."
 
+# Static instructions live in the system prefix (sent with cache_prefix so
+# providers with prompt caching reuse it); per-article text goes last.
+SUMMARY_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+요약 요청에는 다음 형식으로 정확히 답변하세요:
+제목: (한국어 제목, 30자 이내)
+요약: (핵심 내용, 이 연구/발견이 왜 중요한지 포함)
+
+요약 분량: 본문이 주어지면 3~4문장, 짧은 요약만 주어지면 2~3문장."""
+
 ARTICLE_PROMPT = """\
 아래 영문 기사를 한국어로 요약해주세요.
 
 제목: {title}
 요약: {summary}
-출처: {source}
-
-다음 형식으로 정확히 답변하세요:
-제목: (한국어 제목, 30자 이내)
-요약: (핵심 내용 2~3문장, 이 연구/발견이 왜 중요한지 포함)"""
+출처: {source}"""
 
 ARTICLE_PROMPT_WITH_BODY = """\
 아래 영문 기사를 한국어로 요약해주세요.
 
 제목: {title}
 본문: {body}
-출처: {source}
+출처: {source}"""
 
-다음 형식으로 정확히 답변하세요:
-제목: (한국어 제목, 30자 이내)
-요약: (핵심 내용 3~4문장, 이 연구/발견이 왜 중요한지 포함)"""
 
+CLASSIFY_SYSTEM_PROMPT = SYSTEM_PROMPT + """
 
-def summarize_article(
-    client: LLMClient, article: dict, model: str
-) -> tuple[str, str]:
-    """Summarize a single article. Returns (title_ko, summary_ko)."""
+요청받은 영문 기사가 고생물학(paleontology)과 직접 관련이 있는지 판단하고, 관련이 있을 때만 한국어로 요약합니다.
+고생물학: 화석, 멸종 생물, 지질시대 생물, 고인류학, 진화 고생물학 등
+
+JSON 한 줄로만 답변하세요. "relevant" 키를 가장 먼저 쓰세요.
+관련 없음: {"relevant": false} 만 쓰고 즉시 끝내세요.
+관련 있음: {"relevant": true, "title_ko": "(한국어 제목, 30자 이내)", "summary_ko": "(핵심 내용 2~3문장, 이 연구/발견이 왜 중요한지 포함)"}"""
+
+CLASSIFY_AND_SUMMARIZE_PROMPT = """\
+제목: {title}
+요약: {summary}
+출처: {source}"""
+
+
+MULTI_SUMMARY_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+여러 기사를 한 번에 요약합니다. 각 기사는 [번호]로 시작합니다.
+JSON 배열 하나로만 답변하세요. 기사마다 원소 하나씩, 주어진 번호를 그대로 "id"에 쓰세요:
+[{"id": 번호, "title_ko": "(한국어 제목, 30자 이내)", "summary_ko": "(핵심 내용 2~3문장, 이 연구/발견이 왜 중요한지 포함)"}]"""
+
+MULTI_SUMMARY_ITEM = """\
+[{id}]
+제목: {title}
+요약: {summary}
+출처: {source}"""
+
+
+def _summary_prompt(article: dict) -> str:
     body = article.get("body")
     if body and len(body) >= 100:
-        prompt = ARTICLE_PROMPT_WITH_BODY.format(
+        return ARTICLE_PROMPT_WITH_BODY.format(
             title=article.get("title", ""),
             body=body,
             source=article.get("source", ""),
         )
-    else:
-        prompt = ARTICLE_PROMPT.format(
-            title=article.get("title", ""),
-            summary=article.get("summary", ""),
-            source=article.get("source", ""),
+    return ARTICLE_PROMPT.format(
+        title=article.get("title", ""),
+        summary=article.get("summary", ""),
+        source=article.get("source", ""),
+    )
+
+
+@dataclass
+class RouteStats:
+    calls: int = 0
+    escalations: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+
+
+class ModelRouter:
+    """Choose the summary model per article (`summarizer.routing`).
+
+    Rules, first match wins:
+      no_body       no crawled body                          → cheap model
+      journal_long  source in strong_sources, long body      → strong model
+      short         prompt at most max_cheap_chars           → cheap model
+      default                                                → strong model
+
+    A cheap-model answer without both 제목:/요약: fields, or with a summary
+    outside [min_summary_chars, max_summary_chars], is redone on the strong
+    model. Without a cheap model every article takes the default route.
+    """
+
+    def __init__(self, strong_model: str, cheap_model: str | None = None,
+                 max_cheap_chars: int = 1500, strong_sources: list[str] | None = None,
+                 strong_min_body: int = 3000, min_summary_chars: int = 20,
+                 max_summary_chars: int = 1500):
+        self.strong_model = strong_model
+        self.cheap_model = cheap_model
+        self.max_cheap_chars = max_cheap_chars
+        self.strong_sources = [x.lower() for x in strong_sources or []]
+        self.strong_min_body = strong_min_body
+        self.min_summary_chars = min_summary_chars
+        self.max_summary_chars = max_summary_chars
+        self.stats: dict[tuple[str, str], RouteStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ModelRouter":
+        summarizer_config = config.get("summarizer", {})
+        strong = summarizer_config.get("model", "claude-sonnet-4-20250514")
+        routing = summarizer_config.get("routing") or {}
+        if not as_bool(routing.get("enabled", False)):
+            return cls(strong)
+        return cls(
+            strong,
+            cheap_model=routing.get("cheap_model", "claude-haiku-4-5-20251001"),
+            max_cheap_chars=int(routing.get("max_cheap_chars", 1500)),
+            strong_sources=routing.get("strong_sources"),
+            strong_min_body=int(routing.get("strong_min_body", 3000)),
+            min_summary_chars=int(routing.get("min_summary_chars", 20)),
+            max_summary_chars=int(routing.get("max_summary_chars", 1500)),
+        )
+
+    def route(self, article: dict, prompt: str) -> tuple[str, str]:
+        """Return (route name, model) for an article."""
+        if not self.cheap_model:
+            return "default", self.strong_model
+        body = article.get("body") or ""
+        if len(body) < 100:
+            return "no_body", self.cheap_model
+        origin = f"{article.get('source') or ''} {article.get('feed_url') or ''}".lower()
+        if len(body) >= self.strong_min_body and any(s in origin for s in self.strong_sources):
+            return "journal_long", self.strong_model
+        if len(prompt) <= self.max_cheap_chars:
+            return "short", self.cheap_model
+        return "default", self.strong_model
+
+    def acceptable(self, text: str) -> bool:
+        """Whether a summary response is well-formed enough to keep."""
+        if not (re.search(r"제목:\s*\S", text) and re.search(r"요약:\s*\S", text)):
+            return False
+        _, summary_ko = _parse_summary(text)
+        return self.min_summary_chars <= len(summary_ko) <= self.max_summary_chars
+
+    def record(self, route: str, model: str, response, seconds: float, escalated: bool = False):
+        with self._lock:
+            stats = self.stats.setdefault((route, model), RouteStats())
+            stats.calls += 1
+            stats.escalations += int(escalated)
+            stats.input_tokens += response.input_tokens
+            stats.output_tokens += response.output_tokens
+            stats.seconds += seconds
+
+    def report(self) -> list[dict]:
+        """Per (route, model) totals, busiest first."""
+        with self._lock:
+            rows = [
+                {"route": route, "model": model, **vars(stats),
+                 "avg_seconds": stats.seconds / stats.calls if stats.calls else 0.0}
+                for (route, model), stats in self.stats.items()
+            ]
+        return sorted(rows, key=lambda r: -r["calls"])
+
+
+def summarize_article(
+    client: LLMClient, article: dict, model: str, router: ModelRouter | None = None
+) -> tuple[str, str]:
+    """Summarize a single article. Returns (title_ko, summary_ko).
+
+    With a router, `model` is ignored in favour of the routed model, and a
+    malformed cheap-model answer is escalated to the strong model.
+    """
+    prompt = _summary_prompt(article)
+    if router is None:
+        text = client.chat(model, prompt, cache_prefix=SUMMARY_SYSTEM_PROMPT, max_tokens=512)
+        return _parse_summary(text)
+
+    route, model = router.route(article, prompt)
+    start = time.monotonic()
+    response = client.complete(model, prompt, cache_prefix=SUMMARY_SYSTEM_PROMPT, max_tokens=512)
+    router.record(route, model, response, time.monotonic() - start)
+    if model != router.strong_model and not router.acceptable(response.text):
+        logger.info("Escalating article %s from %s to %s (unusable summary: %r)",
+                    article.get("id"), model, router.strong_model, response.text[:120])
+        start = time.monotonic()
+        response = client.complete(router.strong_model, prompt,
+                                   cache_prefix=SUMMARY_SYSTEM_PROMPT, max_tokens=512)
+        router.record(route, router.strong_model, response, time.monotonic() - start,
+                      escalated=True)
+    return _parse_summary(response.text)
+
+
+def batch_custom_id(article_id: int) -> str:
+    return f"article-{article_id}"
+
+
+def submit_summary_batch(client: LLMClient, articles: list[dict], model: str) -> str:
+    """Submit summarization prompts for `articles` as one provider batch job."""
+    requests = [
+        BatchRequest(batch_custom_id(a["id"]), _summary_prompt(a),
+                     max_tokens=512, cache_prefix=SUMMARY_SYSTEM_PROMPT)
+        for a in articles
+    ]
+    return client.submit_batch(model, requests)
+
+
+def collect_summary_batch(
+    client: LLMClient, job_id: str, article_ids: list[int]
+) -> dict[int, tuple[str, str] | Exception] | None:
+    """Fetch a finished batch job. Returns {article_id: (title_ko, summary_ko) or error},
+    or None while the job is still processing. Articles missing from the
+    provider's results are reported as errors."""
+    results = client.get_batch_results(job_id)
+    if results is None:
+        return None
+    parsed: dict[int, tuple[str, str] | Exception] = {}
+    for article_id in article_ids:
+        result = results.get(batch_custom_id(article_id))
+        if result is None:
+            parsed[article_id] = RuntimeError("missing from batch results")
+        elif isinstance(result, Exception):
+            parsed[article_id] = result
+        else:
+            parsed[article_id] = _parse_summary(result)
+    return parsed
+
+
+@dataclass
+class SummaryGrouping:
+    """How `summarize.group` packs short articles into multi-article requests.
+
+    Only articles without a crawled body and with an RSS summary of at most
+    `max_item_chars` are grouped. A group grows until adding the next
+    article would exceed `max_input_tokens` (estimated) or `max_articles`.
+    """
+    max_input_tokens: int = 3000
+    max_articles: int = 8
+    output_tokens_per_article: int = 250
+    max_item_chars: int = 1500
+
+    @classmethod
+    def from_config(cls, config: dict) -> "SummaryGrouping | None":
+        group_config = config.get("summarizer", {}).get("group") or {}
+        if not as_bool(group_config.get("enabled", False)):
+            return None
+        return cls(
+            max_input_tokens=int(group_config.get("max_input_tokens", 3000)),
+            max_articles=int(group_config.get("max_articles", 8)),
+            output_tokens_per_article=int(group_config.get("output_tokens_per_article", 250)),
+            max_item_chars=int(group_config.get("max_item_chars", 1500)),
         )
 
-    text = client.chat(model, prompt, system=SYSTEM_PROMPT, max_tokens=512)
-    return _parse_summary(text)
+    def groupable(self, article: dict) -> bool:
+        body = article.get("body") or ""
+        return len(body) < 100 and len(article.get("summary") or "") <= self.max_item_chars
+
+    def plan(self, articles: list[dict]) -> list[list[int]]:
+        """Split article indices into tasks: groups of short articles, and
+        single-article tasks for everything else (and leftover singletons)."""
+        tasks: list[list[int]] = []
+        group: list[int] = []
+        budget = 0
+        for i, article in enumerate(articles):
+            if not self.groupable(article):
+                tasks.append([i])
+                continue
+            cost = estimate_tokens(_multi_summary_item(article))
+            if group and (budget + cost > self.max_input_tokens or len(group) >= self.max_articles):
+                tasks.append(group)
+                group, budget = [], 0
+            group.append(i)
+            budget += cost
+        if group:
+            tasks.append(group)
+        return tasks
+
+
+def _multi_summary_item(article: dict) -> str:
+    return MULTI_SUMMARY_ITEM.format(
+        id=article["id"],
+        title=article.get("title", ""),
+        summary=article.get("summary", ""),
+        source=article.get("source", ""),
+    )
+
+
+def _parse_multi_summary(text: str, article_ids: list[int]) -> dict[int, tuple[str, str]]:
+    """Parse a multi-article JSON array into {article_id: (title_ko, summary_ko)}.
+
+    Items with an unknown id or an empty title/summary are left out, so the
+    caller can redo just those articles one by one.
+    """
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, list):
+        return {}
+    wanted = set(article_ids)
+    parsed: dict[int, tuple[str, str]] = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            article_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        title_ko = str(item.get("title_ko") or "").strip()
+        summary_ko = str(item.get("summary_ko") or "").strip()
+        if article_id in wanted and title_ko and summary_ko:
+            parsed[article_id] = (title_ko, summary_ko)
+    return parsed
+
+
+def summarize_group(
+    client: LLMClient, articles: list[dict], model: str, grouping: SummaryGrouping,
+    router: "ModelRouter | None" = None,
+) -> dict[int, tuple[str, str]]:
+    """Summarize several short articles in one request. Returns only the
+    well-formed items; the shared instructions are sent once per group."""
+    prompt = "\n\n".join(_multi_summary_item(a) for a in articles)
+    if router is not None and router.cheap_model:
+        model = router.cheap_model  # grouped articles are short by construction
+    start = time.monotonic()
+    response = client.complete(
+        model, prompt, cache_prefix=MULTI_SUMMARY_SYSTEM_PROMPT,
+        max_tokens=min(8192, grouping.output_tokens_per_article * len(articles) + 100),
+    )
+    if router is not None:
+        router.record("group", model, response, time.monotonic() - start)
+    return _parse_multi_summary(response.text, [a["id"] for a in articles])
+
+
+@dataclass
+class SummaryResult:
+    article: dict
+    title_ko: str = ""
+    summary_ko: str = ""
+    error: Exception | None = None
+
+
+def summarize_concurrently(
+    client: LLMClient, articles: list[dict], model: str, concurrency: int = 4,
+    router: ModelRouter | None = None, grouping: SummaryGrouping | None = None,
+) -> Iterator[tuple[int, SummaryResult]]:
+    """Summarize articles on a bounded thread pool.
+
+    Yields (index, SummaryResult) in completion order so the caller can
+    persist each result immediately; `index` is the article's position in
+    `articles` for callers that want to report in input order. Provider rate
+    limits are enforced by the client itself (see RateLimitedClient), and the
+    CLI provider simply runs up to `concurrency` subprocesses at once.
+
+    With `grouping`, short articles are summarized several per request;
+    items missing or malformed in a group's answer (or a failed group call)
+    fall back to the single-article path.
+    """
+    def run(article: dict) -> SummaryResult:
+        try:
+            title_ko, summary_ko = summarize_article(client, article, model, router)
+            return SummaryResult(article, title_ko, summary_ko)
+        except Exception as e:
+            return SummaryResult(article, error=e)
+
+    def run_task(indices: list[int]) -> list[tuple[int, SummaryResult]]:
+        if len(indices) == 1:
+            return [(indices[0], run(articles[indices[0]]))]
+        group = [articles[i] for i in indices]
+        try:
+            parsed = summarize_group(client, group, model, grouping, router)
+        except Exception:
+            logger.exception("Grouped summary of %d articles failed; falling back", len(group))
+            parsed = {}
+        if len(parsed) < len(group):
+            logger.info("Group summary returned %d/%d usable items; redoing the rest singly",
+                        len(parsed), len(group))
+        results = []
+        for i in indices:
+            article = articles[i]
+            if article["id"] in parsed:
+                results.append((i, SummaryResult(article, *parsed[article["id"]])))
+            else:
+                results.append((i, run(article)))
+        return results
+
+    tasks = grouping.plan(articles) if grouping else [[i] for i in range(len(articles))]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(run_task, task) for task in tasks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def classify_and_summarize(
+    client: LLMClient, article: dict, model: str
+) -> tuple[bool | None, str, str]:
+    """Judge relevance and summarize in one call. Returns (is_relevant, title_ko, summary_ko).
+
+    Irrelevant articles come back with empty title/summary. A relevant verdict
+    whose summary could not be parsed also returns empty strings, leaving the
+    article for the regular summarize stage. If the call itself fails,
+    is_relevant is None and the article stays unfiltered.
+    """
+    prompt = CLASSIFY_AND_SUMMARIZE_PROMPT.format(
+        title=article.get("title", ""),
+        summary=article.get("summary", ""),
+        source=article.get("source", ""),
+    )
+    try:
+        text = client.chat(model, prompt, cache_prefix=CLASSIFY_SYSTEM_PROMPT, max_tokens=512)
+    except Exception:
+        logger.exception("Single-pass classify/summarize failed for article %s", article.get("id"))
+        return None, "", ""
+    return _parse_classify_summary(text)
+
+
+def _parse_classify_summary(text: str) -> tuple[bool, str, str]:
+    """Parse the single-pass JSON verdict into (is_relevant, title_ko, summary_ko)."""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and "relevant" in data:
+            if not data["relevant"]:
+                return False, "", ""
+            return (
+                True,
+                str(data.get("title_ko") or "").strip(),
+                str(data.get("summary_ko") or "").strip(),
+            )
+    # Truncated or malformed JSON: trust an explicit verdict if present
+    if re.search(r'"relevant"\s*:\s*false', text):
+        return False, "", ""
+    logger.warning("Unparseable single-pass response, keeping article: %r", text[:200])
+    return True, "", ""
 
 
 def _parse_summary(text: str) -> tuple[str, str]:
@@ -72,26 +474,28 @@ def _parse_summary(text: str) -> tuple[str, str]:
     return title_ko, summary_ko
 
 
+BRIEFING_SEPARATOR = "\n\n" + "─" * 22 + "\n\n"
+
+
+def format_article_block(article: dict) -> str:
+    """One article's section of the Telegram/webhook briefing."""
+    return "\n".join([
+        f"📌 {article.get('title_ko', article.get('title', ''))}",
+        article.get("summary_ko", ""),
+        f"🔗 원문: {article.get('url', '')}",
+        f"📰 출처: {article.get('source', '')}",
+    ])
+
+
+def compose_briefing(blocks: list[str], date: str) -> str:
+    """Wrap pre-rendered article blocks in the briefing header and footer."""
+    return (
+        f"🦴 고생물학 뉴스 브리핑 ({date})\n" + "━" * 22 + "\n\n"
+        + BRIEFING_SEPARATOR.join(blocks)
+        + "\n\n" + "━" * 22 + f"\n총 {len(blocks)}건의 뉴스가 수집되었습니다."
+    )
+
+
 def generate_briefing(articles: list[dict], date: str) -> str:
     """Compose a daily briefing text from summarized articles."""
-    lines = [
-        f"🦴 고생물학 뉴스 브리핑 ({date})",
-        "━" * 22,
-        "",
-    ]
-
-    for i, a in enumerate(articles):
-        lines.append(f"📌 {a.get('title_ko', a.get('title', ''))}")
-        lines.append(a.get("summary_ko", ""))
-        lines.append(f"🔗 원문: {a.get('url', '')}")
-        lines.append(f"📰 출처: {a.get('source', '')}")
-        if i < len(articles) - 1:
-            lines.append("")
-            lines.append("─" * 22)
-            lines.append("")
-
-    lines.append("")
-    lines.append("━" * 22)
-    lines.append(f"총 {len(articles)}건의 뉴스가 수집되었습니다.")
-
-    return "\n".join(lines)
+    return compose_briefing([format_article_block(a) for a in articles], date)
@@ -14,6 +14,8 @@ from fastapi.templating import Jinja2Templates
 
 from .config import load_config, apply_settings_overlay
 from .db import Database
+from .llm_ledger import flush_call_ledgers
+from .schedule import validate_preferences
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +119,8 @@ async def dashboard(request: Request):
     users = db.get_all_users()
     runs = db.get_recent_runs(5)
     source_stats = db.get_source_stats()
+    flush_call_ledgers()
+    llm_usage = db.get_llm_usage(since_hours=24 * 7)
     active_users = sum(1 for u in users if u["is_active"])
     return templates.TemplateResponse(request, "dashboard.html", {
         "stats": stats,
@@ -124,6 +128,7 @@ async def dashboard(request: Request):
         "runs": runs,
         "active_users": active_users,
         "source_stats": source_stats,
+        "llm_usage": llm_usage,
         "pipeline_status": _pipeline_status,
     })
 
@@ -174,7 +179,7 @@ async def articles_list(
     q: str = Query("", description="Search query"),
     page: int = Query(1, ge=1),
     per_page: int = Query(30, ge=10, le=100),
-    status: str = Query("all", description="Filter: all, relevant, summarized, sent"),
+    status: str = Query("all", description="Filter: all, relevant, summarized, sent, failed"),
 ):
     db = get_db()
     articles, total = db.search_articles(q, status=status, page=page, per_page=per_page)
@@ -190,6 +195,18 @@ async def articles_list(
     })
 
 
+@app.post("/articles/{article_id}/retry-summary")
+async def articles_retry_summary(article_id: int):
+    get_db().retry_summary(article_id)
+    return RedirectResponse("/articles?status=failed", status_code=303)
+
+
+@app.post("/articles/retry-summary-all")
+async def articles_retry_summary_all():
+    get_db().retry_summary()
+    return RedirectResponse("/articles?status=failed", status_code=303)
+
+
 # --- Users ---
 
 @app.get("/users", response_class=HTMLResponse)
@@ -259,11 +276,21 @@ async def user_edit(
     is_admin: bool = Form(False),
     notify_telegram: bool = Form(False),
     notify_email: bool = Form(False),
+    delivery_mode: str = Form("immediate"),
+    delivery_hour: int = Form(8),
+    timezone: str = Form(""),
 ):
     db = get_db()
     user = db.get_user(user_id)
     if not user:
         return RedirectResponse("/users", status_code=303)
+    try:
+        validate_preferences(delivery_mode, delivery_hour, timezone.strip() or None)
+    except ValueError:
+        # Keep the stored window rather than saving an unusable one
+        delivery_mode = user["delivery_mode"]
+        delivery_hour = user["delivery_hour"]
+        timezone = user["timezone"] or ""
     db.update_user(
         user_id,
         telegram_chat_id=telegram_chat_id.strip() or None,
@@ -274,6 +301,9 @@ async def user_edit(
         is_admin=is_admin,
         notify_telegram=notify_telegram,
         notify_email=notify_email,
+        delivery_mode=delivery_mode,
+        delivery_hour=delivery_hour,
+        timezone=timezone.strip() or None,
     )
     kw = keywords.strip()
     if not kw or kw == "*":
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark: spawn-per-call `claude -p` vs the pooled stream-json workers.
+
+By default runs against tests/fake_claude.py with a simulated CLI boot time
+(FAKE_CLAUDE_STARTUP, default 0.8s) and model time per answer
+(FAKE_CLAUDE_LATENCY, default 1.0s) so the result is reproducible offline.
+The pool hides the boot when a spare can start while the previous call is
+answered. Pass --claude-path to measure the real CLI (this bills real calls).
+
+    python scripts/bench_claude_pool.py [--calls N] [--pool-size K] [--claude-path PATH]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from paleonews.llm import ClaudeCodeClient  # noqa: E402
+
+PROMPT = "Is this article about paleontology? Answer yes or no.\n\nTitle: New sauropod from Patagonia"
+
+
+def bench(label: str, client: ClaudeCodeClient, calls: int, model: str) -> list[float]:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.chat(model, PROMPT, max_tokens=8)
+        latencies.append(time.perf_counter() - start)
+    p50 = statistics.median(latencies)
+    p95 = sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"{label:<16} {calls:>4} calls  p50 {p50 * 1000:8.1f}ms  p95 {p95 * 1000:8.1f}ms  "
+          f"total {sum(latencies):7.2f}s")
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--max-calls", type=int, default=1)
+    parser.add_argument("--model", default="claude-haiku-4-5-20251001")
+    parser.add_argument("--claude-path", help="real claude binary (default: offline fake)")
+    args = parser.parse_args()
+
+    claude_path = args.claude_path
+    if not claude_path:
+        claude_path = str(ROOT / "tests" / "fake_claude.py")
+        os.environ.setdefault("FAKE_CLAUDE_STARTUP", "0.8")
+        os.environ.setdefault("FAKE_CLAUDE_LATENCY", "1.0")
+        print(f"fake CLI, simulated startup {os.environ['FAKE_CLAUDE_STARTUP']}s, "
+              f"model time {os.environ['FAKE_CLAUDE_LATENCY']}s")
+
+    spawn = ClaudeCodeClient(claude_path=claude_path)
+    pooled = ClaudeCodeClient(claude_path=claude_path, pool_size=args.pool_size,
+                              pool_max_calls=args.max_calls)
+    try:
+        base = bench("spawn-per-call", spawn, args.calls, args.model)
+        pool = bench(f"pool(size={args.pool_size})", pooled, args.calls, args.model)
+    finally:
+        pooled.close()
+    print(f"speedup (median): {statistics.median(base) / statistics.median(pool):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
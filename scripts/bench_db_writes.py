@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark: per-row commit vs Database.batch() for stage writes.
+
+Creates a throwaway file DB (WAL, so each commit is a real fsync), inserts
+N articles, then times marking them relevant row-by-row (the old
+`mark_relevant` path) against the batched writer.
+
+    python scripts/bench_db_writes.py [N]
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from paleonews.db import Database  # noqa: E402
+from paleonews.fetcher import Article  # noqa: E402
+
+
+def make_db(path: Path, n: int) -> Database:
+    db = Database(str(path))
+    db.init_tables()
+    now = datetime.now(timezone.utc)
+    db.save_articles(
+        Article(f"https://example.com/{i}", f"Article {i}", "summary", "Bench",
+                "https://example.com/feed", now)
+        for i in range(n)
+    )
+    return db
+
+
+def bench(label: str, n: int, write) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(Path(tmp) / "bench.db", n)
+        ids = [r["id"] for r in db.get_unfiltered()]
+        start = time.perf_counter()
+        write(db, ids)
+        elapsed = time.perf_counter() - start
+        assert not db.get_unfiltered()
+        db.close()
+    rate = n / elapsed
+    print(f"{label:<12} {n:>6} rows  {elapsed:8.3f}s  {rate:10.0f} rows/s")
+    return rate
+
+
+def per_row(db: Database, ids: list[int]):
+    for article_id in ids:
+        db.mark_relevant(article_id, True)
+
+
+def batched(db: Database, ids: list[int]):
+    with db.batch() as writer:
+        for article_id in ids:
+            writer.mark_relevant(article_id, True)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    before = bench("per-row", n, per_row)
+    after = bench("batch", n, batched)
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
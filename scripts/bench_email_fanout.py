@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Benchmark: one SMTP connection per email vs pooled sessions + fan-out.
+
+Starts a local aiosmtpd server (with a simulated per-connection handshake
+cost standing in for TCP + STARTTLS + AUTH against a real provider) and
+sends N single-recipient briefings both ways.
+
+    pip install aiosmtpd
+    python scripts/bench_email_fanout.py [N] [HANDSHAKE_MS]
+"""
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from paleonews.dispatcher.email import EmailDispatcher, EmailFanout, SMTPPool, render_articles  # noqa: E402
+
+ARTICLES = [
+    {"title_ko": f"공룡 화석 {i}", "summary_ko": "새로운 연구 결과입니다. " * 5,
+     "source": "Nature", "url": f"https://example.com/{i}"}
+    for i in range(8)
+]
+
+
+class Handler:
+    def __init__(self, handshake_ms: float):
+        self.handshake = handshake_ms / 1000
+        self.messages = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.handshake)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def per_message(host: str, port: int, n: int):
+    for i in range(n):
+        dispatcher = EmailDispatcher(host, port, "news@example.com", "", [f"user{i}@example.com"],
+                                     starttls=False)
+        asyncio.run(dispatcher.send_articles(ARTICLES, "2026-01-01"))
+
+
+def pooled(host: str, port: int, n: int):
+    pool = SMTPPool(host, port, size=8, starttls=False)
+    content = render_articles(ARTICLES, "2026-01-01")
+    asyncio.run(EmailFanout(pool, "news@example.com").send_all(
+        [(i, [f"user{i}@example.com"], content) for i in range(n)], lambda key, ok: None,
+    ))
+    pool.close()
+    print(f"  pooled sessions opened: {pool.connects}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    handshake_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    handler = Handler(handshake_ms)
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        results = {}
+        # The per-message path is linear in n; time a sample and extrapolate
+        sample = min(n, 200)
+        for label, fn, count in (("per-message", per_message, sample), ("pooled", pooled, n)):
+            start = time.perf_counter()
+            fn(controller.hostname, controller.port, count)
+            elapsed = time.perf_counter() - start
+            results[label] = elapsed / count
+            print(f"{label:<12} {count:>6} emails  {elapsed:8.2f}s  "
+                  f"(~{elapsed / count * n:.1f}s for {n})")
+        print(f"speedup: {results['per-message'] / results['pooled']:.1f}x")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Load test: filter + summarize N synthetic articles against the fake provider.
+
+Runs the real cmd_filter / cmd_summarize stages on a throwaway DB with
+`llm.provider: fake`, so concurrency, retry and cache settings can be
+compared offline and reproducibly.
+
+    python scripts/bench_pipeline_fake.py [--articles N] [--concurrency K]
+        [--median-ms MS] [--error-rate R] [--burst-every N] [--seed S] [--group]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from paleonews import __main__ as cli  # noqa: E402
+from paleonews.db import Database  # noqa: E402
+from paleonews.fetcher import Article  # noqa: E402
+from paleonews.llm_ledger import flush_call_ledgers  # noqa: E402
+
+TOPICS = ["dinosaur fossil", "galaxy survey", "trilobite eyes", "battery chemistry",
+          "Cretaceous bird", "protein folding", "mammoth DNA", "ocean currents"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--median-ms", type=float, default=300)
+    parser.add_argument("--p95-ms", type=float, default=1200)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--burst-every", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--group", action="store_true", help="enable multi-article summary groups")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)  # retry warnings are summarized below
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        config = {
+            "db_path": db_path,
+            "llm": {
+                "provider": "fake",
+                "retry": {"max_attempts": 4, "base_delay": 0.2, "max_delay": 2},
+                "fake": {
+                    "seed": args.seed,
+                    "latency_ms": {"median": args.median_ms, "p95": args.p95_ms},
+                    "error_rate": args.error_rate,
+                    "burst_every": args.burst_every,
+                    "retry_after": 0.5,
+                },
+            },
+            "filter": {"keywords": ["study"],  # every title matches → all go to the LLM
+                       "llm_filter": {"enabled": True, "model": "fake-haiku",
+                                      "concurrency": args.concurrency}},
+            "summarizer": {"model": "fake-sonnet", "concurrency": args.concurrency,
+                           "max_articles_per_run": args.articles,
+                           "group": {"enabled": args.group}},
+        }
+        db = Database(db_path)
+        db.init_tables()
+        now = datetime.now(timezone.utc)
+        db.save_articles(
+            Article(f"https://example.com/{i}", f"{TOPICS[i % len(TOPICS)]} study {i}",
+                    "summary", "Bench", "https://example.com/feed", now)
+            for i in range(args.articles)
+        )
+
+        for stage in (cli.cmd_filter, cli.cmd_summarize):
+            start = time.perf_counter()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                count = stage(db, config)
+            elapsed = time.perf_counter() - start
+            retries = [line for line in output.getvalue().splitlines() if "재시도" in line]
+            print(f"{stage.__name__:<14} {count:>5} items  {elapsed:7.2f}s  "
+                  f"{(count / elapsed if elapsed else 0):7.1f}/s  {' '.join(retries)}")
+
+        flush_call_ledgers()
+        for u in db.get_llm_usage():
+            print(f"  {u['purpose']:<10} calls {u['calls']:>5}  errors {u['errors']:>4}  "
+                  f"avg {u['avg_ms']:7.0f}ms  max {u['max_ms']:7.0f}ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
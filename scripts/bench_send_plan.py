@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark: per-user unsent queries vs the set-based send planner.
+
+Builds a throwaway file DB with N synthetic users (a mix of "receive all"
+and a handful of shared keyword lists, with staggered watermarks) and M
+ready articles, then times the old per-user loop (`get_unsent_for_user` +
+`get_user_keywords` + keyword filter) against `build_send_plan`.
+
+    python scripts/bench_send_plan.py [USERS] [ARTICLES]
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from paleonews.db import Database  # noqa: E402
+from paleonews.fetcher import Article  # noqa: E402
+from paleonews.filter import filter_articles_for_user  # noqa: E402
+from paleonews.send_plan import Recipient, build_send_plan  # noqa: E402
+
+TOPICS = ["dinosaur", "mammoth", "trilobite", "pterosaur", "hominin", "amber", "fossil"]
+
+
+def make_db(path: Path, users: int, articles: int) -> Database:
+    rng = random.Random(0)
+    db = Database(str(path))
+    db.init_tables()
+    now = datetime.now(timezone.utc)
+    db.save_articles(
+        Article(f"https://example.com/{i}", f"New {rng.choice(TOPICS)} study {i}", "summary",
+                "Bench", "https://example.com/feed", now)
+        for i in range(articles)
+    )
+    with db.batch(max_rows=1000) as writer:
+        for i in range(1, articles + 1):
+            writer.mark_relevant(i, True)
+            writer.save_summary(i, f"제목 {i}", f"{rng.choice(TOPICS)} 관련 요약 {i}")
+
+    keyword_sets = [None] + [json.dumps(rng.sample(TOPICS, 2)) for _ in range(20)]
+    ts = now.isoformat()
+    with db.conn:
+        db.conn.executemany(
+            """INSERT INTO users (telegram_chat_id, username, is_active, keywords, created_at, updated_at)
+               VALUES (?, ?, 1, ?, ?, ?)""",
+            [(str(100000 + u), f"user{u}", rng.choice(keyword_sets), ts, ts) for u in range(users)],
+        )
+        # Most users are caught up to some point near the end of the backlog
+        db.conn.executemany(
+            "INSERT INTO delivery_state (channel, user_id, watermark, updated_at) VALUES ('telegram', ?, ?, ?)",
+            [(u, articles - rng.randrange(0, 20), ts) for u in range(1, users + 1)],
+        )
+    return db
+
+
+def per_user(db: Database) -> int:
+    total = 0
+    for user in db.get_active_users():
+        unsent = db.get_unsent_for_user("telegram", user["id"])
+        if unsent:
+            total += len(filter_articles_for_user(unsent, db.get_user_keywords(user["id"])))
+    return total
+
+
+def planned(db: Database) -> int:
+    recipients = [
+        Recipient.from_user("telegram", user, user["telegram_chat_id"]) for user in db.get_active_users()
+    ]
+    plan = build_send_plan(db, recipients)
+    return sum(len(d.articles) for d in plan.deliveries)
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    articles = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(Path(tmp) / "bench.db", users, articles)
+        results = {}
+        for label, fn in (("per-user", per_user), ("planner", planned)):
+            start = time.perf_counter()
+            count = fn(db)
+            elapsed = time.perf_counter() - start
+            results[label] = (elapsed, count)
+            print(f"{label:<10} {users:>6} users  {elapsed:8.3f}s  {count:>8} article deliveries")
+        db.close()
+    assert results["per-user"][1] == results["planner"][1], "planner disagrees with per-user queries"
+    print(f"speedup: {results['per-user'][0] / results['planner'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
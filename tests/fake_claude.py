@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Stand-in for the `claude` CLI used by pool tests and the pool benchmark.
+
+`-p ... PROMPT` prints an echo of PROMPT; with `--input-format stream-json`
+it serves one result event per stdin message until EOF. FAKE_CLAUDE_STARTUP
+(seconds) simulates CLI boot time and FAKE_CLAUDE_LATENCY model time per
+answer. Prompts containing CRASH make the process exit; prompts containing
+HANG make it stall.
+"""
+import json
+import os
+import sys
+import time
+
+time.sleep(float(os.environ.get("FAKE_CLAUDE_STARTUP", "0")))
+
+latency = float(os.environ.get("FAKE_CLAUDE_LATENCY", "0"))
+
+if "--input-format" not in sys.argv:
+    time.sleep(latency)
+    print(f"echo: {sys.argv[-1]}")
+    sys.exit(0)
+
+turns = 0
+for line in sys.stdin:
+    text = json.loads(line)["message"]["content"][0]["text"]
+    turns += 1
+    if "CRASH" in text:
+        sys.exit(3)
+    if "HANG" in text:
+        time.sleep(60)
+    time.sleep(latency)
+    print(json.dumps({"type": "system", "subtype": "init", "pid": os.getpid()}), flush=True)
+    print(json.dumps({
+        "type": "result", "subtype": "success", "is_error": False,
+        "result": f"echo: {text} (pid {os.getpid()}, turn {turns})",
+        "usage": {"input_tokens": 7, "output_tokens": 3},
+    }), flush=True)
@@ -0,0 +1,98 @@
+"""Provider batch mode against a local stand-in for the batch endpoint."""
+
+from datetime import datetime, timezone
+
+import paleonews.__main__ as cli
+from paleonews.db import Database
+from paleonews.fetcher import Article
+from paleonews.llm import LLMClient, LLMResponse
+
+
+class LocalBatchEndpoint(LLMClient):
+    """Accepts batch jobs and 'finishes' them when `complete()` is called."""
+
+    supports_batch = True
+
+    def __init__(self):
+        self.jobs: dict[str, list] = {}
+        self.done: set[str] = set()
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        raise AssertionError("batch mode must not use the synchronous path")
+
+    def submit_batch(self, model, requests):
+        job_id = f"job-{len(self.jobs) + 1}"
+        self.jobs[job_id] = requests
+        return job_id
+
+    def complete(self, job_id):
+        self.done.add(job_id)
+
+    def get_batch_results(self, job_id):
+        if job_id not in self.done:
+            return None
+        results = {}
+        for r in self.jobs[job_id]:
+            if "Poison" in r.prompt:
+                results[r.custom_id] = RuntimeError("errored")
+            else:
+                results[r.custom_id] = "제목: 배치 제목\n요약: 배치 요약"
+        return results
+
+
+def _setup(monkeypatch, titles):
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([
+        Article(f"https://example.com/{i}", t, "summary", "Src", "https://example.com/feed",
+                datetime(2026, 1, 1, tzinfo=timezone.utc))
+        for i, t in enumerate(titles)
+    ])
+    for i in range(1, len(titles) + 1):
+        db.mark_relevant(i, True)
+    endpoint = LocalBatchEndpoint()
+    monkeypatch.setattr(cli, "create_llm_client", lambda config, purpose=None: endpoint)
+    return db, endpoint
+
+
+CONFIG = {"llm": {"provider": "anthropic"}, "summarizer": {"model": "m"}}
+
+
+def test_batch_submit_and_collect(monkeypatch):
+    db, endpoint = _setup(monkeypatch, ["Dinosaur", "Mammoth", "Poison pill"])
+
+    assert cli.cmd_summarize_batch(db, CONFIG) == 3
+    assert list(endpoint.jobs) == ["job-1"]
+    batches = db.get_open_llm_batches("summarize")
+    assert [b["job_id"] for b in batches] == ["job-1"]
+    # Articles inside an open batch are hidden from the synchronous path
+    assert db.get_unsummarized() == []
+
+    # Still processing: nothing collected, batch stays open
+    assert cli.cmd_summarize_collect(db, CONFIG) == 0
+    assert len(db.get_open_llm_batches("summarize")) == 1
+
+    endpoint.complete("job-1")
+    assert cli.cmd_summarize_collect(db, CONFIG) == 2
+    assert db.get_open_llm_batches("summarize") == []
+    # The failed item counts an attempt and returns to the normal queue
+    # once its backoff has elapsed
+    assert db.get_unsummarized() == []
+    db.conn.execute("UPDATE articles SET summary_next_at = '2000-01-01'")
+    remaining = db.get_unsummarized()
+    assert [a["title"] for a in remaining] == ["Poison pill"]
+    assert remaining[0]["summary_attempts"] == 1
+    assert db.get_stats()["summarized"] == 2
+    db.close()
+
+
+def test_batch_falls_back_to_sync_without_endpoint(monkeypatch):
+    db, endpoint = _setup(monkeypatch, ["Dinosaur"])
+    endpoint.supports_batch = False
+    endpoint.complete = lambda model, prompt, **kw: LLMResponse(text="제목: 공룡\n요약: 동기 요약")
+
+    assert cli.cmd_summarize_batch(db, CONFIG) == 1
+    assert endpoint.jobs == {}
+    assert db.get_unsummarized() == []
+    assert db.get_stats()["summarized"] == 1
+    db.close()
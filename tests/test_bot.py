@@ -0,0 +1,95 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from paleonews.bot import handle_message, visible_text
+from paleonews.db import Database
+from paleonews.llm import LLMClient, LLMResponse
+
+
+class _StreamingClient(LLMClient):
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        return LLMResponse(text="".join(self.chunks))
+
+    def stream(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        for chunk in self.chunks:
+            time.sleep(self.delay)
+            yield chunk
+        return LLMResponse(text="".join(self.chunks))
+
+
+class _FakeMessage:
+    def __init__(self, log, text):
+        self.log = log
+        self.text = text
+
+    async def edit_text(self, text):
+        self.log.append(("edit", text))
+        self.text = text
+        return self
+
+    async def delete(self):
+        self.log.append(("delete", self.text))
+
+
+def _update(log, text="공룡 알려줘"):
+    async def reply_text(reply):
+        log.append(("reply", reply))
+        return _FakeMessage(log, reply)
+
+    async def send_action(action):
+        pass
+
+    return SimpleNamespace(
+        message=SimpleNamespace(text=text, reply_text=reply_text),
+        effective_chat=SimpleNamespace(id=42, send_action=send_action),
+        effective_user=SimpleNamespace(username="u", full_name="User"),
+    )
+
+
+def _context(db, client, **extra):
+    return SimpleNamespace(bot_data={"db": db, "llm": client, "chat_model": "m",
+                                     "stream_interval": 0.0, **extra})
+
+
+@pytest.fixture
+def db():
+    database = Database(":memory:")
+    database.init_tables()
+    yield database
+    database.close()
+
+
+def test_visible_text_hides_memory_commands():
+    assert visible_text("안녕\n[MEMORY: 티라노 좋아함]") == "안녕"
+    assert visible_text("안녕\n[MEM") == "안녕"  # may still grow into a command
+    assert visible_text("안녕\n[참고] 출처") == "안녕\n[참고] 출처"
+    assert visible_text("안녕\n[") == "안녕"
+    assert visible_text("안녕\n[MEMORY 없이 괄호로 시작하는 문장") == "안녕\n[MEMORY 없이 괄호로 시작하는 문장"
+
+
+@pytest.mark.asyncio
+async def test_streaming_reply_edits_in_place_and_saves_memory(db):
+    log = []
+    client = _StreamingClient(["티라노", "사우루스는 ", "육식 공룡입니다.", "\n[MEMORY: 티라노 관심]"])
+    await handle_message(_update(log), _context(db, client))
+
+    assert log[0] == ("reply", "티라노")  # first text posted as soon as it arrived
+    assert all(kind == "edit" for kind, _ in log[1:])
+    assert log[-1] == ("edit", "티라노사우루스는 육식 공룡입니다.")
+    assert not any("[MEMORY" in text for _, text in log)
+    user = db.get_user_by_telegram_id("42")
+    assert [m["content"] for m in db.get_memories(user["id"])] == ["티라노 관심"]
+
+
+@pytest.mark.asyncio
+async def test_non_streaming_fallback(db):
+    log = []
+    client = _StreamingClient(["한 번에 ", "답변"])
+    await handle_message(_update(log), _context(db, client, stream=False))
+    assert log == [("reply", "한 번에 답변")]
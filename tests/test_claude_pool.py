@@ -0,0 +1,109 @@
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+from paleonews.llm import ClaudeCodeClient, RetryableError
+
+FAKE_CLAUDE = str(Path(__file__).with_name("fake_claude.py"))
+
+
+@pytest.fixture
+def pooled_client():
+    client = ClaudeCodeClient(claude_path=FAKE_CLAUDE, timeout=5, pool_size=1, pool_max_calls=3)
+    yield client
+    client.close()
+
+
+def _pid(text: str) -> str:
+    return re.search(r"pid (\d+)", text).group(1)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_spawn_per_call_path():
+    client = ClaudeCodeClient(claude_path=FAKE_CLAUDE, timeout=5)
+    assert client.chat("m", "hello") == "echo: hello"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_pool_reuses_worker_and_recycles(pooled_client):
+    first = pooled_client.complete("m", "a")
+    second = pooled_client.complete("m", "b")
+    assert first.text.startswith("echo: a")
+    assert first.input_tokens == 7
+    assert _pid(first.text) == _pid(second.text)  # same warm session
+
+    pooled_client.complete("m", "c")  # third call hits max_calls
+    fourth = pooled_client.complete("m", "d")
+    assert _pid(fourth.text) != _pid(first.text)
+    assert "turn 1" in fourth.text
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_pool_restarts_crashed_and_hung_workers(pooled_client):
+    pooled_client.timeout = 1
+    with pytest.raises(RetryableError):
+        pooled_client.complete("m", "CRASH")
+    with pytest.raises(RetryableError):
+        pooled_client.complete("m", "HANG")
+    assert pooled_client.pool.restarts == 2
+    assert pooled_client.chat("m", "ok").startswith("echo: ok")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_default_pool_boots_next_worker_during_the_call(monkeypatch):
+    import time
+
+    monkeypatch.setenv("FAKE_CLAUDE_STARTUP", "0.5")
+    monkeypatch.setenv("FAKE_CLAUDE_LATENCY", "0.6")  # model time per answer
+    client = ClaudeCodeClient(claude_path=FAKE_CLAUDE, timeout=5, pool_size=1)  # max_calls=1
+    try:
+        client.complete("m", "warm-up")  # the only call that waits for a boot
+        for prompt in ("a", "b"):
+            start = time.monotonic()
+            response = client.complete("m", prompt)
+            assert time.monotonic() - start < 0.6 + 0.3  # no 0.5 s boot on top
+            assert "turn 1" in response.text  # still a fresh session per prompt
+    finally:
+        client.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_release_after_close_starts_no_worker(pooled_client):
+    worker = pooled_client.pool._acquire([FAKE_CLAUDE, "--input-format", "stream-json"], timeout=1)
+    pooled_client.close()
+    spawned = pooled_client.pool.spawned
+    pooled_client.pool._release(worker, healthy=False)
+    assert pooled_client.pool.spawned == spawned
+    assert pooled_client.pool.idle_workers() == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_closing_wrapped_client_stops_pool_workers():
+    from paleonews.llm import create_llm_client, find_wrapper
+
+    client = create_llm_client({
+        "db_path": ":memory:",
+        "llm": {"provider": "claude_code", "claude_path": FAKE_CLAUDE, "timeout": 5, "pool_size": 1},
+    }, purpose="summarize")
+    assert client.chat("m", "a").startswith("echo: a")
+    pool = find_wrapper(client, ClaudeCodeClient).pool
+    workers = pool.idle_workers()
+    assert workers and all(w.alive for w in workers)
+    client.close()
+    assert not any(w.alive for w in workers)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shebang script")
+def test_retry_deadline_caps_a_slow_attempt(pooled_client):
+    import time
+
+    from paleonews.llm_retry import RetryingLLMClient
+
+    pooled_client.timeout = 30
+    client = RetryingLLMClient(pooled_client, max_attempts=3, base_delay=0.01, deadline=1.0)
+    start = time.monotonic()
+    with pytest.raises(RetryableError):
+        client.complete("m", "HANG")
+    assert time.monotonic() - start < 5  # not the provider's 30 s timeout
@@ -98,3 +98,185 @@ def test_stats():
     assert stats["summarized"] == 1
     assert stats["sent"] == 1
     db.close()
+
+
+def test_batch_writer_flushes_on_exit():
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([
+        make_article("https://example.com/1"),
+        make_article("https://example.com/2"),
+    ])
+
+    with db.batch(max_rows=100, max_interval=60) as writer:
+        writer.mark_relevant(1, True)
+        writer.mark_relevant(2, False)
+        writer.save_body(1, "본문")
+        writer.save_summary(1, "제목", "요약")
+        # Nothing written until the batch flushes
+        assert len(db.get_unfiltered()) == 2
+
+    assert len(db.get_unfiltered()) == 0
+    assert db.get_stats()["summarized"] == 1
+    assert writer.flushes == 1
+    assert writer.rows_written == 4
+    db.close()
+
+
+def test_batch_writer_flushes_every_max_rows():
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([make_article(f"https://example.com/{i}") for i in range(5)])
+
+    with db.batch(max_rows=2, max_interval=60) as writer:
+        for i in range(1, 6):
+            writer.mark_relevant(i, True)
+        assert writer.flushes == 2
+        assert len(db.get_unfiltered()) == 1
+
+    assert writer.flushes == 3
+    assert len(db.get_unfiltered()) == 0
+    db.close()
+
+
+def test_batch_writer_keeps_completed_rows_on_error():
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([make_article()])
+
+    try:
+        with db.batch(max_interval=60) as writer:
+            writer.mark_relevant(1, True)
+            raise RuntimeError("stage crashed")
+    except RuntimeError:
+        pass
+
+    assert len(db.get_unfiltered()) == 0
+    db.close()
+
+
+def test_summary_failure_backoff_and_dead_letter():
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([make_article(), make_article("https://example.com/2", "Fresh")])
+    poison, fresh = (r["id"] for r in db.get_unfiltered())
+    db.mark_relevant(poison, True)
+    db.mark_relevant(fresh, True)
+
+    assert db.record_summary_failure(poison, "ValueError: bad", max_attempts=2) is False
+    # Backing off: only the fresh article is due
+    assert [a["id"] for a in db.get_unsummarized()] == [fresh]
+
+    db.conn.execute("UPDATE articles SET summary_next_at = '2000-01-01' WHERE id = ?", (poison,))
+    assert [a["id"] for a in db.get_unsummarized()] == [fresh, poison]  # fresh first
+
+    assert db.record_summary_failure(poison, "ValueError: bad", max_attempts=2) is True
+    assert [a["id"] for a in db.get_dead_letter_articles()] == [poison]
+    assert db.get_stats()["dead_letter"] == 1
+    assert [a["id"] for a in db.get_unsummarized()] == [fresh]
+
+    assert db.retry_summary() == 1
+    assert db.get_dead_letter_articles() == []
+    assert poison in [a["id"] for a in db.get_unsummarized()]
+    db.close()
+
+
+def test_stage_transitions_and_queue_indexes():
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([make_article(url=f"https://example.com/{i}") for i in range(3)])
+    a, b, c = (r["id"] for r in db.get_unfiltered())
+
+    def stage(article_id):
+        return db.conn.execute("SELECT stage FROM articles WHERE id = ?", (article_id,)).fetchone()[0]
+
+    assert stage(a) == "new"
+    with db.batch() as writer:
+        writer.mark_relevant(a, True)
+        writer.save_summary(a, "제목", "요약")  # single-pass: same flush
+        writer.mark_relevant(b, False)
+    db.mark_relevant(c, True)
+    assert (stage(a), stage(b), stage(c)) == ("summarized", "irrelevant", "relevant")
+    assert [r["id"] for r in db.get_unfiltered()] == []
+    assert [r["id"] for r in db.get_uncrawled()] == [c]
+    assert [r["id"] for r in db.get_unsent("telegram")] == [a]
+
+    # Re-judging a summarized article keeps it in the ready queue
+    db.mark_relevant(a, True)
+    assert stage(a) == "summarized"
+
+    def plan(sql):
+        return " ".join(r[-1] for r in db.conn.execute("EXPLAIN QUERY PLAN " + sql))
+
+    assert "idx_articles_q_unfiltered" in plan("SELECT * FROM articles WHERE stage = 'new' ORDER BY id")
+    assert "idx_articles_q_ready" in plan("SELECT * FROM articles WHERE stage = 'summarized'")
+    db.close()
+
+
+def test_search_articles_full_text_ranked():
+    db = Database(":memory:")
+    db.init_tables()
+    assert db.fts
+    db.save_articles([
+        make_article("https://example.com/1", "Feathered dinosaur found in amber"),
+        make_article("https://example.com/2", "Mammoth genome sequenced"),
+        make_article("https://example.com/3", "Ancient shark teeth"),
+    ])
+    db.mark_relevant(2, True)
+    db.save_body(2, "The mammoth bones sat next to a small feathered dinosaur fragment.")
+    db.mark_relevant(1, True)
+    db.save_summary(1, "호박 속 깃털 공룡 발견", "미얀마 호박에서 티라노사우루스 친척의 깃털이 발견됐다.")
+
+    def ids(query, **kw):
+        return [a["id"] for a in db.search_articles(query, **kw)[0]]
+
+    # Title match outranks a body-only match; the body is searchable at all
+    assert ids("feathered dinosaur") == [1, 2]
+    # Korean substrings via trigrams, from the summary and the title
+    assert ids("티라노") == [1]
+    assert ids("깃털 공룡") == [1]
+    # Two-character terms fall back to LIKE
+    assert ids("공룡") == [1]
+    assert ids("mammoth", status="summarized") == []
+    assert db.search_articles("shark")[1] == 1
+
+    # Triggers keep the index in step with edits and deletes
+    db.conn.execute("UPDATE articles SET title = 'Ancient ray teeth' WHERE id = 3")
+    assert ids("shark") == []
+    db.conn.execute("DELETE FROM articles WHERE id = 2")
+    assert ids("feathered") == [1]
+    db.close()
+
+
+def test_search_index_built_for_existing_articles(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = Database(path)
+    db.init_tables()
+    db.save_articles([make_article("https://example.com/1", "Pterosaur wing membrane")])
+    db.conn.executescript("""
+        DROP TRIGGER articles_fts_ai; DROP TRIGGER articles_fts_ad; DROP TRIGGER articles_fts_au;
+        DROP TABLE articles_fts;
+    """)
+    db.close()
+
+    db = Database(path)
+    db.init_tables()  # recreates and backfills the index
+    assert [a["id"] for a in db.search_articles("wing membrane")[0]] == [1]
+    db.close()
+
+
+def test_search_index_with_missing_trigger_is_recreated(tmp_path):
+    path = str(tmp_path / "partial.db")
+    db = Database(path)
+    db.init_tables()
+    db.conn.execute("DROP TRIGGER articles_fts_au")  # e.g. an interrupted first run
+    db.conn.commit()
+    db.close()
+
+    db = Database(path)
+    db.init_tables()
+    db.save_articles([make_article("https://example.com/1", "Ichthyosaur")])
+    db.conn.execute("UPDATE articles SET title = 'Plesiosaur neck' WHERE id = 1")
+    assert [a["id"] for a in db.search_articles("plesiosaur")[0]] == [1]
+    assert db.search_articles("ichthyosaur")[0] == []
+    db.close()
@@ -0,0 +1,96 @@
+import asyncio
+import socket
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from paleonews.dispatcher.email import EmailDispatcher, EmailFanout, SMTPPool, render_articles  # noqa: E402
+
+
+class _Handler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        if "spam" in envelope.rcpt_tos[0]:
+            return "554 Message rejected"
+        if "busy" in envelope.rcpt_tos[0]:
+            return "421 Service closing"
+        self.messages.append(envelope.rcpt_tos)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = _Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    try:
+        yield handler, controller.hostname, controller.port
+    finally:
+        controller.stop()
+
+
+ARTICLES = [{"title_ko": "공룡 화석", "summary_ko": "요약", "source": "Nature", "url": "https://example.com/1"}]
+
+
+def test_fanout_reuses_sessions(smtp_server):
+    handler, host, port = smtp_server
+    pool = SMTPPool(host, port, size=4, starttls=False, max_messages=40)
+    fanout = EmailFanout(pool, "news@example.com")
+    content = render_articles(ARTICLES, "2026-01-01")
+    done = {}
+    asyncio.run(fanout.send_all(
+        [(i, [f"user{i}@example.com"], content) for i in range(120)],
+        lambda key, ok: done.__setitem__(key, ok),
+    ))
+    pool.close()
+
+    assert done == {i: True for i in range(120)}
+    assert len(handler.messages) == 120
+    # Sessions are reused: at most 4 open at once, each recycled after 40 messages
+    assert pool.connects <= 4 + 120 // 40
+    assert len(handler.sessions) == pool.connects
+
+
+def test_pool_reconnects_dropped_session(smtp_server):
+    handler, host, port = smtp_server
+    pool = SMTPPool(host, port, size=1, starttls=False)
+    dispatcher = EmailDispatcher(host, port, "news@example.com", "", ["a@example.com"], pool=pool)
+    assert asyncio.run(dispatcher.send_articles(ARTICLES, "2026-01-01"))
+
+    pool._idle.queue[0].server.close()  # server side went away while idle
+    assert asyncio.run(dispatcher.send_articles(ARTICLES, "2026-01-01"))
+    assert pool.reconnects == 1
+    assert len(handler.messages) == 2
+    pool.close()
+
+
+def test_pool_keeps_session_only_after_message_rejection(smtp_server):
+    handler, host, port = smtp_server
+    pool = SMTPPool(host, port, size=1, starttls=False)
+    content = render_articles(ARTICLES, "2026-01-01")
+    fanout = EmailFanout(pool, "news@example.com")
+    done = {}
+
+    def send(key, to):
+        asyncio.run(fanout.send_all([(key, [to], content)], lambda k, ok: done.__setitem__(k, ok)))
+
+    send("spam", "spam@example.com")   # 554: this message only
+    assert pool.connects == 1 and pool._idle.qsize() == 1
+    send("busy", "busy@example.com")   # 421: the session is finished
+    assert pool._idle.qsize() == 0
+    send("ok", "a@example.com")
+    assert pool.connects == 2
+    assert done == {"spam": False, "busy": False, "ok": True}
+    pool.close()
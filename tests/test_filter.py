@@ -1,4 +1,11 @@
-from paleonews.filter import is_dedicated_feed, keyword_match
+import threading
+import time
+from datetime import datetime, timezone
+
+from paleonews.db import Database
+from paleonews.fetcher import Article
+from paleonews.filter import filter_articles, is_dedicated_feed, keyword_match
+from paleonews.ratelimit import TokenBucket
 
 
 def test_is_dedicated_feed():
@@ -42,3 +49,142 @@ def test_keyword_match_no_partial_word():
     assert keyword_match("Mass extinction event", "", keywords)
     # "extinct" should not match inside unrelated words
     assert not keyword_match("A distinctly new approach", "", keywords)
+
+
+class _FakeClient:
+    """Answers "yes" for titles containing 'dinosaur', tracks peak concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def chat(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return "yes" if "dinosaur" in prompt else "no"
+
+
+def _filter_db(titles):
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([
+        Article(f"https://example.com/{i}", t, "", "Src", "https://mixed.example.com/rss",
+                datetime(2026, 1, 1, tzinfo=timezone.utc))
+        for i, t in enumerate(titles)
+    ])
+    return db
+
+
+def test_filter_articles_runs_llm_checks_concurrently():
+    titles = [f"New dinosaur {i}" for i in range(4)] + [f"Fossil fuel {i}" for i in range(4)]
+    titles.append("Quantum computing")  # keyword miss, never reaches the LLM
+    db = _filter_db(titles)
+    client = _FakeClient()
+    config = {
+        "filter": {
+            "keywords": ["dinosaur", "fossil"],
+            "llm_filter": {"enabled": True, "concurrency": 4},
+        },
+    }
+
+    assert filter_articles(db, config, llm_client=client) == 4
+    assert client.peak > 1
+    assert len(db.get_unfiltered()) == 0
+    db.close()
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(600, capacity=1)  # 10/s, no burst
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+class _SinglePassClient:
+    def __init__(self):
+        self.calls = 0
+
+    def chat(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        self.calls += 1
+        if "dinosaur" in prompt:
+            return '{"relevant": true, "title_ko": "공룡", "summary_ko": "공룡 요약"}'
+        return '{"relevant": false}'
+
+
+def test_filter_articles_single_pass_summarizes_relevant():
+    db = _filter_db(["New dinosaur species", "Fossil fuel prices"])
+    client = _SinglePassClient()
+    config = {
+        "filter": {
+            "keywords": ["dinosaur", "fossil"],
+            "llm_filter": {"enabled": True, "single_pass": True},
+        },
+    }
+
+    assert filter_articles(db, config, llm_client=client) == 1
+    assert client.calls == 2
+    # The relevant article already carries its summary
+    assert db.get_unsummarized() == []
+    assert db.get_stats()["summarized"] == 1
+    db.close()
+
+
+class _FailingClient(_FakeClient):
+    def chat(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        if "fuel" in prompt:
+            raise RuntimeError("overloaded")
+        return super().chat(model, prompt, system=system, max_tokens=max_tokens)
+
+
+def test_filter_articles_reports_undecided_separately(caplog):
+    db = _filter_db(["New dinosaur species", "Fossil fuel prices", "Fossil hunters"])
+    config = {"filter": {"keywords": ["dinosaur", "fossil"], "llm_filter": {"enabled": True}}}
+
+    with caplog.at_level("INFO", logger="paleonews.filter"):
+        assert filter_articles(db, config, llm_client=_FailingClient(delay=0)) == 1
+    assert "1 relevant, 1 irrelevant, 1 undecided" in caplog.text
+    assert [a["title"] for a in db.get_unfiltered()] == ["Fossil fuel prices"]
+    db.close()
+
+
+def test_filter_flags_accept_overlay_strings():
+    db = _filter_db(["Fossil fuel prices"])
+    config = {"filter": {"keywords": ["fossil"], "llm_filter": {"enabled": "false"}}}
+
+    # "false" from a settings overlay must not switch the LLM check on
+    assert filter_articles(db, config, llm_client=_FailingClient(delay=0)) == 1
+    db.close()
+
+
+def test_single_pass_articles_get_ready_seq_across_flushes(monkeypatch):
+    db = _filter_db(["New dinosaur species", "Rare dinosaur eggs", "Fossil fuel prices"])
+    batch = db.batch
+    monkeypatch.setattr(db, "batch", lambda **kw: batch(**{**kw, "max_rows": 1}))  # flush on every write
+    config = {
+        "filter": {
+            "keywords": ["dinosaur", "fossil"],
+            "llm_filter": {"enabled": True, "single_pass": True},
+        },
+    }
+
+    assert filter_articles(db, config, llm_client=_SinglePassClient()) == 2
+    rows = db.conn.execute("SELECT stage, ready_seq FROM articles WHERE is_relevant = 1").fetchall()
+    assert sorted(stage for stage, _ in rows) == ["summarized", "summarized"]
+    assert sorted(seq for _, seq in rows) == [1, 2]
+
+    # Summary written before the verdict (another writer's order): still sendable
+    db.save_articles([Article("https://example.com/late", "Dinosaur late", "", "Src",
+                              "https://mixed.example.com/rss", datetime(2026, 1, 1, tzinfo=timezone.utc))])
+    late = db.conn.execute("SELECT id FROM articles WHERE title = 'Dinosaur late'").fetchone()[0]
+    with db.batch(max_rows=1) as writer:
+        writer.save_summary(late, "공룡", "요약")
+        writer.mark_relevant(late, True)
+    assert db.conn.execute("SELECT ready_seq FROM articles WHERE id = ?", (late,)).fetchone()[0] == 3
+    db.close()
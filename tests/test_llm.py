@@ -0,0 +1,284 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from paleonews.db import Database
+from paleonews.llm import (AnthropicClient, LLMClient, LLMResponse, RateLimitedClient,
+                           RetryableError, create_llm_client, find_wrapper, join_system)
+from paleonews.llm_cache import CachingLLMClient, ResponseStore
+from paleonews.llm_fake import FakeLLMClient
+from paleonews.llm_ledger import CallLedger, LedgerClient, estimate_cost
+from paleonews.llm_retry import RetryingLLMClient, classify_error
+
+
+class _StubMessages:
+    def __init__(self):
+        self.kwargs = None
+
+    def create(self, **kwargs):
+        self.kwargs = kwargs
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=" 답변 ")],
+            usage=SimpleNamespace(input_tokens=12, output_tokens=5,
+                                  cache_read_input_tokens=900, cache_creation_input_tokens=0),
+        )
+
+
+def _anthropic_stub():
+    client = AnthropicClient.__new__(AnthropicClient)
+    client._client = SimpleNamespace(messages=_StubMessages())
+    return client
+
+
+def test_anthropic_cache_prefix_sent_as_cache_control_block():
+    client = _anthropic_stub()
+    response = client.complete("m", "질문", system="기억: 공룡을 좋아함", cache_prefix="정적 지시문")
+
+    system = client._client.messages.kwargs["system"]
+    assert system[0] == {"type": "text", "text": "정적 지시문", "cache_control": {"type": "ephemeral"}}
+    assert system[1] == {"type": "text", "text": "기억: 공룡을 좋아함"}
+    assert response.text == "답변"
+    assert response.cache_read_tokens == 900
+    assert response.input_tokens == 12
+
+
+def test_anthropic_plain_system_without_prefix():
+    client = _anthropic_stub()
+    assert client.chat("m", "질문", system="plain") == "답변"
+    assert client._client.messages.kwargs["system"] == "plain"
+
+
+def test_join_system():
+    assert join_system("prefix", "dynamic") == "prefix\n\ndynamic"
+    assert join_system("prefix", "") == "prefix"
+    assert join_system("", "") == ""
+
+
+class _CountingClient(LLMClient):
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return LLMResponse(text=f"answer to {prompt}", input_tokens=10, output_tokens=3)
+
+
+def test_caching_client_hits_and_counters():
+    store = ResponseStore(":memory:")
+    inner = _CountingClient()
+    client = CachingLLMClient(inner, store, "summarize")
+
+    first = client.complete("m", "p1", system="s")
+    second = client.complete("m", "p1", system="s")
+    client.complete("m", "p1", system="s", max_tokens=64)  # different key
+
+    assert inner.calls == 2
+    assert first.text == second.text
+    assert second.input_tokens == 0  # served from cache, no provider usage
+    stats = {s["purpose"]: s for s in store.stats()}["summarize"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert stats["hit_bytes"] == len(first.text.encode())
+
+
+def test_caching_client_single_flight():
+    store = ResponseStore(":memory:")
+    inner = _CountingClient(delay=0.1)
+    client = CachingLLMClient(inner, store, "filter")
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: client.chat("m", "same"), range(5)))
+
+    assert inner.calls == 1
+    assert set(results) == {"answer to same"}
+
+
+def test_caching_client_does_not_store_failures():
+    store = ResponseStore(":memory:")
+    client = CachingLLMClient(_CountingClient(fail=True), store, "chat")
+    with pytest.raises(RuntimeError):
+        client.chat("m", "p")
+    assert store.stats()[0]["entries"] == 0
+
+
+def test_response_store_ttl_and_size_eviction():
+    store = ResponseStore(":memory:", ttl_seconds=60, max_bytes=10)
+    store.put("a", "chat", "m", "12345")
+    store.put("b", "chat", "m", "67890")
+    store.get("a")  # a is now most recently used
+    store.put("c", "chat", "m", "abcde")
+    assert store.get("b") is None
+    assert store.get("a") == "12345"
+
+    store.ttl_seconds = -1
+    assert store.get("c") is None
+
+
+class _FlakyClient(LLMClient):
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return LLMResponse(text="ok")
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_classify_error():
+    assert classify_error(_StatusError(429, {"retry-after": "7"})) == (True, 7.0)
+    assert classify_error(_StatusError(529)) == (True, None)
+    assert classify_error(_StatusError(400)) == (False, None)
+    assert classify_error(RetryableError("cli timeout", retry_after=2)) == (True, 2)
+    assert classify_error(TimeoutError()) == (True, None)
+    assert classify_error(ValueError("bad")) == (False, None)
+
+
+def test_retrying_client_recovers_from_transient_errors():
+    inner = _FlakyClient([_StatusError(503), _StatusError(429, {"retry-after-ms": "10"})])
+    client = RetryingLLMClient(inner, max_attempts=4, base_delay=0.01, max_delay=0.02)
+
+    assert client.chat("m", "p") == "ok"
+    assert inner.calls == 3
+    assert (client.stats.retries, client.stats.failures) == (2, 0)
+
+
+def test_retrying_client_raises_fatal_errors_immediately():
+    inner = _FlakyClient([_StatusError(400)])
+    client = RetryingLLMClient(inner, max_attempts=4, base_delay=0.01)
+
+    with pytest.raises(_StatusError):
+        client.chat("m", "p")
+    assert inner.calls == 1
+    assert client.stats.failures == 1
+
+
+def test_retrying_client_respects_deadline():
+    inner = _FlakyClient([_StatusError(429, {"retry-after": "5"})])
+    client = RetryingLLMClient(inner, max_attempts=4, deadline=1.0)
+
+    start = time.monotonic()
+    with pytest.raises(_StatusError):
+        client.chat("m", "p")
+    assert time.monotonic() - start < 0.5  # gave up instead of sleeping past the deadline
+    assert inner.calls == 1
+
+
+def test_estimate_cost_uses_longest_prefix():
+    usage = LLMResponse(text="", input_tokens=1_000_000, output_tokens=100_000)
+    assert estimate_cost("claude-opus-4-5-20251101", usage) == pytest.approx(5.0 + 2.5)
+    assert estimate_cost("claude-opus-4-1", usage) == pytest.approx(15.0 + 7.5)
+    assert estimate_cost("unknown-model", usage) is None
+    assert estimate_cost("my-model", usage, {"my-model": [1, 1]}) == pytest.approx(1.1)
+
+
+def test_ledger_records_calls_and_aggregates(tmp_path):
+    db = Database(str(tmp_path / "ledger.db"))
+    db.init_tables()
+    ledger = CallLedger(db.db_path, max_rows=1000, interval=60)
+    client = LedgerClient(_FlakyClient([_StatusError(529), _StatusError(400)]), ledger,
+                          "anthropic", "filter")
+
+    for _ in range(2):
+        with pytest.raises(_StatusError):
+            client.chat("claude-haiku-4-5", "p")
+    client.chat("claude-haiku-4-5", "p")
+    assert db.get_llm_usage() == []  # still buffered
+
+    ledger.close()
+    rows = db.conn.execute("SELECT outcome FROM llm_calls ORDER BY id").fetchall()
+    assert [r["outcome"] for r in rows] == ["retryable", "error", "ok"]
+    (usage,) = db.get_llm_usage()
+    assert (usage["purpose"], usage["calls"], usage["errors"]) == ("filter", 3, 2)
+    db.close()
+
+
+class _BrokenStreamClient(LLMClient):
+    def __init__(self, fail_before_text):
+        self.fail_before_text = list(fail_before_text)
+        self.calls = 0
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        raise NotImplementedError
+
+    def stream(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        self.calls += 1
+        if self.fail_before_text.pop(0):
+            raise _StatusError(529)
+        yield "partial"
+        raise _StatusError(529)
+
+
+def test_retrying_stream_only_retries_before_first_chunk():
+    inner = _BrokenStreamClient([True, False])
+    client = RetryingLLMClient(inner, max_attempts=4, base_delay=0.01, max_delay=0.01)
+
+    received = []
+    with pytest.raises(_StatusError):
+        for chunk in client.stream("m", "p"):
+            received.append(chunk)
+    assert received == ["partial"]
+    assert inner.calls == 2  # one retry before text, none after
+
+
+def test_default_stream_falls_back_to_single_chunk():
+    chunks = list(_FlakyClient([]).stream("m", "p"))
+    assert chunks == ["ok"]
+
+
+def test_fake_provider_is_deterministic_and_well_formed():
+    from paleonews.filter import LLM_FILTER_PROMPT
+    from paleonews.summarizer import (SUMMARY_SYSTEM_PROMPT, _parse_summary,
+                                      classify_and_summarize, summarize_article)
+
+    config = {"db_path": ":memory:",
+              "llm": {"provider": "fake", "retry": {"max_attempts": 1},
+                      "fake": {"seed": 7, "time_scale": 0}}}
+    client = create_llm_client(config, purpose="summarize")
+    article = {"id": 1, "title": "New dinosaur fossil found", "summary": "s", "source": "x"}
+
+    verdict = client.chat("m", LLM_FILTER_PROMPT.format(title=article["title"], summary="s"))
+    assert verdict == "yes"
+    title_ko, summary_ko = summarize_article(client, article, "m")
+    assert title_ko and summary_ko
+    assert classify_and_summarize(client, article, "m")[0] is True
+
+    again = create_llm_client(config, purpose="summarize")
+    assert again.chat("m", "안녕") == client.chat("m", "안녕")
+
+
+def test_fake_provider_429_bursts_are_retried():
+    fake = FakeLLMClient(time_scale=0, burst_every=2, burst_length=2, retry_after=0.01)
+    client = RetryingLLMClient(fake, max_attempts=5, deadline=5)
+
+    results = [client.chat("m", f"q{i}") for i in range(4)]
+    assert len(results) == 4
+    assert fake.injected_errors == 2  # calls 3 and 4 hit the burst
+    assert client.stats.retries == 2
+
+
+def test_rate_limiter_shared_across_clients():
+    config = {"db_path": ":memory:",
+              "llm": {"provider": "fake", "retry": {"max_attempts": 1},
+                      "rate_limit": {"requests_per_minute": 60},
+                      "fake": {"time_scale": 0}}}
+    limiters = [find_wrapper(create_llm_client(config, purpose=p), RateLimitedClient).limiter
+                for p in ("filter", "summarize")]
+    assert limiters[0] is limiters[1]  # one quota for the whole process
@@ -263,3 +263,21 @@ def test_migration_idempotent():
     cols = [row[1] for row in db.conn.execute("PRAGMA table_info(dispatches)")]
     assert cols.count("user_id") == 1  # not duplicated
     db.close()
+
+
+def test_migration_derives_delivery_watermarks():
+    """Legacy dispatch history becomes per-channel watermarks; nothing is re-sent."""
+    db = _migrate_old_db()
+    state = {
+        (r["channel"], r["user_id"]): r["watermark"]
+        for r in db.conn.execute("SELECT * FROM delivery_state")
+    }
+    # telegram delivered articles 1 and 2; email only article 1
+    assert state == {("telegram", 0): 2, ("email", 0): 1}
+    assert db.get_unsent("telegram") == []
+    assert [a["id"] for a in db.get_unsent("email")] == [2]
+
+    # The admin picks up the channel-wide telegram watermark
+    admin_id = db.seed_admin("99999")
+    assert db.get_unsent_for_user("telegram", admin_id) == []
+    db.close()
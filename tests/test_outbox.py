@@ -0,0 +1,198 @@
+from datetime import datetime, timezone
+
+from paleonews.db import Database
+from paleonews.fetcher import Article
+from paleonews.outbox import LiveFlusher, OutboxDeliverer, enqueue_plan
+from paleonews.render import RenderCache
+from paleonews.send_plan import Recipient, build_send_plan
+
+
+def _make_db() -> Database:
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([
+        Article(f"https://example.com/{i}", f"Dinosaur {i}", "summary", "Src",
+                "https://example.com/feed", datetime(2026, 1, 1, tzinfo=timezone.utc))
+        for i in (1, 2)
+    ])
+    for i in (1, 2):
+        db.mark_relevant(i, True)
+        db.save_summary(i, f"제목 {i}", f"요약 {i}")
+    return db
+
+
+class FakeSender:
+    def __init__(self, fail_targets=()):
+        self.fail_targets = set(fail_targets)
+        self.sent = []
+
+    async def send_all(self, jobs, on_done):
+        for key, target, body in jobs:
+            ok = target not in self.fail_targets
+            if ok:
+                self.sent.append((target, body))
+            on_done(key, ok)
+
+
+def _enqueue(db):
+    users = [db.get_user(db.add_user(chat)) for chat in ("111", "222")]
+    recipients = [Recipient.from_user("telegram", u, u["telegram_chat_id"]) for u in users]
+    queued = enqueue_plan(db, build_send_plan(db, recipients), RenderCache(), "2026-01-01")
+    return queued, [u["id"] for u in users]
+
+
+def _enqueue_for(db, user_id):
+    user = db.get_user(user_id)
+    recipients = [Recipient.from_user("telegram", user, user["telegram_chat_id"])]
+    return enqueue_plan(db, build_send_plan(db, recipients, max_attempts=10), RenderCache(), "2026-01-01")
+
+
+def test_interleaved_send_passes_queue_each_article_once():
+    db = _make_db()
+    users = [db.get_user(db.add_user(chat)) for chat in ("111", "222")]
+    recipients = [Recipient.from_user("telegram", u, u["telegram_chat_id"]) for u in users]
+    first = build_send_plan(db, recipients)
+    second = build_send_plan(db, recipients)  # planned from the same watermarks
+
+    assert enqueue_plan(db, first, RenderCache(), "2026-01-01") == 2
+    assert enqueue_plan(db, second, RenderCache(), "2026-01-01") == 0
+    assert db.get_outbox_stats() == {"pending": 2}
+
+    # A later pass sees the new state and picks up new articles normally
+    db.save_articles([Article("https://example.com/3", "Dinosaur 3", "summary", "Src",
+                              "https://example.com/feed", datetime(2026, 1, 2, tzinfo=timezone.utc))])
+    db.mark_relevant(3, True)
+    db.save_summary(3, "제목 3", "요약 3")
+    assert enqueue_plan(db, build_send_plan(db, recipients), RenderCache(), "2026-01-01") == 2
+    db.close()
+
+
+def test_enqueue_shares_bodies_and_advances_watermarks():
+    db = _make_db()
+    queued, (u1, u2) = _enqueue(db)
+    assert queued == 2
+    assert db.conn.execute("SELECT COUNT(*) FROM outbox_messages").fetchone()[0] == 1
+    # Queued means done for planning purposes; the outbox owns delivery now
+    assert db.get_unsent_for_user("telegram", u1) == []
+    assert db.get_outbox_stats() == {"pending": 2}
+    db.close()
+
+
+def test_deliverer_retries_with_backoff_then_gives_up():
+    db = _make_db()
+    _, (u1, u2) = _enqueue(db)
+    sender = FakeSender(fail_targets={"222"})
+    deliverer = OutboxDeliverer(db, {"delivery": {"max_attempts": 2, "retry_base_seconds": 60}},
+                                senders={"telegram": sender})
+
+    assert deliverer.deliver_due() == 2  # the failed row is not due again yet
+    assert [t for t, _ in sender.sent] == ["111"]
+    assert deliverer.counts == {"sent": 1, "pending": 1, "dead": 0}
+    sent = db.conn.execute(
+        "SELECT article_id FROM dispatches WHERE user_id = ? AND status = 'success'", (u1,)
+    ).fetchall()
+    assert sorted(r[0] for r in sent) == [1, 2]
+
+    db.conn.execute("UPDATE outbox SET next_attempt_at = '2000-01-01' WHERE status = 'pending'")
+    assert deliverer.deliver_due() == 1
+    assert db.get_outbox_stats() == {"sent": 1, "dead": 1}
+    failed = db.conn.execute(
+        "SELECT COUNT(*) FROM dispatches WHERE user_id = ? AND status = 'failed'", (u2,)
+    ).fetchone()[0]
+    assert failed == 2
+    db.close()
+
+
+def test_dead_row_articles_are_queued_again():
+    db = _make_db()
+    _, (u1, u2) = _enqueue(db)
+    deliverer = OutboxDeliverer(db, {"delivery": {"max_attempts": 1}},
+                                senders={"telegram": FakeSender(fail_targets={"222"})})
+    deliverer.deliver_due()
+    assert deliverer.counts["dead"] == 1
+
+    # The watermark moved past both articles at enqueue time; the dead row
+    # hands them back as exceptions for the next send pass
+    assert [a["id"] for a in db.get_unsent_for_user("telegram", u2)] == [1, 2]
+    assert db.get_unsent_for_user("telegram", u1) == []
+
+    # Each dead row counts as one attempt; the cap eventually stops requeueing
+    for _ in range(2):
+        _enqueue_for(db, u2)
+        db.conn.execute("UPDATE outbox SET next_attempt_at = '2000-01-01' WHERE status = 'pending'")
+        deliverer.deliver_due()
+    assert db.get_unsent_for_user("telegram", u2, max_attempts=3) == []
+    assert len(db.get_unsent_for_user("telegram", u2, max_attempts=4)) == 2
+    db.close()
+
+
+def test_claim_lease_expiry_reclaims_rows():
+    db = _make_db()
+    _enqueue(db)
+    assert len(db.claim_outbox()) == 2
+    assert db.claim_outbox() == []  # leased to the first worker
+    db.conn.execute("UPDATE outbox SET next_attempt_at = '2000-01-01'")  # that worker died
+    assert len(db.claim_outbox()) == 2
+    db.close()
+
+
+def test_live_flusher_sends_as_summaries_commit():
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([
+        Article(f"https://example.com/{i}", f"Dinosaur {i}", "summary", "Src",
+                "https://example.com/feed", datetime(2026, 1, 1, tzinfo=timezone.utc))
+        for i in (1, 2, 3)
+    ])
+    for i in (1, 2, 3):
+        db.mark_relevant(i, True)
+    user = db.get_user(db.add_user("111"))
+    sender = FakeSender()
+    deliverer = OutboxDeliverer(db, {}, senders={"telegram": sender})
+
+    def send():
+        recipients = [Recipient.from_user("telegram", user, user["telegram_chat_id"])]
+        enqueue_plan(db, build_send_plan(db, recipients), RenderCache(), "2026-01-01")
+        deliverer.deliver_due()
+
+    live = LiveFlusher(send, flush_seconds=3600, flush_articles=2)
+    with db.batch(max_rows=1, on_commit=live.on_commit) as writer:
+        writer.save_summary(1, "제목 1", "요약 1")
+        assert sender.sent == []  # one summary waits for company
+        writer.save_summary(2, "제목 2", "요약 2")
+        assert len(sender.sent) == 1 and "제목 2" in sender.sent[0][1]
+        writer.save_summary(3, "제목 3", "요약 3")
+    assert live.pending == 1
+    live.flush()
+    assert len(sender.sent) == 2 and "제목 3" in sender.sent[1][1]
+    assert "제목 1" not in sender.sent[1][1]  # the watermark already covers earlier passes
+    assert live.flushes == 2
+
+    latency = db.get_delivery_latency()
+    assert latency["count"] == 3
+    assert latency["published"]["p50"] > latency["fetched"]["p50"] >= 0
+    db.close()
+
+
+def test_send_leaves_future_slots_to_the_worker(monkeypatch):
+    import time
+
+    import paleonews.__main__ as cli
+
+    db = _make_db()
+    for chat in ("111", "222"):
+        uid = db.add_user(chat)
+        db.update_user(uid, delivery_mode="hourly")
+    sender = FakeSender()
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "token")
+    monkeypatch.delenv("TELEGRAM_CHAT_ID", raising=False)
+    monkeypatch.setattr(cli, "OutboxDeliverer",
+                        lambda db, config: OutboxDeliverer(db, config, senders={"telegram": sender}))
+    config = {"delivery": {"inline": True, "schedule": {"spread_seconds": 600}}}
+
+    start = time.monotonic()
+    cli._send_and_deliver(db, config)
+    assert time.monotonic() - start < 2  # did not wait for the second slot
+    assert [target for target, _ in sender.sent] == ["111"]  # the slot that was due
+    assert db.get_outbox_stats() == {"sent": 1, "pending": 1}
+    db.close()
\ No newline at end of file
@@ -0,0 +1,25 @@
+from paleonews.dispatcher.email import render_articles
+from paleonews.render import RenderCache
+from paleonews.summarizer import generate_briefing
+
+ARTICLES = [
+    {"id": i, "title_ko": f"공룡 <{i}>", "summary_ko": f"요약 {i}", "url": f"https://example.com/{i}",
+     "source": "Nature"}
+    for i in range(1, 5)
+]
+
+
+def test_cached_rendering_matches_direct_rendering():
+    cache = RenderCache()
+    for subset in (ARTICLES, ARTICLES[1:3], []):
+        assert cache.briefing(subset, "2026-01-01") == generate_briefing(subset, "2026-01-01")
+        assert cache.email(subset, "2026-01-01") == render_articles(subset, "2026-01-01")
+
+
+def test_fragments_rendered_once_and_messages_shared():
+    cache = RenderCache()
+    first = cache.briefing(ARTICLES[:3], "d")
+    cache.briefing(ARTICLES[1:], "d")          # overlapping set: only article 4 is new
+    assert cache.fragments_rendered == 4
+    assert cache.briefing(ARTICLES[:3], "d") is first  # identical set shares the message
+    assert (cache.messages_built, cache.message_hits) == (2, 1)
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from paleonews.db import Database
+from paleonews.fetcher import Article
+from paleonews.schedule import DeliverySchedule, validate_preferences
+from paleonews.send_plan import Recipient, build_send_plan
+
+NOW = datetime(2026, 3, 10, 23, 30, tzinfo=timezone.utc)  # 08:30 on 3/11 in Seoul
+
+
+def _recipient(uid, mode="immediate", hour=8, tz=None):
+    return Recipient("telegram", uid, str(uid), delivery_mode=mode, delivery_hour=hour, timezone=tz)
+
+
+def test_window_start_respects_user_time_zone():
+    schedule = DeliverySchedule(timezone="Asia/Seoul")
+    assert schedule.window_start(_recipient(1), NOW) is None
+    assert schedule.window_start(_recipient(1, "hourly"), NOW) == datetime(2026, 3, 10, 23, 0, tzinfo=timezone.utc)
+    # 08:00 Seoul already passed today
+    assert schedule.window_start(_recipient(1, "daily", 8), NOW) == datetime(2026, 3, 10, 23, 0, tzinfo=timezone.utc)
+    # 09:00 Seoul hasn't yet, so the open window is yesterday's
+    assert schedule.window_start(_recipient(1, "daily", 9), NOW) == datetime(2026, 3, 10, 0, 0, tzinfo=timezone.utc)
+    # 07:00 in London is 07:00 UTC in March
+    assert schedule.window_start(_recipient(1, "daily", 7, "Europe/London"), NOW) == \
+        datetime(2026, 3, 10, 7, 0, tzinfo=timezone.utc)
+
+
+def test_select_due_skips_delivered_windows_and_spreads_the_rest():
+    schedule = DeliverySchedule(timezone="Asia/Seoul", spread_seconds=600)
+    recipients = [
+        _recipient(1),                   # immediate: always due, no slot
+        _recipient(2, "daily", 8),       # window opened 23:00 UTC, last delivery before it
+        _recipient(3, "daily", 8),       # already got today's briefing
+        _recipient(4, "hourly"),         # never delivered
+        Recipient("slack", None, ""),   # channel-wide targets are immediate
+    ]
+    last = {
+        ("telegram", 2): "2026-03-09T23:05:00+00:00",
+        ("telegram", 3): "2026-03-10T23:10:00+00:00",
+    }
+    due = schedule.select_due(recipients, last, now=NOW)
+    assert [(r.channel, r.user_id) for r in due] == [("telegram", 1), ("slack", None), ("telegram", 2), ("telegram", 4)]
+    assert due[0].not_before is None
+    assert [r.not_before for r in due[2:]] == [NOW.isoformat(), "2026-03-10T23:35:00+00:00"]
+
+
+def test_validate_preferences():
+    validate_preferences("daily", 7, "Europe/London")
+    for args in (("weekly",), ("daily", 24), ("daily", 7, "Mars/Olympus")):
+        with pytest.raises(ValueError):
+            validate_preferences(*args)
+
+
+def test_user_preferences_reach_recipient_and_outbox_slot():
+    db = Database(":memory:")
+    db.init_tables()
+    uid = db.add_user("111")
+    assert db.get_user(uid)["delivery_mode"] == "immediate"
+    db.update_user(uid, delivery_mode="daily", delivery_hour=7, timezone="Europe/London")
+    r = Recipient.from_user("telegram", db.get_user(uid), "111")
+    assert (r.delivery_mode, r.delivery_hour, r.timezone) == ("daily", 7, "Europe/London")
+
+    slot = "2030-01-01T00:00:00+00:00"
+    db.enqueue_deliveries([{
+        "channel": "telegram", "user_id": uid, "target": "111", "unsent": [],
+        "article_ids": [], "body": "브리핑", "not_before": slot,
+    }])
+    assert db.conn.execute("SELECT next_attempt_at FROM outbox").fetchone()[0] == slot
+    assert db.claim_outbox() == []  # held until its slot
+    db.close()
+
+
+def test_empty_window_pass_holds_late_articles_for_next_window():
+    db = Database(":memory:")
+    db.init_tables()
+    uid = db.add_user("111")
+    db.update_user(uid, delivery_mode="daily", delivery_hour=8, timezone="Asia/Seoul")
+    schedule = DeliverySchedule(timezone="Asia/Seoul")
+
+    def plan_at(now):
+        r = Recipient.from_user("telegram", db.get_user(uid), "111")
+        due = schedule.select_due([r], db.get_windows_served(), now=now)
+        plan = build_send_plan(db, due)
+        db.mark_windows_served([(d.channel, d.user_id) for d in due], now=now)
+        return [a["id"] for d in plan.deliveries for a in d.articles]
+
+    # 08:05 Seoul: the window opens with nothing to send, but the pass uses it up
+    opened = datetime(2026, 3, 10, 23, 5, tzinfo=timezone.utc)
+    assert plan_at(opened) == []
+
+    # An article summarized at 10:00 waits for tomorrow's window
+    db.save_articles([Article("https://example.com/1", "Late dinosaur", "summary", "Src",
+                              "https://example.com/feed", opened)])
+    db.mark_relevant(1, True)
+    db.save_summary(1, "제목", "요약")
+    assert plan_at(opened + timedelta(hours=2)) == []
+    assert plan_at(opened + timedelta(days=1)) == [1]
+    db.close()
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+from paleonews.db import Database
+from paleonews.fetcher import Article
+from paleonews.filter import filter_articles_for_user
+from paleonews.send_plan import Recipient, build_send_plan
+
+
+def _make_db(n=6) -> Database:
+    db = Database(":memory:")
+    db.init_tables()
+    db.save_articles([
+        Article(f"https://example.com/{i}", f"Dinosaur {i}" if i % 2 else f"Mammoth {i}",
+                "summary", "Src", "https://example.com/feed", datetime(2026, 1, 1, tzinfo=timezone.utc))
+        for i in range(1, n + 1)
+    ])
+    for i in range(1, n + 1):
+        db.mark_relevant(i, True)
+        db.save_summary(i, f"제목 {i}", f"요약 {i}")
+    return db
+
+
+def test_plan_matches_per_user_queries():
+    db = _make_db()
+    alice = db.add_user("111")
+    bob = db.add_user("222")
+    carol = db.add_user("333")
+    db.update_user_keywords(bob, ["mammoth"])
+
+    # alice is caught up to article 3 with article 2 failed; carol got article 5 directly
+    db.advance_delivery("telegram", alice, db.get_unsent_for_user("telegram", alice)[:3], failed_ids=[2])
+    db.record_dispatch(5, "telegram", "success", user_id=carol)
+    db.advance_delivery("slack", None, db.get_unsent("slack")[:4])
+
+    recipients = [
+        Recipient.from_user("telegram", db.get_user(uid), "x") for uid in (alice, bob, carol)
+    ] + [Recipient("slack", None, "https://hooks.example.com")]
+    plan = build_send_plan(db, recipients)
+
+    for delivery in plan.deliveries:
+        r = delivery.recipient
+        expected = db.get_unsent_for_user(r.channel, r.user_id)
+        assert [a["id"] for a in delivery.unsent] == [a["id"] for a in expected]
+        keywords = db.get_user_keywords(r.user_id) if r.user_id else None
+        assert delivery.articles == filter_articles_for_user(expected, keywords)
+    assert {d.recipient.user_id for d in plan.deliveries} == {alice, bob, carol, None}
+    assert [a["id"] for a in plan.for_channel("slack")[0].unsent] == [5, 6]
+    db.close()
+
+
+def test_plan_skips_caught_up_recipients():
+    db = _make_db(2)
+    uid = db.add_user("111")
+    db.advance_delivery("telegram", uid, db.get_unsent_for_user("telegram", uid))
+    plan = build_send_plan(db, [Recipient("telegram", uid, "111")])
+    assert plan.deliveries == []
+    assert build_send_plan(db, []).deliveries == []
+    db.close()
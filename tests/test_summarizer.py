@@ -0,0 +1,148 @@
+import threading
+import time
+
+from paleonews.llm import LLMClient, LLMResponse
+from paleonews.summarizer import (MULTI_SUMMARY_SYSTEM_PROMPT, ModelRouter, SummaryGrouping,
+                                  _parse_classify_summary, _parse_multi_summary, _parse_summary,
+                                  _summary_prompt, summarize_article, summarize_concurrently)
+
+
+def test_parse_summary():
+    title, summary = _parse_summary("제목: 공룡 화석 발견\n요약: 새로운 종이 보고되었다.")
+    assert title == "공룡 화석 발견"
+    assert summary == "새로운 종이 보고되었다."
+
+
+def test_parse_classify_summary_relevant():
+    text = '{"relevant": true, "title_ko": "익룡 화석", "summary_ko": "새 익룡이 발견되었다."}'
+    assert _parse_classify_summary(text) == (True, "익룡 화석", "새 익룡이 발견되었다.")
+
+
+def test_parse_classify_summary_irrelevant():
+    assert _parse_classify_summary('{"relevant": false}') == (False, "", "")
+    # Code fences and trailing chatter are tolerated
+    assert _parse_classify_summary('```json\n{"relevant": false}\n```') == (False, "", "")
+
+
+def test_parse_classify_summary_truncated_verdict():
+    assert _parse_classify_summary('{"relevant": false, "title_ko": "') == (False, "", "")
+
+
+def test_parse_classify_summary_malformed_keeps_article():
+    assert _parse_classify_summary("I am not sure.") == (True, "", "")
+
+
+class _SlowClient:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def chat(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        if "broken" in prompt:
+            raise RuntimeError("provider refused")
+        return "제목: 한국어 제목\n요약: 한국어 요약"
+
+
+def test_summarize_concurrently():
+    articles = [{"id": i, "title": f"Article {i}", "summary": "s", "source": "x"} for i in range(5)]
+    articles[2]["title"] = "broken article"
+    client = _SlowClient()
+
+    results = dict(summarize_concurrently(client, articles, "model", concurrency=3))
+
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert client.peak > 1
+    assert isinstance(results[2].error, RuntimeError)
+    assert results[0].error is None
+    assert results[0].title_ko == "한국어 제목"
+    assert results[4].article is articles[4]
+
+
+class _ModelEchoClient(LLMClient):
+    """Cheap model answers with chatter; strong model answers in format."""
+
+    def __init__(self):
+        self.models = []
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        self.models.append(model)
+        if model == "cheap" and "garbled" in prompt:
+            return LLMResponse(text="Sorry, I can't.", input_tokens=10, output_tokens=4)
+        return LLMResponse(text="제목: 공룡 발견\n요약: 새로운 공룡 화석이 보고되었습니다.",
+                           input_tokens=10, output_tokens=20)
+
+
+def test_model_router_routes_and_escalates():
+    router = ModelRouter("strong", cheap_model="cheap", max_cheap_chars=400,
+                         strong_sources=["Nature"], strong_min_body=500)
+    client = _ModelEchoClient()
+    long_body = "fossil " * 200
+    articles = {
+        "no_body": {"id": 1, "title": "t", "summary": "s", "source": "Phys.org"},
+        "journal_long": {"id": 2, "title": "t", "body": long_body, "source": "Nature"},
+        "default": {"id": 3, "title": "t", "body": long_body, "source": "Blog"},
+        "short": {"id": 4, "title": "t", "body": "b" * 150, "source": "Blog"},
+    }
+    for route, article in articles.items():
+        assert router.route(article, _summary_prompt(article))[0] == route
+
+    title, _ = summarize_article(client, {"id": 5, "title": "garbled", "summary": "s"},
+                                 "ignored", router)
+    assert title == "공룡 발견"
+    assert client.models == ["cheap", "strong"]
+
+    report = {(r["route"], r["model"]): r for r in router.report()}
+    assert report[("no_body", "strong")]["escalations"] == 1
+    assert report[("no_body", "cheap")]["calls"] == 1
+
+
+def test_model_router_disabled_uses_strong_model():
+    router = ModelRouter.from_config({"summarizer": {"model": "strong"}})
+    assert router.route({"id": 1}, "prompt") == ("default", "strong")
+
+
+def test_parse_multi_summary_keeps_only_wellformed_items():
+    text = ('```json\n[{"id": 1, "title_ko": "가", "summary_ko": "요약 가"},'
+            ' {"id": 2, "title_ko": "", "summary_ko": "제목 없음"},'
+            ' {"id": 99, "title_ko": "다", "summary_ko": "모르는 기사"}]\n```')
+    assert _parse_multi_summary(text, [1, 2, 3]) == {1: ("가", "요약 가")}
+    assert _parse_multi_summary("not json", [1]) == {}
+
+
+def test_grouping_plan_respects_budget_and_body():
+    # Each item is ~33 estimated tokens, so two fit in a 70-token budget
+    grouping = SummaryGrouping(max_input_tokens=70, max_articles=3)
+    articles = [{"id": i, "title": f"t{i}", "summary": "x" * 100, "source": "s"} for i in range(5)]
+    articles[2]["body"] = "long crawled body " * 20
+    assert sorted(grouping.plan(articles)) == [[0, 1], [2], [3, 4]]
+
+
+class _GroupClient(LLMClient):
+    def __init__(self):
+        self.prompts = []
+
+    def complete(self, model, prompt, *, system="", max_tokens=512, cache_prefix=""):
+        self.prompts.append(prompt)
+        if cache_prefix == MULTI_SUMMARY_SYSTEM_PROMPT:
+            # Article 2's item comes back malformed
+            return LLMResponse(text='[{"id": 1, "title_ko": "일", "summary_ko": "첫 기사"},'
+                                    ' {"id": 2, "title_ko": "이"}]')
+        return LLMResponse(text="제목: 단건\n요약: 단건 요약")
+
+
+def test_grouped_summaries_fall_back_to_single_path():
+    articles = [{"id": i, "title": f"t{i}", "summary": "s", "source": "x"} for i in (1, 2)]
+    client = _GroupClient()
+
+    results = dict(summarize_concurrently(client, articles, "m", grouping=SummaryGrouping()))
+
+    assert (results[0].title_ko, results[0].summary_ko) == ("일", "첫 기사")
+    assert (results[1].title_ko, results[1].summary_ko) == ("단건", "단건 요약")
+    assert len(client.prompts) == 2  # one grouped call + one single fallback
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from telegram.error import RetryAfter
+
+from paleonews.dispatcher.telegram import SEPARATOR, TelegramFanout
+
+
+class FakeBot:
+    def __init__(self, throttle_chat=None, fail_chat=None, fail_after=0):
+        self.sent: list[tuple[float, str, str]] = []
+        self.throttle_chat = throttle_chat
+        self.fail_chat = fail_chat
+        self.fail_after = fail_after  # messages fail_chat gets before failing
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send_message(self, chat_id, text):
+        if chat_id == self.throttle_chat:
+            self.throttle_chat = None
+            raise RetryAfter(timedelta(0))
+        if chat_id == self.fail_chat:
+            if self.fail_after <= 0:
+                raise RuntimeError("chat not found")
+            self.fail_after -= 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.sent.append((time.monotonic(), chat_id, text))
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")  # PTB's own RetryAfter.__init__
+async def test_fanout_sends_concurrently_and_reports_each():
+    bot = FakeBot(throttle_chat="c3", fail_chat="c7")
+    fanout = TelegramFanout(bot=bot, concurrency=4, rate_per_second=1000, per_chat_rate=1000)
+    done = {}
+    await fanout.send_all([(i, f"c{i}", f"hello {i}") for i in range(10)],
+                          lambda key, ok: done.__setitem__(key, ok))
+
+    assert done == {i: i != 7 for i in range(10)}
+    assert fanout.retries == 1  # c3's 429 was retried
+    assert 1 < bot.max_in_flight <= 4
+    assert sorted(chat for _, chat, _ in bot.sent) == sorted(f"c{i}" for i in range(10) if i != 7)
+
+
+@pytest.mark.asyncio
+async def test_fanout_spaces_chunks_per_chat():
+    bot = FakeBot()
+    fanout = TelegramFanout(bot=bot, rate_per_second=1000, per_chat_rate=20, max_length=50)
+    briefing = SEPARATOR.join(["x" * 40] * 3)  # three chunks
+    done = []
+    await fanout.send_all([("k", "c1", briefing)], lambda key, ok: done.append(ok))
+
+    assert done == [True]
+    times = [t for t, _, _ in bot.sent]
+    assert len(times) == 3
+    assert all(b - a >= 0.04 for a, b in zip(times, times[1:]))
+
+
+@pytest.mark.asyncio
+async def test_fanout_treats_partial_briefing_as_sent():
+    bot = FakeBot(fail_chat="c1", fail_after=1)
+    fanout = TelegramFanout(bot=bot, rate_per_second=1000, per_chat_rate=1000, max_length=50)
+    briefing = SEPARATOR.join(["x" * 40] * 3)
+    done = []
+    await fanout.send_all([("k", "c1", briefing)], lambda key, ok: done.append(ok))
+
+    assert done == [True]  # a retry would resend the first chunk
+    assert len(bot.sent) == 1
@@ -267,3 +267,33 @@ def test_seed_admin_backfills_dispatches():
     for row in rows:
         assert row["user_id"] == admin_id
     db.close()
+
+
+def test_delivery_watermark_and_exceptions():
+    db = _make_db()
+    _setup_articles(db)
+    uid = db.add_user("12345")
+
+    unsent = db.get_unsent_for_user("email", uid)
+    # Article 2 was filtered out, article 3's send failed
+    db.record_dispatch(1, "email", "success", user_id=uid)
+    db.advance_delivery("email", uid, unsent, failed_ids=[3], error="smtp down")
+    assert db.conn.execute("SELECT COUNT(*) FROM dispatches WHERE status = 'filtered'").fetchone()[0] == 0
+    assert [a["id"] for a in db.get_unsent_for_user("email", uid)] == [3]
+
+    # Failed deliveries are retried until max_attempts
+    db.advance_delivery("email", uid, db.get_unsent_for_user("email", uid), failed_ids=[3])
+    assert db.get_unsent_for_user("email", uid, max_attempts=2) == []
+
+    # An article summarized late (lower id than one already delivered)
+    # is still picked up: watermarks follow ready order, not id order
+    from paleonews.fetcher import Article
+    db.save_articles([Article(url=f"https://example.com/{i}", title=f"Late {i}", summary="",
+                              source="X", feed_url="f", published=None) for i in (4, 5)])
+    db.mark_relevant(4, True)
+    db.mark_relevant(5, True)
+    db.save_summary(5, "제목5", "요약5")
+    db.advance_delivery("email", uid, db.get_unsent_for_user("email", uid, max_attempts=2))
+    db.save_summary(4, "제목4", "요약4")
+    assert [a["id"] for a in db.get_unsent_for_user("email", uid, max_attempts=2)] == [4]
+    db.close()